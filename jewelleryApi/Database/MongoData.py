@@ -1,7 +1,8 @@
 from pymongo import MongoClient
-from constants import mongoUrl,mongoDatabase,mongoProductCollection,mongoCategoryCollection,mongoCartCollection,mongoReviewCollection,mongoWishlistCollection,mongoShippingCollection,mongoAddressesCollection,mongoEmailVerifyCollection
+from Database.poolMonitor import poolStats
+from constants import mongoUrl,mongoDatabase,mongoProductCollection,mongoCategoryCollection,mongoCartCollection,mongoReviewCollection,mongoWishlistCollection,mongoShippingCollection,mongoAddressesCollection,mongoEmailVerifyCollection,mongoImageCollection,mongoEmailOutboxCollection,mongoCatalogVersionCollection,mongoInventoryCollection,mongoReservationCollection
 
-client = MongoClient(mongoUrl)
+client = MongoClient(mongoUrl, event_listeners=[poolStats])
 db = client[mongoDatabase]
 productsCollection = db[mongoProductCollection]
 categoriesCollection = db[mongoCategoryCollection]
@@ -11,7 +12,8 @@ shippingCollection = db[mongoShippingCollection]
 addressesCollection = db[mongoAddressesCollection]
 emailVerifyCollection = db[mongoEmailVerifyCollection]
 reviewCollection = db[mongoReviewCollection]
-
-
-
-
+imageCollection = db[mongoImageCollection]
+emailOutboxCollection = db[mongoEmailOutboxCollection]
+catalogVersionCollection = db[mongoCatalogVersionCollection]
+inventoryCollection = db[mongoInventoryCollection]
+reservationCollection = db[mongoReservationCollection]
@@ -1,3 +1,5 @@
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
 from Database.MongoData import cartCollection, wishlistCollection
 
 
@@ -28,3 +30,36 @@ def getCartDb(query: dict):
     return cartCollection.find(query, {"_id": 0})
 
 
+# ───── Wishlist: one document per user holding product ids only ───── #
+
+def ensureWishlistIndexes():
+    wishlistCollection.create_index("userId", unique=True)
+
+
+def addToWishlistDb(userId: str, productIds: list, maxItems: int, updatedAt: str):
+    """
+    $addToSet the ids not yet in the list unless they could overflow maxItems.
+    Returns the updated document, or None when the wishlist is full: the filter
+    then misses and the upsert collides with the user's document on the unique index.
+    """
+    for _ in range(2):
+        wishlist = wishlistCollection.find_one({"userId": userId}, {"_id": 0, "productIds": 1})
+        # Ids already in the list take no room, so only the new ones count against the limit
+        newIds = [productId for productId in productIds if productId not in (wishlist or {}).get("productIds", [])]
+        query = {"userId": userId, f"productIds.{maxItems - len(newIds)}": {"$exists": False}}
+        try:
+            return wishlistCollection.find_one_and_update(query, {"$addToSet": {"productIds": {"$each": newIds}}, "$set": {"updatedAt": updatedAt}}, {"_id": 0}, upsert=True, return_document=ReturnDocument.AFTER)
+        except DuplicateKeyError:
+            if wishlist is not None:
+                return None
+            # A concurrent first add created the document; retry once against it
+    return None
+
+
+def removeFromWishlistDb(userId: str, productIds: list, updatedAt: str):
+    return wishlistCollection.update_one({"userId": userId, "productIds": {"$in": productIds}}, {"$pull": {"productIds": {"$in": productIds}}, "$set": {"updatedAt": updatedAt}})
+
+
+def getWishlistDb(userId: str):
+    return wishlistCollection.find_one({"userId": userId}, {"_id": 0})
+
@@ -0,0 +1,29 @@
+import threading
+import time
+from pymongo import ReturnDocument
+from constants import catalogVersionCacheSeconds
+from Database.MongoData import catalogVersionCollection
+
+# key -> (generation, checkedAt); other workers' bumps are seen within catalogVersionCacheSeconds
+versionCache = {}
+versionLock = threading.Lock()
+
+
+def getCatalogVersion(key: str) -> int:
+    now = time.monotonic()
+    with versionLock:
+        cached = versionCache.get(key)
+    if cached and now - cached[1] < catalogVersionCacheSeconds:
+        return cached[0]
+    document = catalogVersionCollection.find_one({"_id": key})
+    generation = document["generation"] if document else 0
+    with versionLock:
+        versionCache[key] = (generation, now)
+    return generation
+
+
+def bumpCatalogVersion(key: str) -> int:
+    document = catalogVersionCollection.find_one_and_update({"_id": key}, {"$inc": {"generation": 1}}, upsert=True, return_document=ReturnDocument.AFTER)
+    with versionLock:
+        versionCache[key] = (document["generation"], time.monotonic())
+    return document["generation"]
@@ -1,10 +1,13 @@
 # Database/categoryDb.py
 
 from Database.MongoData import categoriesCollection
+from Database.catalogVersionDb import bumpCatalogVersion
 
 
 def insertCategoryIfNotExists(data: dict):
-    return categoriesCollection.insert_one(data)
+    result = categoriesCollection.insert_one(data)
+    bumpCatalogVersion("categories")
+    return result
 
 
 def getCategoriesFromDb(query: dict = {}, projection: dict = {"_id": 0}):
@@ -15,8 +18,12 @@ def getCategoryFromDb(query: dict):
     return categoriesCollection.find_one(query, {"_id": 0})
 
 def updateCategoryInDb(query: dict, updateData: dict):
-    return categoriesCollection.update_one(query, {"$set": updateData})
+    result = categoriesCollection.update_one(query, {"$set": updateData})
+    bumpCatalogVersion("categories")
+    return result
 
 
 def deleteCategoryFromDb(query: dict):
-    return categoriesCollection.delete_one(query)
+    result = categoriesCollection.delete_one(query)
+    bumpCatalogVersion("categories")
+    return result
@@ -1,4 +1,36 @@
-from Database.MongoData import emailVerifyCollection
+import time
+from pymongo import ReturnDocument
+from Database.MongoData import emailVerifyCollection, emailOutboxCollection
 
 def insertData(query):
-    return emailVerifyCollection.insert_one(query)
\ No newline at end of file
+    return emailVerifyCollection.insert_one(query)
+
+
+def ensureEmailIndexes():
+    emailOutboxCollection.create_index([("status", 1), ("nextAttemptAt", 1)])
+
+
+def insertOutboxEmail(email: dict):
+    return emailOutboxCollection.insert_one(email)
+
+
+def insertOutboxEmails(emails: list):
+    return emailOutboxCollection.insert_many(emails, ordered=False)
+
+
+def claimOutboxEmail(leaseSeconds: int):
+    """
+    Move the next due email to "sending". Emails left in "sending" longer than
+    the lease (worker crashed mid-send) are picked up again.
+    """
+    now = time.time()
+    return emailOutboxCollection.find_one_and_update(
+        {"$or": [{"status": "queued", "nextAttemptAt": {"$lte": now}}, {"status": "sending", "lockedAt": {"$lt": now - leaseSeconds}}]},
+        {"$set": {"status": "sending", "lockedAt": now}, "$inc": {"attempts": 1}},
+        sort=[("nextAttemptAt", 1)],
+        return_document=ReturnDocument.AFTER,
+    )
+
+
+def updateOutboxEmail(emailId, updateData: dict):
+    return emailOutboxCollection.update_one({"_id": emailId}, {"$set": updateData})
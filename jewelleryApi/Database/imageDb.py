@@ -0,0 +1,51 @@
+import time
+from pymongo import ReturnDocument
+from Database.MongoData import imageCollection
+
+
+def ensureImageIndexes():
+    imageCollection.create_index("fileName", unique=True)
+    imageCollection.create_index("sha256", unique=True, sparse=True)
+    imageCollection.create_index([("refCount", 1), ("lastUsedAt", 1)])
+
+
+def claimImageHash(sha256: str, image: dict):
+    """
+    Register an upload by content hash. Returns the existing document when the
+    content is already stored, or None when this call created the record.
+    """
+    return imageCollection.find_one_and_update(
+        {"sha256": sha256},
+        {"$setOnInsert": image, "$set": {"lastUsedAt": time.time()}},
+        upsert=True,
+        projection={"_id": 0},
+        return_document=ReturnDocument.BEFORE,
+    )
+
+
+def getImageFromDb(query: dict, projection: dict = {"_id": 0}):
+    return imageCollection.find_one(query, projection)
+
+
+def insertImageToDb(image: dict):
+    return imageCollection.insert_one(image)
+
+
+def getImagesFromDb(query: dict, projection: dict = {"_id": 0}):
+    return imageCollection.find(query, projection)
+
+
+def updateImageInDb(query: dict, updateData: dict):
+    return imageCollection.update_one(query, {"$set": updateData})
+
+
+def deleteImageFromDb(query: dict):
+    return imageCollection.delete_one(query)
+
+
+def changeImageRefCount(fileNames: list, delta: int):
+    return imageCollection.update_many({"fileName": {"$in": fileNames}}, {"$inc": {"refCount": delta}, "$set": {"lastUsedAt": time.time()}})
+
+
+def popOrphanImage(cutoff: float):
+    return imageCollection.find_one_and_delete({"refCount": {"$lte": 0}, "lastUsedAt": {"$lt": cutoff}}, projection={"_id": 0})
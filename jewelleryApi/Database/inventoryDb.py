@@ -0,0 +1,82 @@
+import time
+from pymongo import ReturnDocument
+from Database.MongoData import inventoryCollection, reservationCollection
+
+# ───── Stock counts: one document per product ───── #
+# available: can be sold, reserved: held by unpaid orders, sold: committed by paid orders
+
+
+def ensureInventoryIndexes():
+    inventoryCollection.create_index("productId", unique=True)
+    reservationCollection.create_index("id", unique=True)
+    reservationCollection.create_index([("status", 1), ("expiresAt", 1)])
+    reservationCollection.create_index("orderId")
+
+
+def getInventoryDb(productIds: list):
+    return inventoryCollection.find({"productId": {"$in": productIds}}, {"_id": 0})
+
+
+def setAvailableStockDb(productId: str, quantity: int, updatedAt: str):
+    return inventoryCollection.find_one_and_update(
+        {"productId": productId},
+        {"$set": {"available": quantity, "updatedAt": updatedAt}, "$setOnInsert": {"reserved": 0, "sold": 0}},
+        upsert=True,
+        projection={"_id": 0},
+        return_document=ReturnDocument.AFTER,
+    )
+
+
+def takeStockDb(productId: str, quantity: int):
+    """
+    Move `quantity` from available to reserved only if that many are available.
+    The guard and the decrement are one document update, so two checkouts racing
+    for the last piece cannot both succeed. Returns None when there is not enough.
+    """
+    return inventoryCollection.find_one_and_update(
+        {"productId": productId, "available": {"$gte": quantity}},
+        {"$inc": {"available": -quantity, "reserved": quantity}},
+        projection={"_id": 0},
+        return_document=ReturnDocument.AFTER,
+    )
+
+
+def returnStockDb(productId: str, quantity: int):
+    return inventoryCollection.find_one_and_update(
+        {"productId": productId},
+        {"$inc": {"available": quantity, "reserved": -quantity}},
+        projection={"_id": 0},
+        return_document=ReturnDocument.AFTER,
+    )
+
+
+def sellReservedStockDb(productId: str, quantity: int):
+    return inventoryCollection.update_one({"productId": productId}, {"$inc": {"reserved": -quantity, "sold": quantity}})
+
+
+# ───── Reservations: the stock held for one order ───── #
+
+
+def insertReservationDb(reservation: dict):
+    return reservationCollection.insert_one(reservation)
+
+
+def updateReservationDb(reservationId: str, updateData: dict):
+    return reservationCollection.update_one({"id": reservationId}, {"$set": updateData})
+
+
+def claimReservationDb(query: dict, fromStatus: str, toStatus: str, updateData: dict = {}):
+    """
+    Flip a reservation from one status to another. Only one caller (payment
+    verification, the webhook or the sweeper) wins, so stock moves exactly once.
+    """
+    return reservationCollection.find_one_and_update(
+        {**query, "status": fromStatus},
+        {"$set": {"status": toStatus, **updateData}},
+        projection={"_id": 0},
+        return_document=ReturnDocument.AFTER,
+    )
+
+
+def findExpiredReservationsDb(limit: int = 100):
+    return reservationCollection.find({"status": "held", "expiresAt": {"$lte": time.time()}}, {"_id": 0, "id": 1}).limit(limit)
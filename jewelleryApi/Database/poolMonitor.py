@@ -0,0 +1,71 @@
+import threading
+from collections import Counter
+from pymongo import monitoring
+
+
+class PoolStatsListener(monitoring.ConnectionPoolListener):
+    """
+    Counts connection pool activity for every MongoClient it is registered with,
+    so health checks can report saturation without touching the database.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counts = Counter()
+        self.maxPoolSize = 0
+
+    def change(self, **deltas):
+        with self.lock:
+            self.counts.update(deltas)
+
+    def pool_created(self, event):
+        with self.lock:
+            self.maxPoolSize += event.options.get("maxPoolSize", 100)
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        self.change(cleared=1)
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        self.change(open=1)
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self.change(open=-1)
+
+    def connection_check_out_started(self, event):
+        self.change(waiting=1)
+
+    def connection_check_out_failed(self, event):
+        self.change(waiting=-1, checkOutFailures=1)
+
+    def connection_checked_out(self, event):
+        self.change(waiting=-1, checkedOut=1)
+
+    def connection_checked_in(self, event):
+        self.change(checkedOut=-1)
+
+    def getStats(self) -> dict:
+        with self.lock:
+            counts = dict(self.counts)
+            maxPoolSize = self.maxPoolSize
+        checkedOut = counts.get("checkedOut", 0)
+        return {
+            "maxPoolSize": maxPoolSize,
+            "open": counts.get("open", 0),
+            "checkedOut": checkedOut,
+            "waiting": counts.get("waiting", 0),
+            "checkOutFailures": counts.get("checkOutFailures", 0),
+            "cleared": counts.get("cleared", 0),
+            "saturation": round(checkedOut / maxPoolSize, 4) if maxPoolSize else 0.0,
+        }
+
+
+poolStats = PoolStatsListener()
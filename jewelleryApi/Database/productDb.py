@@ -1,9 +1,13 @@
+from pymongo import UpdateMany, UpdateOne
 from Database.MongoData import productsCollection
+from Database.catalogVersionDb import bumpCatalogVersion
 
 # ───── Product Collection Methods ───── #
 
 def insertProductToDb(product: dict):
-    return productsCollection.insert_one(product)
+    result = productsCollection.insert_one(product)
+    bumpCatalogVersion("products")
+    return result
 
 def getProductsFromDb(query: dict = {}, projection: dict = {"_id": 0}):
     return productsCollection.find(query, projection)
@@ -12,15 +16,62 @@ def getProductFromDb(query: dict, projection: dict = {"_id": 0}):
     return productsCollection.find_one(query, projection)
 
 def updateProductInDb(query: dict, updateData: dict):
-    return productsCollection.update_one(query, {"$set": updateData})
+    result = productsCollection.update_one(query, {"$set": updateData})
+    bumpCatalogVersion("products")
+    return result
 
 def updateManyProductsInDb(query: dict, updateData: dict):
-    return productsCollection.update_many(query, {"$set": updateData})
+    result = productsCollection.update_many(query, {"$set": updateData})
+    bumpCatalogVersion("products")
+    return result
 
 def deleteProductFromDb(query: dict):
-    return productsCollection.delete_one(query)
+    result = productsCollection.delete_one(query)
+    bumpCatalogVersion("products")
+    return result
 
 def deleteProductsFromDb(query: dict):
-    return productsCollection.delete_many(query).deleted_count
+    result = productsCollection.delete_many(query)
+    bumpCatalogVersion("products")
+    return result.deleted_count
 
 
+def ratingBucket(rating: float) -> str:
+    return str(min(5, max(1, int(rating))))
+
+
+def emptyRatingSummary() -> dict:
+    return {"count": 0, "sum": 0, "average": 0, "histogram": {str(star): 0 for star in range(1, 6)}}
+
+
+def updateProductRating(productId: str, rating: float, delta: int):
+    """
+    Add (delta=1) or remove (delta=-1) one rating from the product's ratingSummary
+    in a single pipeline update, so concurrent reviews cannot lose increments.
+    """
+    bucket = ratingBucket(rating)
+    histogram = {f"ratingSummary.histogram.{star}": {"$ifNull": [f"$ratingSummary.histogram.{star}", 0]} for star in emptyRatingSummary()["histogram"]}
+    histogram[f"ratingSummary.histogram.{bucket}"] = {"$max": [0, {"$add": [{"$ifNull": [f"$ratingSummary.histogram.{bucket}", 0]}, delta]}]}
+    pipeline = [
+        {
+            "$set": {
+                "ratingSummary.count": {"$max": [0, {"$add": [{"$ifNull": ["$ratingSummary.count", 0]}, delta]}]},
+                "ratingSummary.sum": {"$max": [0, {"$add": [{"$ifNull": ["$ratingSummary.sum", 0]}, rating * delta]}]},
+                **histogram,
+            }
+        },
+        {"$set": {"ratingSummary.average": {"$cond": [{"$gt": ["$ratingSummary.count", 0]}, {"$round": [{"$divide": ["$ratingSummary.sum", "$ratingSummary.count"]}, 2]}, 0]}}},
+    ]
+    result = productsCollection.update_one({"id": productId}, pipeline)
+    bumpCatalogVersion("products")
+    return result
+
+
+def setProductRatingSummaries(summaries: dict):
+    """Overwrite ratingSummary for every product; products missing from `summaries` are reset."""
+    operations = [UpdateOne({"id": productId}, {"$set": {"ratingSummary": summary}}) for productId, summary in summaries.items()]
+    operations.append(UpdateMany({"id": {"$nin": list(summaries)}, "ratingSummary.count": {"$gt": 0}}, {"$set": {"ratingSummary": emptyRatingSummary()}}))
+    result = productsCollection.bulk_write(operations, ordered=False)
+    bumpCatalogVersion("products")
+    return result
+
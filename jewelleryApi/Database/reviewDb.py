@@ -1,17 +1,44 @@
 from Database.MongoData import reviewCollection
+from Database.catalogVersionDb import bumpCatalogVersion
+
+
+def ensureReviewIndexes():
+    # One index per review sort so every page is an index range scan
+    reviewCollection.create_index([("productId", 1), ("isDeleted", 1), ("createdAt", -1), ("id", -1)])
+    reviewCollection.create_index([("productId", 1), ("isDeleted", 1), ("rating", -1), ("createdAt", -1), ("id", -1)])
+    reviewCollection.create_index([("productId", 1), ("isDeleted", 1), ("rating", 1), ("createdAt", -1), ("id", -1)])
 
 
 def insertReviewToDb(review: dict):
-    return reviewCollection.insert_one(review)
+    result = reviewCollection.insert_one(review)
+    bumpCatalogVersion("reviews")
+    return result
 
 def getReviewsFromDb(query: dict):
     return reviewCollection.find(query, {"_id": 0})
 
+def getReviewsPage(query: dict, sortFields: list, limit: int):
+    return reviewCollection.find(query, {"_id": 0}).sort(sortFields).limit(limit)
+
 def getReviewFromDb(query: dict):
     return reviewCollection.find_one(query, {"_id": 0})
 
 def updateReviewInDb(query: dict, updateData: dict):
-    return reviewCollection.update_one(query, {"$set": updateData})
+    result = reviewCollection.update_one(query, {"$set": updateData})
+    bumpCatalogVersion("reviews")
+    return result
 
 def deleteReviewFromDb(query: dict, updateData: dict):
-    return reviewCollection.update_one(query, {"$set": updateData})
+    result = reviewCollection.update_one(query, {"$set": updateData})
+    bumpCatalogVersion("reviews")
+    return result
+
+
+def aggregateRatingBuckets():
+    """Count and rating sum of live reviews per product and star bucket (1-5, floored)."""
+    pipeline = [
+        {"$match": {"isDeleted": False}},
+        {"$group": {"_id": {"productId": "$productId", "bucket": {"$min": [5, {"$max": [1, {"$floor": "$rating"}]}]}}, "count": {"$sum": 1}, "sum": {"$sum": "$rating"}}},
+    ]
+    return reviewCollection.aggregate(pipeline)
+
@@ -11,6 +11,7 @@ class ProductModel(BaseModel):
     price: Optional[float] = None
     comparePrice: Optional[float] = None
     images: Optional[List[str]] = []
+    imageVariants: Optional[dict] = None
     stock: Optional[bool] = True
     updatedAt: Optional[str] = None
     id: Optional[str] = None
@@ -28,3 +29,13 @@ class CartItemModel(BaseModel):
 
 class BulkCartRequest(BaseModel):
     items: List[CartItemModel]
+
+
+class WishlistRequest(BaseModel):
+    productIds: List[str]
+
+
+class MoveWishlistToCartRequest(BaseModel):
+    productIds: List[str] = []  # every wishlist product when empty
+    selectedSize: Optional[str] = None
+
@@ -17,3 +17,14 @@ class ProductImportModel(BaseModel):
     isLatest: bool = False
     isHalfPaymentAvailable: bool = False 
     halfPaymentAmount: Optional[int] = None  # Amount for half payment option
+
+
+class StockUpdateModel(BaseModel):
+    quantity: int  # units available to sell, excluding those held by unpaid orders
+
+
+class ProductBatchModel(BaseModel):
+    ids: List[str] = Field(default_factory=list)
+    slugs: List[str] = Field(default_factory=list)
+    fields: Optional[List[str]] = None  # projection; full documents when omitted
+
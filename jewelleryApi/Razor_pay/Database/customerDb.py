@@ -39,4 +39,8 @@ def updateCustomerData(customerId, updatedCustomer):
 
 
 def createNotification(Notification):
-    return customersCollection.insert_one(Notification)
\ No newline at end of file
+    return customersCollection.insert_one(Notification)
+
+
+def createNotifications(notifications: list):
+    return customersCollection.insert_many(notifications, ordered=False)
@@ -1,7 +1,8 @@
 from pymongo import MongoClient
-from constants import mongoUrl,mongoCustomersCollection,mongoDatabase,mongoOrdersCollection,mongoPaymentsCollection,mongoPlansCollection,mongoSubscriptionsCollection,mongoInvoiceCollection,mongoTokensCollection,mongoTokenLogCollection
+from Database.poolMonitor import poolStats
+from constants import mongoUrl,mongoCustomersCollection,mongoDatabase,mongoOrdersCollection,mongoPaymentsCollection,mongoPlansCollection,mongoSubscriptionsCollection,mongoInvoiceCollection,mongoTokensCollection,mongoTokenLogCollection,mongoReconciliationCollection,mongoJobLeaseCollection
 
-client = MongoClient(mongoUrl)
+client = MongoClient(mongoUrl, event_listeners=[poolStats])
 db = client[mongoDatabase]
 ordersCollection = db[mongoOrdersCollection]
 paymentsCollection = db[mongoPaymentsCollection]   
@@ -11,3 +12,5 @@ subscriptionCollection = db[mongoSubscriptionsCollection]
 invoiceCollection = db[mongoInvoiceCollection]
 tokensCollection = db[mongoTokensCollection]
 tokenLogCollection = db[mongoTokenLogCollection]
+reconciliationCollection = db[mongoReconciliationCollection]
+jobLeaseCollection = db[mongoJobLeaseCollection]
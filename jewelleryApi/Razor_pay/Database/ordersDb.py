@@ -1,6 +1,14 @@
+import time
+from pymongo import ReturnDocument
 from Razor_pay.Database.db import ordersCollection
 
 
+def ensureOrderIndexes():
+    ordersCollection.create_index("id")
+    ordersCollection.create_index([("gatewaySync.status", 1), ("gatewaySync.nextAttemptAt", 1)])
+    ordersCollection.create_index("createdAt")
+
+
 def insertOrder(order):
     """
     Insert a new order into the orders collection.
@@ -42,3 +50,31 @@ def getSingleOrder(query):
     if order and "_id" in order:
         order["_id"] = str(order["_id"])
     return order
+
+
+def findOrders(query: dict, projection: dict = {"_id": 0}, batchSize: int = 500):
+    return ordersCollection.find(query, projection, batch_size=batchSize)
+
+
+def bulkUpdateOrders(operations: list):
+    return ordersCollection.bulk_write(operations, ordered=False)
+
+
+def scheduleGatewayTask(id: str, task: dict):
+    """Attach a gateway task to the order unless one is already queued or running."""
+    return ordersCollection.update_one({"id": id, "gatewaySync.status": {"$nin": ["queued", "sending"]}}, {"$set": {"gatewaySync": task}})
+
+
+def claimGatewayTask(leaseSeconds: int):
+    """
+    Move the next due gateway task to "sending". Tasks left in "sending" longer
+    than the lease (worker crashed mid-call) are picked up again.
+    """
+    now = time.time()
+    return ordersCollection.find_one_and_update(
+        {"$or": [{"gatewaySync.status": "queued", "gatewaySync.nextAttemptAt": {"$lte": now}}, {"gatewaySync.status": "sending", "gatewaySync.lockedAt": {"$lt": now - leaseSeconds}}]},
+        {"$set": {"gatewaySync.status": "sending", "gatewaySync.lockedAt": now}, "$inc": {"gatewaySync.attempts": 1}},
+        projection={"_id": 0},
+        sort=[("gatewaySync.nextAttemptAt", 1)],
+        return_document=ReturnDocument.AFTER,
+    )
@@ -1,3 +1,4 @@
+from pymongo import UpdateOne
 from Razor_pay.Database.db import paymentsCollection
 
 def insertPaymentData(paymentData: dict):
@@ -49,4 +50,8 @@ def upsertPayment(paymentId: str, paymentData: dict):
             "paymentId": paymentId
         }
     except Exception as e:
-        raise Exception(f"Failed to upsert payment: {e}")
\ No newline at end of file
+        raise Exception(f"Failed to upsert payment: {e}")
+
+def bulkUpsertPayments(payments: list):
+    operations = [UpdateOne({"paymentId": payment["paymentId"]}, {"$set": payment}, upsert=True) for payment in payments]
+    return paymentsCollection.bulk_write(operations, ordered=False)
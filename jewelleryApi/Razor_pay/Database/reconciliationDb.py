@@ -0,0 +1,42 @@
+import time
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from Razor_pay.Database.db import reconciliationCollection, jobLeaseCollection
+
+
+def ensureReconciliationIndexes():
+    reconciliationCollection.create_index([("startedAt", -1)])
+    jobLeaseCollection.create_index("id", unique=True)
+
+
+def insertReconciliationReport(report: dict):
+    result = reconciliationCollection.insert_one(report)
+    report.pop("_id", None)
+    return result
+
+
+def getReconciliationReports(limit: int = 20):
+    return list(reconciliationCollection.find({}, {"_id": 0}).sort("startedAt", -1).limit(limit))
+
+
+def acquireJobLease(name: str, owner: str, leaseSeconds: int):
+    """
+    Take or extend the lease on a job shared by all workers. Succeeds when the lease
+    is free, expired or already held by `owner`; returns None while another owner
+    holds it, in which case the upsert collides with the unique id.
+    """
+    now = time.time()
+    try:
+        return jobLeaseCollection.find_one_and_update(
+            {"id": name, "$or": [{"owner": owner}, {"expiresAt": {"$lte": now}}]},
+            {"$set": {"owner": owner, "expiresAt": now + leaseSeconds}},
+            upsert=True,
+            projection={"_id": 0},
+            return_document=ReturnDocument.AFTER,
+        )
+    except DuplicateKeyError:
+        return None
+
+
+def releaseJobLease(name: str, owner: str):
+    return jobLeaseCollection.update_one({"id": name, "owner": owner}, {"$set": {"expiresAt": 0}})
@@ -1,27 +1,24 @@
 from fastapi import APIRouter, Request
 from Razor_pay.Models.model import RemainingPaymentRequest
-from Razor_pay.Services.razorpayClient import client
+from Razor_pay.Utils.orderOutbox import newGatewayTask, processGatewayTask
 from Razor_pay.Database.ordersDb import *
 from Razor_pay.Database.customerDb import createNotification
 from ReturnLog.logReturn import returnResponse
 from yensiAuthentication import logger
 from Models.userModel import UserRoles
-from Utils.utils import hasRequiredRole
+from Utils.authorization import requireRoles
 from yensiDatetime.yensiDatetime import formatDateTime
 from Razor_pay.Models.model import OrderRequest
+from Razor_pay.Utils.campaignUtils import sendRemainingPaymentReminders
 
 router = APIRouter(tags=["Half-Payment"])
 
 
 @router.post("/admin/orders/{orderId}/enable-remaining-payment")
+@requireRoles(UserRoles.Admin.value)
 def enableRemainingPayment(request: Request, orderId: str):
     try:
         logger.info("Admin enabling remaining payment for orderId: %s", orderId)
-        userId = request.state.userMetadata.get("id")
-        if not hasRequiredRole(request, [UserRoles.Admin.value]):
-            logger.warning(f"Unauthorized access attempt by user [{userId}] to create product.")
-            return returnResponse(2000)
-
         order = getOrderById(orderId)
         if not order:
             logger.warning("Order not found for orderId: %s", orderId)
@@ -42,14 +39,10 @@ def enableRemainingPayment(request: Request, orderId: str):
 
 
 @router.post("/admin/orders/{orderId}/send-remaining-payment-notification")
+@requireRoles(UserRoles.Admin.value)
 def sendRemainingPaymentNotification(request: Request, orderId: str):
     try:
         logger.info("Sending remaining payment notification for orderId: %s", orderId)
-        userId = request.state.userMetadata.get("id")
-        if not hasRequiredRole(request, [UserRoles.Admin.value]):
-            logger.warning(f"Unauthorized access attempt by user [{userId}] to create product.")
-            return returnResponse(2000)
-
         order = getOrderById(orderId)
         if not order:
             logger.warning("Order not found for orderId: %s", orderId)
@@ -77,27 +70,46 @@ def sendRemainingPaymentNotification(request: Request, orderId: str):
         return returnResponse(1571)
 
 
+@router.post("/admin/orders/send-remaining-payment-reminders")
+@requireRoles(UserRoles.Admin.value)
+async def sendRemainingPaymentRemindersBulk(request: Request):
+    try:
+        userId = request.state.userMetadata.get("id")
+        summary = await sendRemainingPaymentReminders()
+        if summary is None:
+            return returnResponse(1574)
+        logger.info(f"Remaining payment reminders triggered by admin [{userId}]: {summary}")
+        return returnResponse(1572, result=summary)
+    except Exception as e:
+        logger.error("Failed to send remaining payment reminders: %s", str(e))
+        return returnResponse(1573)
+
+
 @router.post("/orders/remaining-payment")
 def createRemainingPaymentOrder(request: Request, payload: OrderRequest):
     try:
         logger.info("Initiating Razorpay order creation.")
-        razorpayPayload = {"amount": payload.amount, "currency": payload.currency, "receipt": payload.receipt, "notes": payload.notes or {}}
         orderId = payload.notes.get("originalOrderId") if payload.notes else None
 
         order = getOrderById(orderId)
         if not order:
             logger.warning("Order not found for orderId: %s", orderId)
             return returnResponse(1562)
-        # Create order with Razorpay
-        orderData = client.order.create(razorpayPayload)
-        secondOrderId = orderData.get("id")
-        if not secondOrderId:
-            logger.warning("Razorpay returned no order ID.")
-            return returnResponse(1527)
-        updateOrder(
-            {"id": orderId},
-            {"secondOrderId": secondOrderId, "halfPaymentDetails.remainingPaymentDate": formatDateTime(), "halfPaymentStatus": "created", "paymentType": "remaining"},
-        )
+        # The remaining amount was fixed from server prices when the first order was created
+        if payload.amount != order.get("remainingAmount"):
+            logger.warning("Remaining payment amount %s does not match order %s (%s)", payload.amount, orderId, order.get("remainingAmount"))
+            return returnResponse(1576, result={"amount": order.get("remainingAmount")})
+        if order.get("secondOrderId"):
+            logger.info("Remaining payment order already exists for orderId: %s", orderId)
+            return returnResponse(1566)
+
+        # Recorded on the order before calling Razorpay; the outbox worker retries with the same receipt
+        order["gatewaySync"] = newGatewayTask("remainingOrder", payload.amount, f"{orderId}_remaining", payload.currency, payload.notes)
+        if not scheduleGatewayTask(orderId, order["gatewaySync"]).modified_count:
+            logger.info("Remaining payment order already in progress for orderId: %s", orderId)
+            return returnResponse(1578)
+        if not processGatewayTask(order):
+            return returnResponse(1567 if getOrderById(orderId)["gatewaySync"]["status"] == "failed" else 1578)
         logger.info("Order created and stored successfully. orderId: %s", orderId)
         return returnResponse(1566)
 
@@ -1,13 +1,18 @@
 from bson import ObjectId
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, Query, Request
 from pydantic import BaseModel
 from Razor_pay.Models.model import OrderRequest, RemainingPaymentRequest
 from Razor_pay.Services.razorpayClient import client
+from Razor_pay.Utils.orderOutbox import newGatewayTask, processGatewayTask
+from Razor_pay.Utils.reconciliation import runReconciliation
+from Razor_pay.Database.reconciliationDb import getReconciliationReports
 from Razor_pay.Database.ordersDb import *
 from ReturnLog.logReturn import returnResponse
 from yensiAuthentication import logger
 from Models.userModel import UserRoles
-from Utils.utils import hasRequiredRole
+from Utils.authorization import requireRoles
+from Utils.inventory import reserveStock, releaseReservation
+from Utils.priceIndex import quoteOrder
 from yensiDatetime.yensiDatetime import formatDateTime
 
 
@@ -16,31 +21,46 @@ router = APIRouter(tags=["Order Service"])
 
 @router.post("/order")
 def createOrder(request: Request, payload: OrderRequest):
+    reservationId, stored = None, False
     try:
         logger.info("Initiating Razorpay order creation.")
 
         isHalfPayment = payload.isHalfPaid is True
-        # Prepare Razorpay payload
-        razorpayPayload = {"amount": payload.amount, "currency": payload.currency, "receipt": payload.receipt, "notes": payload.notes or {}}
-
-        # Create order with Razorpay
-        orderData = client.order.create(razorpayPayload)
-        orderId = orderData.get("id")
-        if not orderId:
-            logger.warning("Razorpay returned no order ID.")
-            return returnResponse(1527)
-
-        # Prepare full order document to insert into DB
+        items = [item.model_dump() for item in payload.items] if payload.items else []
+
+        # The client computes the amounts for display; charge only what current prices add up to
+        try:
+            quote = quoteOrder(items, isHalfPayment)
+        except ValueError as e:
+            logger.warning(f"Order rejected: {str(e)}")
+            return returnResponse(1577, result={"reason": str(e)})
+        if payload.amount != quote["amount"] or (isHalfPayment and payload.remainingAmount != quote["remainingAmount"]):
+            logger.warning(f"Order amount mismatch: client sent {payload.amount}/{payload.remainingAmount}, expected {quote['amount']}/{quote['remainingAmount']}")
+            return returnResponse(1576, result={"amount": quote["amount"], "remainingAmount": quote["remainingAmount"]})
+
+        # Hold stock before the customer is sent to pay; released again if anything below fails
+        reservation, shortProductId = reserveStock(items)
+        if shortProductId:
+            logger.warning(f"Order rejected, product [{shortProductId}] is out of stock")
+            return returnResponse(1575, result={"productId": shortProductId})
+        reservationId = reservation["id"] if reservation else None
+
+        # Persist the order and its pending gateway call together; the Razorpay order is
+        # created from that record, so a gateway failure never leaves an untracked order
+        localId = str(ObjectId())
+        notes = payload.notes or {}
         fullOrder = {
-            "id": str(ObjectId()),
-            "orderId": orderId,
+            "id": localId,
+            "orderId": None,
             "secondOrderId": None,
-            "amount": orderData.get("amount"),
-            "currency": orderData.get("currency"),
-            "receipt": orderData.get("receipt"),
-            "notes": orderData.get("notes"),
+            "amount": payload.amount,
+            "currency": payload.currency,
+            "receipt": localId,
+            "notes": notes,
+            "status": "pending",
             "createdAt": formatDateTime(),
-            "items": [item.model_dump() for item in payload.items] if payload.items else [],
+            "items": items,
+            "inventoryReservationId": reservationId,
             "shippingAddress": payload.shippingAddress.model_dump() if payload.shippingAddress else None,
             "trackingNumber": "",
             "isHalfPaid": isHalfPayment,
@@ -52,18 +72,29 @@ def createOrder(request: Request, payload: OrderRequest):
                 if isHalfPayment
                 else None
             ),
-            **{k: v for k, v in orderData.items() if k != "id"},  # Merge rest of Razorpay data
+            # The local id doubles as the Razorpay receipt, the idempotency key for retries
+            "gatewaySync": newGatewayTask("order", payload.amount, localId, payload.currency, notes),
         }
-
-        # Store in DB
         insertOrder(fullOrder)
-        fullOrder.pop("_id", None)
+        stored = True
+
+        # One inline attempt keeps checkout fast; the outbox worker owns any retries
+        orderData = processGatewayTask(fullOrder)
+        order = getSingleOrder({"id": localId})
+        order.pop("_id", None)
+        if not orderData:
+            if order["gatewaySync"]["status"] == "failed":
+                return returnResponse(1527, result=order)
+            logger.warning(f"Razorpay order for [{localId}] not created yet, left to the outbox worker")
+            return returnResponse(1578, result=order)
 
-        logger.info("Order created and stored successfully. orderId: %s", orderId)
-        return returnResponse(1526, result=fullOrder)
+        logger.info("Order created and stored successfully. orderId: %s", orderData["id"])
+        return returnResponse(1526, result=order)
 
     except Exception as e:
         logger.error("Order creation failed. Error: %s", str(e))
+        if reservationId and not stored:
+            releaseReservation(reservationId, "orderFailed")
         return returnResponse(1527)
 
 
@@ -76,6 +107,10 @@ def fetchOrder(request: Request, id: str):
             logger.warning("Local order not found.")
             return returnResponse(1556)
 
+        if not localOrder.get("orderId"):
+            logger.info("Razorpay order not created yet. Returning local order.")
+            return returnResponse(1528, result=localOrder)
+
         if localOrder.get("status") == "paid" and localOrder.get("halfPaymentStatus") in ["paid", "not_applicable"]:
             logger.info("Both payments already completed. Returning local order.")
             return returnResponse(1528, result=localOrder)
@@ -151,13 +186,10 @@ def getUserOrders(request: Request):
 
 
 @router.get("/admin/orders")
+@requireRoles(UserRoles.Admin.value)
 def getUserOrders(request: Request):
     try:
         userId = request.state.userMetadata.get("id")
-        if not hasRequiredRole(request, [UserRoles.Admin.value]):
-            logger.warning(f"Unauthorized access attempt by user [{userId}] to fetch product stats.")
-            return returnResponse(2000)
-
         logger.info(f"Fetching orders for user [{userId}]")
         orders = getAllOrders({})
         for order in orders:
@@ -167,3 +199,28 @@ def getUserOrders(request: Request):
     except Exception as e:
         logger.error(f"Failed to fetch user orders. Error: {str(e)}", exc_info=True)
         return returnResponse(1561)
+
+
+@router.post("/admin/reconciliation/run")
+@requireRoles(UserRoles.Admin.value)
+async def runPaymentReconciliation(request: Request):
+    try:
+        userId = request.state.userMetadata.get("id")
+        logger.info(f"Payment reconciliation triggered by admin [{userId}]")
+        report = await runReconciliation()
+        if report is None:
+            return returnResponse(1581)
+        return returnResponse(1579, result=report)
+    except Exception as e:
+        logger.error(f"Payment reconciliation failed. Error: {str(e)}", exc_info=True)
+        return returnResponse(1580)
+
+
+@router.get("/admin/reconciliation/reports")
+@requireRoles(UserRoles.Admin.value)
+def listReconciliationReports(request: Request, limit: int = Query(20, ge=1, le=100)):
+    try:
+        return returnResponse(1582, result=getReconciliationReports(limit))
+    except Exception as e:
+        logger.error(f"Failed to fetch reconciliation reports. Error: {str(e)}")
+        return returnResponse(1583)
@@ -8,6 +8,7 @@ from Razor_pay.Database.invoiceDb import *
 from Razor_pay.Utils.util import getCustomerId
 from Razor_pay.Utils.orderUtils import verifySignature
 from yensiDatetime.yensiDatetime import formatDateTime
+from Utils.inventory import commitReservation
 
 
 from Razor_pay.Models.paymentModel import PaymentVerificationPayload
@@ -70,6 +71,8 @@ def verifyPayment(payload: PaymentVerificationPayload):
         logger.debug("Fetched local order data for orderId %s: %s", payload.razorpay_order_id)
 
         updateOrder(query, {"status": currentStatus,"updatedAt": formatDateTime()})
+        if currentStatus == "paid" and order.get("inventoryReservationId"):
+            commitReservation(payload.razorpay_order_id)
 
         if order.get("isHalfPaid") is True and order.get("paymentType") == "remaining":
             logger.info("Marking half payment as complete.")
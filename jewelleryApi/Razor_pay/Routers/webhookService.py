@@ -9,6 +9,7 @@ from yensiAuthentication.mongoData import updateUser
 from constants import rpwebhookSecret
 from Razor_pay.Database.invoiceDb import updateInvoiceData
 from Razor_pay.Database.paymentsDb import upsertPayment
+from Utils.inventory import commitReservation
 
 router = APIRouter(prefix="/auth", tags=["Razorpay Webhooks"])
 
@@ -211,3 +212,9 @@ async def handlePaymentEvent(event):
 
     paymentId = paymentData.get("paymentId")
     upsertPayment(paymentId, paymentData)
+
+    # Covers customers who close the tab before /payment/verify runs. A failed attempt keeps
+    # the hold: checkout lets the customer retry on the same order, and the expiry sweep
+    # releases the stock once the order can no longer be paid in time
+    if paymentData.get("status") == "captured" and paymentData.get("orderId"):
+        commitReservation(paymentData["orderId"])
@@ -0,0 +1,185 @@
+import asyncio
+import itertools
+import time
+from collections import Counter
+from bson import ObjectId
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from constants import frontendUrl, campaignBatchSize, campaignConcurrency, campaignIntervalSeconds, reminderIntervalHours, reminderMaxCount
+from yensiAuthentication import logger
+from yensiDatetime.yensiDatetime import formatDateTime
+from Razor_pay.Database.ordersDb import findOrders, bulkUpdateOrders
+from Razor_pay.Database.customerDb import createNotifications
+from Utils.emailQueue import buildOutboxEmail, enqueueEmails, wakeEmailWorkers
+from Utils.emailTemplates import getCompiledTemplate, renderTemplate
+
+REMINDER_TEMPLATE = "Templates/remainingPayment.html"
+TRACKING_TEMPLATE = "Templates/trackingEmail.html"
+ORDER_PROJECTION = {"_id": 0, "id": 1, "notes": 1, "shippingAddress.fullName": 1, "remainingAmount": 1, "halfPaymentDetails": 1, "trackingNumber": 1}
+
+campaignLocks = {"remainingPaymentReminders": asyncio.Lock(), "shippedEmails": asyncio.Lock()}
+
+
+def reminderQuery(cutoff: float) -> dict:
+    # $not also matches orders where the field is missing, i.e. never reminded
+    return {
+        "isHalfPaid": True,
+        "enableRemainingPayment": True,
+        "halfPaymentStatus": {"$ne": "paid"},
+        "halfPaymentDetails.remindersSent": {"$not": {"$gte": reminderMaxCount}},
+        "halfPaymentDetails.lastReminderAt": {"$not": {"$gte": cutoff}},
+    }
+
+
+def shippedQuery() -> dict:
+    return {"trackingEmailPending": True, "trackingNumber": {"$nin": ["", None]}}
+
+
+def customerName(order: dict) -> str:
+    return (order.get("shippingAddress") or {}).get("fullName") or "Customer"
+
+
+def formatRupees(paise) -> str:
+    return f"₹{(paise or 0) / 100:,.2f}"
+
+
+def claimReminders(orders: list, claimId: str, cutoff: float, now: float) -> list:
+    # The eligibility filter is repeated so an order reminded since it was read is not claimed again
+    return [
+        UpdateOne(
+            {"id": order["id"], **reminderQuery(cutoff)},
+            {"$inc": {"halfPaymentDetails.remindersSent": 1}, "$set": {"halfPaymentDetails.lastReminderAt": now, "halfPaymentDetails.reminderClaim": claimId}},
+        )
+        for order in orders
+    ]
+
+
+def buildReminderMessages(orders: list) -> tuple:
+    parts = getCompiledTemplate(REMINDER_TEMPLATE)
+    emails, notifications = [], []
+    for order in orders:
+        orderId, notes = order["id"], order.get("notes") or {}
+        notifications.append(
+            {
+                "orderId": orderId,
+                "type": "remaining_payment_available",
+                "title": "Complete your payment",
+                "message": "Your order is ready for delivery. Please complete the remaining payment.",
+                "isRead": False,
+                "userId": notes.get("userId"),
+                "actionUrl": f"/pay-remaining/{orderId}",
+                "createdAt": formatDateTime(),
+            }
+        )
+        if notes.get("userEmail"):
+            remainingAmount = order.get("remainingAmount") or (order.get("halfPaymentDetails") or {}).get("remainingAmount")
+            context = {"userName": customerName(order), "orderId": orderId, "remainingAmount": formatRupees(remainingAmount), "paymentUrl": f"{frontendUrl}/pay-remaining/{orderId}"}
+            emails.append(buildOutboxEmail(notes["userEmail"], "Complete your Taanera order payment", renderTemplate(parts, context), {"orderId": orderId, "type": "remaining-payment-reminder"}))
+    return emails, notifications
+
+
+def claimShipped(orders: list, claimId: str) -> list:
+    return [
+        UpdateOne({"id": order["id"], **shippedQuery()}, {"$set": {"trackingEmailPending": False, "trackingEmailSentAt": formatDateTime(), "trackingEmailClaim": claimId}})
+        for order in orders
+    ]
+
+
+def buildShippedMessages(orders: list) -> tuple:
+    parts = getCompiledTemplate(TRACKING_TEMPLATE)
+    emails = []
+    for order in orders:
+        orderId, notes = order["id"], order.get("notes") or {}
+        if notes.get("userEmail"):
+            context = {"userName": customerName(order), "orderId": orderId, "trackingId": order["trackingNumber"]}
+            record = {"orderId": orderId, "trackingId": order["trackingNumber"], "type": "tracking-email"}
+            emails.append(buildOutboxEmail(notes["userEmail"], f"Your Order {orderId} Has Been Shipped", renderTemplate(parts, context), record))
+    return emails, []
+
+
+def writeBatch(orders: list, claim, claimField: str, buildMessages) -> dict:
+    """
+    Claim the batch's orders with one bulk update that stamps a fresh claim id, then
+    build messages only for the orders that carry it. An order another run (or
+    another worker) got to first fails the guard and is skipped here, so nobody
+    is messaged twice. Claims are written first: a failure after them skips a
+    message rather than sending it twice.
+    """
+    claimId = str(ObjectId())
+    try:
+        bulkUpdateOrders(claim(orders, claimId))
+    except BulkWriteError as e:
+        # Unordered, so the other updates were applied; the re-read below finds exactly those
+        logger.error(f"Campaign claim partially failed for {len(e.details.get('writeErrors', []))} of {len(orders)} orders")
+    claimed = list(findOrders({"id": {"$in": [order["id"] for order in orders]}, claimField: claimId}, ORDER_PROJECTION))
+    emails, notifications = buildMessages(claimed)
+    if notifications:
+        createNotifications(notifications)
+    enqueueEmails(emails)
+    return {"orders": len(orders), "emails": len(emails), "notifications": len(notifications), "updated": len(claimed)}
+
+
+async def runCampaign(name: str, query: dict, claim, claimField: str, buildMessages) -> dict:
+    """
+    Stream matching orders in batches and write each batch (one bulk claiming update,
+    then notifications and outbox emails for the claimed orders) with at most
+    `campaignConcurrency` batches in flight. Returns None when the same campaign is
+    already running in this process; runs elsewhere are kept apart by the claims.
+    """
+    lock = campaignLocks[name]
+    if lock.locked():
+        logger.warning(f"Campaign {name} is already running")
+        return None
+
+    async with lock:
+        startedAt = time.monotonic()
+        totals = Counter()
+        slots = asyncio.Semaphore(campaignConcurrency)
+        cursor = findOrders(query, ORDER_PROJECTION, campaignBatchSize)
+
+        async def processBatch(orders: list):
+            try:
+                totals.update(await asyncio.to_thread(writeBatch, orders, claim, claimField, buildMessages))
+            except Exception as e:
+                totals["failedBatches"] += 1
+                logger.error(f"Campaign {name} batch of {len(orders)} orders failed: {e}")
+            finally:
+                slots.release()
+
+        tasks = []
+        try:
+            while orders := await asyncio.to_thread(lambda: list(itertools.islice(cursor, campaignBatchSize))):
+                await slots.acquire()
+                tasks.append(asyncio.create_task(processBatch(orders)))
+            await asyncio.gather(*tasks)
+        finally:
+            cursor.close()
+
+        wakeEmailWorkers()
+        summary = {"orders": 0, "emails": 0, "notifications": 0, "updated": 0, "failedBatches": 0, **totals}
+        summary["durationMs"] = round((time.monotonic() - startedAt) * 1000)
+        logger.info(f"Campaign {name} finished: {summary}")
+        return summary
+
+
+async def sendRemainingPaymentReminders() -> dict:
+    now = time.time()
+    cutoff = now - reminderIntervalHours * 3600
+    claim = lambda orders, claimId: claimReminders(orders, claimId, cutoff, now)
+    return await runCampaign("remainingPaymentReminders", reminderQuery(cutoff), claim, "halfPaymentDetails.reminderClaim", buildReminderMessages)
+
+
+async def sendShippedEmails() -> dict:
+    return await runCampaign("shippedEmails", shippedQuery(), claimShipped, "trackingEmailClaim", buildShippedMessages)
+
+
+async def runCampaignScheduler():
+    if campaignIntervalSeconds <= 0:
+        return
+    while True:
+        await asyncio.sleep(campaignIntervalSeconds)
+        for campaign in (sendShippedEmails, sendRemainingPaymentReminders):
+            try:
+                await campaign()
+            except Exception as e:
+                logger.error(f"Scheduled campaign {campaign.__name__} failed: {e}")
@@ -0,0 +1,108 @@
+import asyncio
+import random
+import time
+from razorpay.errors import BadRequestError
+from constants import gatewayTimeoutSeconds, orderOutboxPollSeconds, orderOutboxLeaseSeconds, orderOutboxMaxAttempts, orderOutboxRetryBaseSeconds, orderOutboxRetryMaxSeconds
+from yensiAuthentication import logger
+from yensiDatetime.yensiDatetime import formatDateTime
+from Razor_pay.Services.razorpayClient import client
+from Razor_pay.Database.ordersDb import updateOrder, claimGatewayTask
+from Utils.inventory import attachReservation, releaseReservation
+
+# Gateway calls an order still owes, kept on the order document itself as `gatewaySync`
+# so the order and its pending side effect are written together in one insert or update.
+
+
+def newGatewayTask(kind: str, amount: int, receipt: str, currency: str, notes: dict) -> dict:
+    # Created already claimed: the request makes the first attempt inline, the worker retries
+    now = time.time()
+    return {
+        "kind": kind,
+        "amount": amount,
+        "receipt": receipt,
+        "currency": currency or "INR",
+        "notes": notes or {},
+        "status": "sending",
+        "attempts": 1,
+        "lockedAt": now,
+        "nextAttemptAt": now,
+        "lastError": None,
+    }
+
+
+def retryDelay(attempts: int) -> float:
+    delay = min(orderOutboxRetryMaxSeconds, orderOutboxRetryBaseSeconds * 2 ** (attempts - 1))
+    return delay * random.uniform(0.8, 1.2)
+
+
+def findGatewayOrder(receipt: str):
+    orders = client.order.all({"receipt": receipt}, timeout=gatewayTimeoutSeconds).get("items") or []
+    return orders[0] if orders else None
+
+
+def createGatewayOrder(task: dict) -> dict:
+    """
+    The receipt is the idempotency key: a retry first asks Razorpay for an order with
+    this receipt, since an earlier attempt may have created it before timing out.
+    """
+    if task["attempts"] > 1:
+        existing = findGatewayOrder(task["receipt"])
+        if existing:
+            logger.info(f"Reusing Razorpay order {existing['id']} for receipt {task['receipt']}")
+            return existing
+    orderData = client.order.create({"amount": task["amount"], "currency": task["currency"], "receipt": task["receipt"], "notes": task["notes"]}, timeout=gatewayTimeoutSeconds)
+    if not orderData.get("id"):
+        raise ValueError("Razorpay returned no order ID")
+    return orderData
+
+
+def completeGatewayTask(order: dict, orderData: dict):
+    done = {"gatewaySync.status": "done", "gatewaySync.completedAt": formatDateTime(), "gatewaySync.lastError": None, "updatedAt": formatDateTime()}
+    if order["gatewaySync"]["kind"] == "remainingOrder":
+        updateOrder(
+            {"id": order["id"]},
+            {"secondOrderId": orderData["id"], "halfPaymentDetails.remainingPaymentDate": formatDateTime(), "halfPaymentStatus": "created", "paymentType": "remaining", **done},
+        )
+        return
+    updateOrder({"id": order["id"]}, {**{k: v for k, v in orderData.items() if k != "id"}, "orderId": orderData["id"], **done})
+    if order.get("inventoryReservationId"):
+        attachReservation(order["inventoryReservationId"], orderData["id"])
+
+
+def failGatewayTask(order: dict, error: Exception):
+    task = order["gatewaySync"]
+    if isinstance(error, BadRequestError) or task["attempts"] >= orderOutboxMaxAttempts:
+        logger.error(f"Giving up on Razorpay {task['kind']} for order {order['id']} after {task['attempts']} attempts: {error}")
+        failed = {"gatewaySync.status": "failed", "gatewaySync.lastError": str(error), "gatewaySync.failedAt": formatDateTime()}
+        if task["kind"] == "order":
+            failed["status"] = "failed"
+            if order.get("inventoryReservationId"):
+                releaseReservation(order["inventoryReservationId"], "gatewayFailed")
+        updateOrder({"id": order["id"]}, failed)
+        return
+    delay = retryDelay(task["attempts"])
+    logger.warning(f"Razorpay {task['kind']} for order {order['id']} failed (attempt {task['attempts']}), retrying in {delay:.0f}s: {error}")
+    updateOrder({"id": order["id"]}, {"gatewaySync.status": "queued", "gatewaySync.lastError": str(error), "gatewaySync.nextAttemptAt": time.time() + delay})
+
+
+def processGatewayTask(order: dict):
+    """Run the order's claimed gateway task once. Returns the Razorpay order, or None if it will be retried or has failed."""
+    try:
+        orderData = createGatewayOrder(order["gatewaySync"])
+    except Exception as e:
+        failGatewayTask(order, e)
+        return None
+    completeGatewayTask(order, orderData)
+    return orderData
+
+
+async def runOrderOutboxWorker():
+    while True:
+        try:
+            order = await asyncio.to_thread(claimGatewayTask, orderOutboxLeaseSeconds)
+            if order is not None:
+                await asyncio.to_thread(processGatewayTask, order)
+                continue
+        except Exception as e:
+            logger.error(f"Order outbox worker failed: {str(e)}")
+        await asyncio.sleep(orderOutboxPollSeconds)
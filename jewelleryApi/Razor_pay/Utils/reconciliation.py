@@ -0,0 +1,186 @@
+import asyncio
+import itertools
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from bson import ObjectId
+from pymongo import UpdateOne
+from constants import gatewayTimeoutSeconds, reconciliationIntervalSeconds, reconciliationBatchSize, reconciliationConcurrency, reconciliationSampleSize, reconciliationWindowDays, reconciliationLeaseSeconds
+from yensiAuthentication import logger
+from yensiDatetime.yensiDatetime import formatDateTime
+from Razor_pay.Services.razorpayClient import client
+from Razor_pay.Database.ordersDb import findOrders, bulkUpdateOrders
+from Razor_pay.Database.paymentsDb import bulkUpsertPayments
+from Razor_pay.Database.reconciliationDb import insertReconciliationReport, acquireJobLease, releaseJobLease
+from Razor_pay.Utils.webhookUtils import extractCleanPaymentData
+from Utils.inventory import commitReservation
+
+RECONCILE_PROJECTION = {"_id": 0, "id": 1, "orderId": 1, "secondOrderId": 1, "status": 1, "isHalfPaid": 1, "halfPaymentStatus": 1, "inventoryReservationId": 1}
+
+RECONCILIATION_LEASE = "paymentReconciliation"
+
+
+def windowStart() -> str:
+    # Same YYYYMMDDHHmmssfff form as formatDateTime, so it compares as a string
+    return (datetime.now() - timedelta(days=reconciliationWindowDays)).strftime("%Y%m%d%H%M%S") + "000"
+
+
+def reconciliationQuery(since: str) -> dict:
+    """
+    Orders that can still change on the gateway. Paid orders are final, and Razorpay
+    never closes an abandoned one, so unpaid orders are only followed while they
+    (or their remaining-payment order) are younger than `since`.
+    """
+    return {
+        "orderId": {"$nin": [None, ""]},
+        "$or": [
+            {"status": {"$ne": "paid"}, "createdAt": {"$gte": since}},
+            {"isHalfPaid": True, "secondOrderId": {"$nin": [None, ""]}, "halfPaymentStatus": {"$ne": "paid"}, "halfPaymentDetails.remainingPaymentDate": {"$gte": since}},
+        ],
+    }
+
+
+def fetchGatewayOrder(orderId: str) -> dict:
+    return client.order.fetch(orderId, timeout=gatewayTimeoutSeconds)
+
+
+def fetchGatewayPayments(orderId: str) -> list:
+    return client.order.payments(orderId, timeout=gatewayTimeoutSeconds).get("items") or []
+
+
+class Reconciler:
+    """
+    Compares local orders with the gateway and collects repairs. The fetchers are
+    plain callables taking a Razorpay order id, so a local stand-in can replace
+    Razorpay when exercising the job. `renewLease`, when given, is called between
+    batches and the run stops as soon as it returns a falsy value.
+    """
+
+    def __init__(self, fetchOrder=fetchGatewayOrder, fetchPayments=fetchGatewayPayments, renewLease=None):
+        self.fetchOrder = fetchOrder
+        self.fetchPayments = fetchPayments
+        self.renewLease = renewLease
+        self.slots = asyncio.Semaphore(reconciliationConcurrency)
+        self.counts = Counter()
+        self.mismatches = []
+
+    async def call(self, fetch, orderId: str):
+        async with self.slots:
+            return await asyncio.to_thread(fetch, orderId)
+
+    def compare(self, order: dict, field: str, gatewayStatus, repairs: list):
+        # The filter repeats the value that was read, so a concurrent verify or webhook update is never overwritten
+        if gatewayStatus and gatewayStatus != order.get(field):
+            update = {field: gatewayStatus, "updatedAt": formatDateTime(), "reconciledAt": formatDateTime()}
+            repairs.append((field, order.get(field), gatewayStatus, UpdateOne({"id": order["id"], field: order.get(field)}, {"$set": update})))
+            return gatewayStatus == "paid"
+        return False
+
+    async def checkOrder(self, order: dict, operations: list, payments: list, paidOrderIds: list):
+        """Queue the repairs for one order; nothing is queued unless every gateway call for it succeeded."""
+        repairs, orderPayments, paidGatewayIds = [], [], []
+        try:
+            if order.get("status") != "paid":
+                gatewayOrder = await self.call(self.fetchOrder, order["orderId"])
+                if self.compare(order, "status", gatewayOrder.get("status"), repairs):
+                    paidGatewayIds.append(order["orderId"])
+
+            if order.get("isHalfPaid") and order.get("secondOrderId") and order.get("halfPaymentStatus") != "paid":
+                gatewayOrder = await self.call(self.fetchOrder, order["secondOrderId"])
+                if self.compare(order, "halfPaymentStatus", gatewayOrder.get("status"), repairs):
+                    paidGatewayIds.append(order["secondOrderId"])
+
+            # Payments for orders that just turned out to be paid may never have reached the webhook
+            for gatewayId in paidGatewayIds:
+                orderPayments.extend(extractCleanPaymentData(payment, "reconciliation") for payment in await self.call(self.fetchPayments, gatewayId))
+        except Exception as e:
+            self.counts["fetchErrors"] += 1
+            logger.warning(f"Reconciliation could not check order {order['id']}: {e}")
+            return
+
+        self.counts["mismatchedOrders" if repairs else "matched"] += 1
+        for field, local, gateway, operation in repairs:
+            self.counts[f"{field}Repairs"] += 1
+            if len(self.mismatches) < reconciliationSampleSize:
+                self.mismatches.append({"id": order["id"], "field": field, "local": local, "gateway": gateway})
+            operations.append(operation)
+        payments.extend(orderPayments)
+        if order["orderId"] in paidGatewayIds and order.get("inventoryReservationId"):
+            paidOrderIds.append(order["orderId"])
+
+    def writeRepairs(self, operations: list, payments: list, paidOrderIds: list):
+        if operations:
+            self.counts["ordersUpdated"] += bulkUpdateOrders(operations).modified_count
+        if payments:
+            bulkUpsertPayments(payments)
+            self.counts["paymentsUpserted"] += len(payments)
+        for orderId in paidOrderIds:
+            if commitReservation(orderId):
+                self.counts["reservationsCommitted"] += 1
+
+    async def processBatch(self, orders: list):
+        operations, payments, paidOrderIds = [], [], []
+        await asyncio.gather(*(self.checkOrder(order, operations, payments, paidOrderIds) for order in orders))
+        self.counts["scanned"] += len(orders)
+        try:
+            await asyncio.to_thread(self.writeRepairs, operations, payments, paidOrderIds)
+        except Exception as e:
+            self.counts["failedBatches"] += 1
+            logger.error(f"Reconciliation failed to write repairs for {len(operations)} orders: {e}")
+
+    async def run(self) -> dict:
+        startedAt, startedClock = formatDateTime(), time.monotonic()
+        complete = True
+        cursor = findOrders(reconciliationQuery(windowStart()), RECONCILE_PROJECTION, reconciliationBatchSize)
+        try:
+            # Batches run one after another; the gateway calls inside each share the semaphore
+            while orders := await asyncio.to_thread(lambda: list(itertools.islice(cursor, reconciliationBatchSize))):
+                await self.processBatch(orders)
+                if self.renewLease and not await asyncio.to_thread(self.renewLease):
+                    logger.warning("Reconciliation lost its lease, stopping early")
+                    complete = False
+                    break
+        finally:
+            cursor.close()
+
+        counts = {"scanned": 0, "matched": 0, "mismatchedOrders": 0, "statusRepairs": 0, "halfPaymentStatusRepairs": 0, "ordersUpdated": 0, "paymentsUpserted": 0, "reservationsCommitted": 0, "fetchErrors": 0, "failedBatches": 0, **self.counts}
+        return {
+            "id": str(ObjectId()),
+            "startedAt": startedAt,
+            "finishedAt": formatDateTime(),
+            "durationMs": round((time.monotonic() - startedClock) * 1000),
+            "complete": complete,
+            "counts": counts,
+            "mismatches": self.mismatches,
+        }
+
+
+async def runReconciliation(fetchOrder=fetchGatewayOrder, fetchPayments=fetchGatewayPayments) -> dict:
+    """
+    Reconcile all open orders and store the report. Scheduled and admin runs in every
+    worker share one Mongo lease, renewed between batches; returns None while a run
+    holds it.
+    """
+    owner = str(ObjectId())
+    if not await asyncio.to_thread(acquireJobLease, RECONCILIATION_LEASE, owner, reconciliationLeaseSeconds):
+        logger.warning("Reconciliation is already running")
+        return None
+    try:
+        renewLease = lambda: acquireJobLease(RECONCILIATION_LEASE, owner, reconciliationLeaseSeconds)
+        report = await Reconciler(fetchOrder, fetchPayments, renewLease).run()
+        await asyncio.to_thread(insertReconciliationReport, report)
+        logger.info(f"Reconciliation finished in {report['durationMs']}ms: {report['counts']}")
+        return report
+    finally:
+        await asyncio.to_thread(releaseJobLease, RECONCILIATION_LEASE, owner)
+
+
+async def runReconciliationScheduler():
+    if reconciliationIntervalSeconds <= 0:
+        return
+    while True:
+        await asyncio.sleep(reconciliationIntervalSeconds)
+        try:
+            await runReconciliation()
+        except Exception as e:
+            logger.error(f"Scheduled reconciliation failed: {e}")
@@ -1,17 +1,47 @@
+import orjson
+from bson import ObjectId
+from decimal import Decimal
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import Response
+from pydantic import BaseModel
 from StatusCodes.statusCodes import CUSTOM_STATUS_CODES
-from fastapi import Request
 from yensiAuthentication import logger
 
 
+def encodeValue(value):
+    """
+    orjson handles dicts, lists, datetimes, UUIDs and enums natively; this covers
+    the remaining types handlers return, falling back to FastAPI's encoder.
+    """
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if isinstance(value, Decimal):
+        return float(value)
+    return jsonable_encoder(value)
+
+
+def buildEnvelope(code, result=None) -> dict:
+    if not isinstance(code, int):
+        raise TypeError("Code must be an integer")
+    envelope = {"code": code, "message": CUSTOM_STATUS_CODES[code]["message"]}
+    if result is not None:
+        envelope["result"] = result
+    return envelope
+
+
 def returnResponse(code, result=None):
+    """
+    Serialize the envelope straight to JSON bytes. Returning a Response lets FastAPI
+    skip jsonable_encoder and its own serialization for every endpoint.
+    """
     try:
-        if not isinstance(code, int):
-            raise TypeError("Code must be an integer")
-        response = {"code": code, "message": CUSTOM_STATUS_CODES[code]["message"]}
-        if result is not None:
-            response["result"] = result
-        return response
+        content = orjson.dumps(buildEnvelope(code, result), default=encodeValue, option=orjson.OPT_NON_STR_KEYS)
+        return Response(content=content, media_type="application/json")
 
     except Exception as e:
         logger.error(f"Error creating a returnResponse : {str(e)}")
-        raise e
\ No newline at end of file
+        raise e
@@ -4,26 +4,24 @@ from bson import ObjectId
 from fastapi import APIRouter, Request
 from Models.categoryModel import CategoryModel, UpdateCategoryModel
 from Database.categoryDb import insertCategoryIfNotExists, getCategoryFromDb, updateCategoryInDb
-from Utils.utils import hasRequiredRole
+from Utils.authorization import requireRoles
 from yensiDatetime.yensiDatetime import formatDateTime
 from Models.userModel import UserRoles
 from yensiAuthentication import logger
 from Utils.slugify import slugify
 from ReturnLog.logReturn import returnResponse
-from Database.productDb import getProductsFromDb, updateProductInDb, updateManyProductsInDb
+from Database.productDb import getProductsFromDb, updateManyProductsInDb
+from Utils.imageUploader import updateImageReferences, releaseImages, releaseImageLists
 
 router = APIRouter(prefix="/admin", tags=["Admin-Categories"])
 
 
 @router.post("/categories")
+@requireRoles(UserRoles.Admin.value)
 async def createCategory(request: Request, payload: CategoryModel):
     try:
         logger.info("createCategory function started")
 
-        if not hasRequiredRole(request, [UserRoles.Admin.value]):
-            logger.warning("Unauthorized access to create category")
-            return returnResponse(2000)
-
         slug = slugify(payload.slug or payload.name)
 
         existing = getCategoryFromDb({"slug": slug})
@@ -58,6 +56,7 @@ async def createCategory(request: Request, payload: CategoryModel):
         else:
             categoryData["sizeOptions"] = []
         insertCategoryIfNotExists(categoryData)
+        updateImageReferences([], [payload.image] if payload.image else [])
         categoryData.pop("_id", None)
         logger.info(f"Category created successfully: {payload.name}")
         return returnResponse(2020, result=categoryData)
@@ -68,24 +67,26 @@ async def createCategory(request: Request, payload: CategoryModel):
 
 
 @router.delete("/categories/{id}")
+@requireRoles(UserRoles.Admin.value)
 async def deleteCategory(request: Request, id: str):
     try:
         logger.debug(f"deleteCategorey function started for id:{id}")
-        if not hasRequiredRole(request, [UserRoles.Admin.value]):
-            logger.warning("Unauthorized access to delete category")
-            return returnResponse(2000)
         category = getCategoryFromDb({"id": id, "isDeleted": False})
         if not category:
             logger.warning(f"category not found for id:{id}")
             return returnResponse(2105)
         categoryName = category.get("slug")
-        productData = list(getProductsFromDb({"category": categoryName, "isDeleted": False}))
-        if productData:
-            for category in productData:
-                logger.info(f"category deleteing in productd for Name:{categoryName}")
-                updateProductInDb({"category": categoryName}, {"isDeleted": True})
-                logger.info(f"category deleted successfully in Products :{categoryName}")
+        categoryImage = category.get("image")
+        productQuery = {"category": categoryName, "isDeleted": False}
+        products = list(getProductsFromDb(productQuery, {"_id": 0, "images": 1}))
+        if products:
+            logger.info(f"category deleteing in productd for Name:{categoryName}")
+            updateManyProductsInDb(productQuery, {"isDeleted": True})
+            # Same as deleting the products directly: their images lose a reference each
+            releaseImageLists([product.get("images") for product in products])
+            logger.info(f"category deleted successfully in {len(products)} Products :{categoryName}")
         updateCategoryInDb({"id": id}, {"isDeleted": True})
+        releaseImages([categoryImage] if categoryImage else [])
         logger.info(f"category deleted successfully for id:{id}")
         return returnResponse(2024)
     except Exception as e:
@@ -94,12 +95,10 @@ async def deleteCategory(request: Request, id: str):
 
 
 @router.put("/categories/{categoryId}")
+@requireRoles(UserRoles.Admin.value)
 async def updateCategory(request: Request, categoryId: str, payload: UpdateCategoryModel):
     try:
         logger.info(f"updateCategory called for ID: {categoryId}")
-        if not hasRequiredRole(request, [UserRoles.Admin.value]):
-            logger.warning("Unauthorized access to update category")
-            return returnResponse(2000)
         existing = getCategoryFromDb({"id": categoryId, "isDeleted": False})
         if not existing:
             logger.info(f"No category found with ID: {categoryId}")
@@ -119,6 +118,8 @@ async def updateCategory(request: Request, categoryId: str, payload: UpdateCateg
             updateData["categoryType"] = payload.categoryType
         updateData["updatedAt"] = formatDateTime()
         updateCategoryInDb({"id": categoryId}, updateData)
+        if payload.image is not None:
+            updateImageReferences([existing["image"]] if existing.get("image") else [], [payload.image] if payload.image else [])
         updated = getCategoryFromDb({"id": categoryId})
         updated.pop("_id", None)
         logger.info(f"Category updated successfully: {categoryId}")
@@ -1,9 +1,9 @@
 # routers/adminProductRouter.py
 from bson import ObjectId
 from fastapi import APIRouter, Request
-from Models.productModel import ProductImportModel
+from Models.productModel import ProductImportModel, StockUpdateModel
 from Database.productDb import getProductsFromDb, updateManyProductsInDb, insertProductToDb, getProductFromDb, updateProductInDb
-from Utils.utils import hasRequiredRole
+from Utils.authorization import requireRoles
 from yensiDatetime.yensiDatetime import formatDateTime
 from Models.userModel import UserRoles
 from yensiAuthentication import logger
@@ -11,19 +11,18 @@ from Utils.slugify import slugify
 from ReturnLog.logReturn import returnResponse
 from Razor_pay.Database.ordersDb import getAllOrders
 from Database.categoryDb import getCategoryFromDb
+from Utils.imageUploader import getImageVariants, updateImageReferences, releaseImages, releaseImageLists
+from Utils.inventory import setAvailableStock
 
 router = APIRouter(prefix="/admin", tags=["Admin-Products"])
 
 
 @router.post("/product/create")
+@requireRoles(UserRoles.Admin.value)
 async def createProduct(request: Request, payload: ProductImportModel):
     try:
         userId = request.state.userMetadata.get("id")
 
-        if not hasRequiredRole(request, [UserRoles.Admin.value]):
-            logger.warning(f"Unauthorized access attempt by user [{userId}] to create product.")
-            return returnResponse(2000)
-
         logger.info(f"Product creation started by user [{userId}] for product: {payload.name}")
 
         slug = slugify(payload.slug or payload.name)
@@ -34,17 +33,19 @@ async def createProduct(request: Request, payload: ProductImportModel):
             return returnResponse(2025)
         sizeOptions = category.get("sizeOptions")
         categoryName = category.get("name")
-        productDict.update({"slug": slug, "updatedAt": formatDateTime(), "sizeOptions": sizeOptions, "categoryId": payload.category})
+        productDict.update({"slug": slug, "updatedAt": formatDateTime(), "sizeOptions": sizeOptions, "categoryId": payload.category, "imageVariants": getImageVariants(payload.images)})
 
         existing = getProductFromDb({"slug": slug, "isDeleted": False})
 
         if existing:
             productDict["id"] = existing["id"]
             updateProductInDb({"slug": slug, "isDeleted": False}, productDict)
+            updateImageReferences(existing.get("images", []), productDict["images"])
             logger.info(f"Updated existing product: {payload.name} (slug: {slug})")
         else:
             productDict.update({"id": str(ObjectId()), "createdBy": userId, "createdAt": formatDateTime(), "isDeleted": False})
             insertProductToDb(productDict)
+            updateImageReferences([], productDict["images"])
             logger.info(f"Inserted new product: {payload.name} (slug: {slug})")
         updateProductInDb({"slug": slug, "isDeleted": False}, {"category": categoryName})
         productDict.pop("_id", None)
@@ -57,15 +58,12 @@ async def createProduct(request: Request, payload: ProductImportModel):
 
 
 @router.put("/product/id/{productId}")
+@requireRoles(UserRoles.Admin.value)
 async def updateProductByIdEndpoint(request: Request, productId: str, payload: ProductImportModel):
     try:
         logger.debug(f"updateProductByIdEndpoint function started for productId: {productId}")
         userId = request.state.userMetadata.get("id")
 
-        if not hasRequiredRole(request, [UserRoles.Admin.value]):
-            logger.warning(f"Unauthorized update attempt by user [{userId}] on product ID: {productId}")
-            return returnResponse(2000)
-
         logger.info(f"User [{userId}] attempting to update product with ID: {productId}")
 
         existing = getProductFromDb({"id": productId, "isDeleted": False})
@@ -89,6 +87,7 @@ async def updateProductByIdEndpoint(request: Request, productId: str, payload: P
                 "category": category.get("name"),  # store readable name
                 "sizeOptions": category.get("sizeOptions", []),
                 "images": payload.images if payload.images else existing.get("images", []),
+                "imageVariants": getImageVariants(payload.images) if payload.images else existing.get("imageVariants", {}),
                 "details": payload.details,
                 "review": payload.review,
                 "isLatest": payload.isLatest,
@@ -100,6 +99,7 @@ async def updateProductByIdEndpoint(request: Request, productId: str, payload: P
         )
 
         updateProductInDb({"id": productId}, updatePayload)
+        updateImageReferences(existing.get("images", []), updatePayload["images"])
         logger.info(f"Product [ID: {productId}] updated successfully by user [{userId}]")
 
         updatePayload.pop("_id", None)
@@ -110,15 +110,33 @@ async def updateProductByIdEndpoint(request: Request, productId: str, payload: P
         return returnResponse(2019)
 
 
+@router.put("/product/{productId}/stock")
+@requireRoles(UserRoles.Admin.value)
+async def updateProductStock(request: Request, productId: str, payload: StockUpdateModel):
+    try:
+        userId = request.state.userMetadata.get("id")
+        if payload.quantity < 0:
+            return returnResponse(2177)
+        if not getProductFromDb({"id": productId, "isDeleted": False}, {"_id": 0, "id": 1}):
+            logger.warning(f"No product found with ID: {productId}")
+            return returnResponse(2003)
+        inventory = setAvailableStock(productId, payload.quantity)
+        logger.info(f"Stock for product [{productId}] set to {payload.quantity} by user [{userId}]")
+        return returnResponse(2093, result=inventory)
+    except Exception as e:
+        logger.error(f"Error updating stock for product [{productId}]: {str(e)}")
+        return returnResponse(2094)
+
+
 @router.delete("/product/deleteProducts")
+@requireRoles(UserRoles.Admin.value)
 async def deleteProducts(request: Request):
     try:
         logger.debug("deleteProducts function started")
-        if not hasRequiredRole(request, [UserRoles.Admin.value]):
-            logger.warning("Unauthorized access attempt to delete products")
-            return returnResponse(2000)
+        products = list(getProductsFromDb({"isDeleted": False}, {"_id": 0, "images": 1}))
         result = updateManyProductsInDb({"isDeleted": False}, {"isDeleted": True})
         deletedCount = result.modified_count
+        releaseImageLists([product.get("images") for product in products])
         logger.info(f"Soft-deleted {deletedCount} products")
         return returnResponse(2008 if deletedCount else 2007, result={"deleted": deletedCount})
     except Exception as e:
@@ -127,16 +145,17 @@ async def deleteProducts(request: Request):
 
 
 @router.delete("/product/{productId}")
+@requireRoles(UserRoles.Admin.value)
 async def deleteProductById(request: Request, productId: str):
     try:
         logger.debug(f"Deleting product: {productId}")
-        if not hasRequiredRole(request, [UserRoles.Admin.value]):
-            return returnResponse(2000)
         product = getProductFromDb({"id": productId, "isDeleted": False})
         if not product:
             logger.warning(f"Product with ID :{productId} not found or already deleted")
             return returnResponse(2016)
-        result = updateProductInDb({"id": productId}, {"isDeleted": True})
+        result = updateProductInDb({"id": productId, "isDeleted": False}, {"isDeleted": True})
+        if result.modified_count:
+            releaseImages(product.get("images", []))
         return returnResponse(2015 if result.modified_count else 2016, result={"deleted": result.modified_count})
     except Exception as e:
         logger.error(f"Error deleting product [{productId}]: {e}")
@@ -144,12 +163,10 @@ async def deleteProductById(request: Request, productId: str):
 
 
 @router.get("/stats/products")
+@requireRoles(UserRoles.Admin.value)
 async def getProductStats(request: Request):
     try:
         userId = request.state.userMetadata.get("id")
-        if not hasRequiredRole(request, [UserRoles.Admin.value]):
-            logger.warning(f"Unauthorized access attempt by user [{userId}] to fetch product stats.")
-            return returnResponse(2000)
         logger.info(f"Fetching product stats for admin [{userId}]")
         # Get non-deleted products
         products = list(getProductsFromDb({"isDeleted": False}))
@@ -176,15 +193,10 @@ async def getProductStats(request: Request):
 
 
 @router.get("/stats/orders")
+@requireRoles(UserRoles.Admin.value)
 async def getOrderStats(request: Request):
     try:
         userId = request.state.userMetadata.get("id")
-
-        # Authorization check
-        if not hasRequiredRole(request, [UserRoles.Admin.value]):
-            logger.warning(f"Unauthorized access attempt by user [{userId}] to fetch order stats.")
-            return returnResponse(2000)
-
         logger.info(f"Fetching order stats for admin [{userId}]")
 
         # Fetch all non-deleted orders
@@ -1,23 +1,20 @@
 from fastapi import APIRouter, HTTPException, Request
-from yensiAuthentication import logger, YensiKeycloakConfig
+from yensiAuthentication import logger
 from yensiAuthentication.mongoData import getAllUsers, updateUser
 from Models.userModel import UserRoles
 from ReturnLog.logReturn import returnResponse
-from Utils.utils import hasRequiredRole
-from Utils.emailUtility import verifyPasswordWithKeycloak
+from Utils.authorization import requireRoles
+from Utils.keycloakClient import verifyPassword, resetUserPassword
+from Utils.authContext import invalidateUser
 from Models.userModel import ChangePasswordRequest
 
 router = APIRouter()
 
 
 @router.get("/admin/users")
+@requireRoles(UserRoles.Admin.value)
 async def getAllUser(request: Request):
     try:
-        requiredRoles = [UserRoles.Admin.value]
-        if not hasRequiredRole(request, requiredRoles):
-            logger.warning("unAuthorized access attempt ")
-            return returnResponse(2000)
-
         logger.info("Fetching all users.")
         users = list(getAllUsers({}))
         if not users:
@@ -33,16 +30,13 @@ async def getAllUser(request: Request):
 
 
 @router.put("/admin/users/{userId}/role")
+@requireRoles(UserRoles.Admin.value)
 async def updateUserRole(request: Request, userId: str, role: dict):
     try:
-        requiredRoles = [UserRoles.Admin.value]
-        if not hasRequiredRole(request, requiredRoles):
-            logger.warning(f"Unauthorized role update attempt by user [{request.state.userMetadata.get('id')}]")
-            return returnResponse(2000)
-
         query = {"id": userId}
         result = updateUser(query, role)
         if result.modified_count == 1:
+            invalidateUser(userId)
             logger.info(f"Role for user [{userId}] set to [{role}]")
             return returnResponse(2122)
         else:
@@ -68,13 +62,12 @@ async def changePassword(request: Request, data: ChangePasswordRequest):
         keycloakId = userMetadata.get("keycloakId")
 
         logger.info(f"Verifying old password for user: {email}")
-        if not verifyPasswordWithKeycloak(email, data.oldPassword):
+        if not await verifyPassword(email, data.oldPassword):
             logger.warning("Old password verification failed.")
             return returnResponse(2162)
 
         logger.info("Old password verified. Updating password in Keycloak.")
-        payload = {"credentials": [{"type": "password", "value": data.newPassword, "temporary": False}]}
-        YensiKeycloakConfig.keycloak_admin.update_user(user_id=keycloakId, payload=payload)
+        await resetUserPassword(keycloakId, data.newPassword)
 
         logger.info("Password changed successfully.")
         return returnResponse(2163)
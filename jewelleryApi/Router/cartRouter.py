@@ -1,13 +1,15 @@
 # routers/cartWishlistRouter.py
 from bson import ObjectId
 from fastapi import APIRouter, Request
-from Database.cartWishlistDb import addToCartDb, getCartDb, updateCartDb, updateQuantityCartDb, getSingleCartDb, addBulkToCartDb, updateCartManyDb
-from Database.productDb import getProductFromDb
+from Database.cartWishlistDb import addToCartDb, getCartDb, updateCartDb, updateQuantityCartDb, getSingleCartDb, addBulkToCartDb, updateCartManyDb, addToWishlistDb, removeFromWishlistDb, getWishlistDb
+from Database.productDb import getProductFromDb, getProductsFromDb
 from yensiAuthentication import logger
 from ReturnLog.logReturn import returnResponse
 from yensiDatetime.yensiDatetime import formatDateTime
-from Models.cartWishlistModel import CartItemModel, BulkCartRequest
+from Models.cartWishlistModel import CartItemModel, BulkCartRequest, WishlistRequest, MoveWishlistToCartRequest
 from typing import Optional
+from constants import wishlistMaxItems
+from Utils.priceIndex import getPrices
 
 router = APIRouter(tags=["Cart & Wishlist"])
 
@@ -37,12 +39,21 @@ async def addToCart(request: Request, payload: CartItemModel):
         return returnResponse(2062)
 
 
+def refreshCartPrices(cart: list) -> list:
+    """Cart items keep the product as it was when added; overlay the prices checkout will charge."""
+    prices = getPrices([item["productId"] for item in cart if item.get("productId")])
+    for item in cart:
+        if item.get("product") and item.get("productId") in prices:
+            item["product"].update(prices[item["productId"]])
+    return cart
+
+
 @router.get("/cart")
 async def getCart(request: Request):
     try:
         userId = request.state.userMetadata.get("id")
         logger.debug(f"Fetching cart for user: {userId}")
-        cart = list(getCartDb({"userId": userId, "isDeleted": False}))
+        cart = refreshCartPrices(list(getCartDb({"userId": userId, "isDeleted": False})))
         return returnResponse(2061, result=cart)
     except Exception as e:
         logger.error(f"Error fetching cart: {e}")
@@ -172,3 +183,98 @@ async def clearAllCartItems(request: Request):
     except Exception as e:
         logger.error(f"Error clearing cart for user: {e}", exc_info=True)
         return returnResponse(2071)
+
+
+def hydrateWishlist(productIds: list) -> list:
+    """Load every wishlist product with one $in query, newest addition first; unavailable products are skipped."""
+    products = {product["id"]: product for product in getProductsFromDb({"id": {"$in": productIds}, "isDeleted": False})}
+    return [{"id": productId, "productId": productId, "product": products[productId]} for productId in reversed(productIds) if productId in products]
+
+
+@router.post("/user/wishlist")
+async def addToWishlist(request: Request, payload: WishlistRequest):
+    try:
+        userId = request.state.userMetadata.get("id")
+        productIds = list(dict.fromkeys(payload.productIds))
+        logger.debug(f"Adding {len(productIds)} product(s) to wishlist for user [{userId}]")
+        if not productIds:
+            return returnResponse(2003)
+        if len(productIds) > wishlistMaxItems:
+            return returnResponse(2076)
+        found = {product["id"] for product in getProductsFromDb({"id": {"$in": productIds}, "isDeleted": False}, {"_id": 0, "id": 1})}
+        if len(found) != len(productIds):
+            logger.warning(f"Wishlist add for user [{userId}] references unknown products: {set(productIds) - found}")
+            return returnResponse(2003)
+        wishlist = addToWishlistDb(userId, productIds, wishlistMaxItems, formatDateTime())
+        if wishlist is None:
+            logger.warning(f"Wishlist full for user [{userId}]")
+            return returnResponse(2076)
+        logger.info(f"Wishlist updated for user [{userId}], {len(wishlist['productIds'])} item(s)")
+        return returnResponse(2073, result={"productIds": wishlist["productIds"]})
+    except Exception as e:
+        logger.error(f"Error adding to wishlist: {e}", exc_info=True)
+        return returnResponse(2072)
+
+
+@router.get("/user/wishlist")
+async def getWishlist(request: Request):
+    try:
+        userId = request.state.userMetadata.get("id")
+        logger.debug(f"Fetching wishlist for user [{userId}]")
+        wishlist = getWishlistDb(userId) or {}
+        return returnResponse(2074, result=hydrateWishlist(wishlist.get("productIds", [])))
+    except Exception as e:
+        logger.error(f"Error fetching wishlist: {e}", exc_info=True)
+        return returnResponse(2072)
+
+
+@router.delete("/user/wishlist/{productId}")
+async def removeFromWishlist(request: Request, productId: str):
+    try:
+        userId = request.state.userMetadata.get("id")
+        result = removeFromWishlistDb(userId, [productId], formatDateTime())
+        if result.modified_count == 0:
+            logger.warning(f"Product [{productId}] not in wishlist of user [{userId}]")
+            return returnResponse(2003)
+        logger.info(f"Product [{productId}] removed from wishlist of user [{userId}]")
+        return returnResponse(2075)
+    except Exception as e:
+        logger.error(f"Error removing from wishlist: {e}", exc_info=True)
+        return returnResponse(2072)
+
+
+@router.post("/user/wishlist/move-to-cart")
+async def moveWishlistToCart(request: Request, payload: MoveWishlistToCartRequest):
+    try:
+        userId = request.state.userMetadata.get("id")
+        wishlistIds = (getWishlistDb(userId) or {}).get("productIds", [])
+        requested = set(payload.productIds) if payload.productIds else set(wishlistIds)
+        items = hydrateWishlist([productId for productId in wishlistIds if productId in requested])
+        if not items:
+            logger.warning(f"No wishlist products to move for user [{userId}]")
+            return returnResponse(2078)
+
+        cartItems = [
+            {
+                "id": str(ObjectId()),
+                "userId": userId,
+                "productId": item["productId"],
+                "quantity": 1,
+                "selectedSize": payload.selectedSize or "",
+                "product": item["product"],
+                "isDeleted": False,
+                "createdAt": formatDateTime(),
+            }
+            for item in items
+        ]
+        addBulkToCartDb(cartItems)
+        movedIds = [item["productId"] for item in items]
+        removeFromWishlistDb(userId, movedIds, formatDateTime())
+        for cartItem in cartItems:
+            cartItem.pop("_id", None)
+        logger.info(f"Moved {len(movedIds)} wishlist product(s) to cart for user [{userId}]")
+        return returnResponse(2077, result=cartItems)
+    except Exception as e:
+        logger.error(f"Error moving wishlist to cart: {e}", exc_info=True)
+        return returnResponse(2072)
+
@@ -1,10 +1,8 @@
 from fastapi import APIRouter
 from ReturnLog.logReturn import returnResponse
-from yensiEmailService.gmail import sendEmail
 from yensiAuthentication import logger
-from yensiDatetime.yensiDatetime import formatDateTime
 from Utils.emailUtility import loadHtmlTemplate
-from Database.emailDb import insertData
+from Utils.emailQueue import enqueueEmail
 from Models.emailModel import OrderSuccessEmailRequest, RegisterSuccessEmailRequest, TrackingEmailRequest
 
 router = APIRouter()
@@ -14,14 +12,11 @@ router = APIRouter()
 async def sendEmailUser(payload: RegisterSuccessEmailRequest):
     try:
         email = payload.email
-        logger.info(f"Sending OTP to {email}")
-        sentTime = formatDateTime()
+        logger.info(f"Queueing registration email to {email}")
         subject = "User Registred Successfully"
         templatePath = "Templates/registerSuccess.html"
         htmlBody = loadHtmlTemplate(templatePath, {"userName": payload.userName})
-        sendEmail(email, subject=subject, body=htmlBody, isHtml=True)
-        logger.info(f"Email sent successfully to {email}")
-        insertData({"email": email, "sentAt": sentTime, "status": "sent", "type": "register-success"})
+        await enqueueEmail(email, subject, htmlBody, {"type": "register-success"})
         return returnResponse(2147)
     except Exception as e:
         logger.error(f"Error sending email to {email}: {e}")
@@ -31,13 +26,11 @@ async def sendEmailUser(payload: RegisterSuccessEmailRequest):
 @router.post("/sendOrderSuccessEmail")
 async def sendOrderSuccessEmail(payload: OrderSuccessEmailRequest):
     try:
-        logger.info(f"Sending order confirmation email to {payload.email}")
-        sentTime = formatDateTime()
+        logger.info(f"Queueing order confirmation email to {payload.email}")
         subject = " Order Confirmation"
         templatePath = "Templates/orderSuccess.html"
         htmlBody = loadHtmlTemplate(templatePath, {"userName": payload.userName, "orderId": payload.orderId})
-        sendEmail(toEmail=payload.email, subject=subject, body=htmlBody, isHtml=True)
-        insertData({"email": payload.email, "sentAt": sentTime, "orderId": payload.orderId, "type": "order-success", "status": "sent"})
+        await enqueueEmail(payload.email, subject, htmlBody, {"orderId": payload.orderId, "type": "order-success"})
         return returnResponse(2147)
     except Exception as e:
         logger.error(f"Failed to send order email: {e}")
@@ -48,14 +41,11 @@ async def sendOrderSuccessEmail(payload: OrderSuccessEmailRequest):
 async def sendTrackingEmail(payload: TrackingEmailRequest):
     try:
         email = payload.email
-        logger.info(f"Sending tracking email to {email}")
-        sentTime = formatDateTime()
+        logger.info(f"Queueing tracking email to {email}")
         subject = f"Your Order {payload.orderId} Has Been Shipped"
         templatePath = "Templates/trackingEmail.html"
         htmlBody = loadHtmlTemplate(templatePath, {"userName": payload.userName, "orderId": payload.orderId, "trackingId": payload.trackingId})
-        sendEmail(toEmail=payload.email, subject=subject, body=htmlBody, isHtml=True)
-        insertData({"email": email, "sentAt": sentTime, "orderId": payload.orderId, "trackingId": payload.trackingId, "type": "tracking-email", "status": "sent"})
-        logger.info(f"email sent successfully with trackingId to :{email}")
+        await enqueueEmail(email, subject, htmlBody, {"orderId": payload.orderId, "trackingId": payload.trackingId, "type": "tracking-email"})
         return returnResponse(2160)
     except Exception as e:
         logger.error(f"Failed to send tracking email: {e}")
@@ -1,74 +1,58 @@
 from fastapi import APIRouter, Request
-from pymongo import MongoClient
-import requests
-from constants import mongoUrl, keycloakBaseUrl, keycloakRealm, keycloakClientId, keycloakClientSecret
+from fastapi.responses import JSONResponse
 from yensiAuthentication.yensiConfig import logger
 from yensiAuthentication.mongoData import getAllUsers
 from Models.userModel import UserRoles
 from ReturnLog.logReturn import returnResponse
-from Utils.utils import hasRequiredRole
+from Utils.authorization import requireRoles
+from Utils.healthChecks import getReadiness, getEventLoopLag
 
 router = APIRouter()
 
-mongoClient = MongoClient(mongoUrl)
-
 
 @router.get("/health")
 async def healthCheck():
     """
     Health check endpoint to verify MongoDB and Keycloak connectivity.
     """
-    health_status = {"status": "OK", "mongodb": "Unknown", "keycloak": "Unknown"}
-
     try:
-        logger.debug("Starting health check process.")
-
-        # MongoDB Health Check
-        try:
-            mongoClient = MongoClient(mongoUrl, serverSelectionTimeoutMS=3000)
-            mongoClient.admin.command("ping")
-            health_status["mongodb"] = "Connected"
-            logger.info("MongoDB is reachable.")
-        except Exception as e:
-            health_status["mongodb"] = "Not Connected"
-            logger.error(f"MongoDB connection failed: {str(e)}")
-
-        # Keycloak Client Verification
-        try:
-            tokenEndpoint = f"{keycloakBaseUrl}/realms/{keycloakRealm}/protocol/openid-connect/token"
-            payload = {"client_id": keycloakClientId, "client_secret": keycloakClientSecret, "grant_type": "client_credentials"}
-            response = requests.post(tokenEndpoint, data=payload, timeout=3)
+        readiness = await getReadiness()
+        checks = readiness["checks"]
+        health_status = {
+            "status": readiness["status"],
+            "mongodb": "Connected" if checks["mongodb"]["ok"] else "Not Connected",
+            "keycloak": "Authenticated" if checks["keycloak"]["ok"] else "Not Authenticated",
+        }
+        logger.debug(f"Health check result: {health_status}")
+        return health_status
 
-            if response.status_code == 200:
-                health_status["keycloak"] = "Authenticated"
-                logger.info("Keycloak authentication successful.")
-            else:
-                raise Exception(f"Response: {response.status_code}, {response.text}")
+    except Exception as e:
+        logger.critical(f"Unexpected health check failure: {str(e)}", exc_info=True)
+        return {"status": "Critical", "mongodb": "Unknown", "keycloak": "Unknown"}
 
-        except Exception as e:
-            health_status["keycloak"] = "Not Authenticated"
-            logger.error(f"Keycloak authentication failed: {str(e)}")
 
-        # Overall Status
-        if "Not Connected" in health_status.values() or "Not Authenticated" in health_status.values():
-            health_status["status"] = "Degraded"
+@router.get("/health/live")
+async def livenessCheck():
+    """
+    Liveness only proves the event loop is serving requests; it never touches dependencies.
+    """
+    return {"status": "OK", "eventLoopLag": getEventLoopLag()}
 
-        logger.info(f"Health check result: {health_status}")
-        return health_status
 
+@router.get("/health/ready")
+async def readinessCheck():
+    try:
+        readiness = await getReadiness()
+        return JSONResponse(readiness, status_code=200 if readiness["status"] == "OK" else 503)
     except Exception as e:
-        logger.critical(f"Unexpected health check failure: {str(e)}", exc_info=True)
-        return {"status": "Critical", "mongodb": "Unknown", "keycloak": "Unknown"}
+        logger.critical(f"Unexpected readiness check failure: {str(e)}", exc_info=True)
+        return JSONResponse({"status": "Critical"}, status_code=503)
 
 
 @router.get("/admin/users")
+@requireRoles(UserRoles.Admin.value)
 async def getAllUser(request: Request):
     try:
-        requiredRoles = [UserRoles.Admin.value]
-        if not hasRequiredRole(request, requiredRoles):
-            logger.warning("unAuthorized access attempt ")
-            return returnResponse(2000)
-
         logger.info("Fetching all users.")
         users = list(getAllUsers({}))
         if not users:
@@ -0,0 +1,44 @@
+import os
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Request, Query
+from yensiAuthentication import logger
+from constants import imageResizeMaxDimension
+from Utils.imageProcessing import isFormatSupported
+from Utils.imageUploader import staticImagesPath
+from Utils.imageResizer import getResizedImage, normaliseFormat
+from Utils.staticFiles import buildFileResponse
+
+router = APIRouter(tags=["Images"])
+
+
+@router.api_route("/static/images/{name}", methods=["GET", "HEAD"])
+async def getImage(
+    request: Request,
+    name: str,
+    w: Optional[int] = Query(None, ge=1, le=imageResizeMaxDimension),
+    h: Optional[int] = Query(None, ge=1, le=imageResizeMaxDimension),
+    fmt: Optional[str] = None,
+):
+    if name != os.path.basename(name) or name.startswith("."):
+        raise HTTPException(status_code=404, detail="Not Found")
+
+    if w is None and h is None and fmt is None:
+        fullPath = os.path.join(staticImagesPath, name)
+        try:
+            return buildFileResponse(fullPath, os.stat(fullPath), request.headers)
+        except FileNotFoundError:
+            raise HTTPException(status_code=404, detail="Not Found")
+
+    fileFormat = normaliseFormat(name, fmt)
+    if not isFormatSupported(fileFormat):
+        raise HTTPException(status_code=400, detail=f"Unsupported image format: {fileFormat}")
+
+    try:
+        resized = await getResizedImage(name, w or 0, h or 0, fileFormat)
+    except Exception as e:
+        logger.error(f"Error resizing image {name} to w={w} h={h} fmt={fileFormat}: {e}")
+        raise HTTPException(status_code=422, detail="Image could not be resized")
+    if resized is None:
+        raise HTTPException(status_code=404, detail="Not Found")
+    path, statResult = resized
+    return buildFileResponse(path, statResult, request.headers)
@@ -0,0 +1,40 @@
+from fastapi import APIRouter, Request
+from yensiAuthentication import logger
+from ReturnLog.logReturn import returnResponse
+from Models.userModel import UserRoles
+from Utils.authorization import requireRoles
+from Utils.staticFiles import getStaticStats
+from Utils.authContext import getAuthCacheStats
+from Utils.compression import getCompressionStats
+
+router = APIRouter(prefix="/admin/metrics", tags=["Metrics"])
+
+
+@router.get("/static")
+@requireRoles(UserRoles.Admin.value)
+async def getStaticMetrics(request: Request):
+    try:
+        return returnResponse(2165, result=getStaticStats())
+    except Exception as e:
+        logger.error(f"Error fetching static file metrics: {e}")
+        return returnResponse(2166)
+
+
+@router.get("/auth")
+@requireRoles(UserRoles.Admin.value)
+async def getAuthMetrics(request: Request):
+    try:
+        return returnResponse(2165, result=getAuthCacheStats())
+    except Exception as e:
+        logger.error(f"Error fetching auth cache metrics: {e}")
+        return returnResponse(2166)
+
+
+@router.get("/compression")
+@requireRoles(UserRoles.Admin.value)
+async def getCompressionMetrics(request: Request):
+    try:
+        return returnResponse(2165, result=getCompressionStats())
+    except Exception as e:
+        logger.error(f"Error fetching compression metrics: {e}")
+        return returnResponse(2166)
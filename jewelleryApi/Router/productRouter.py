@@ -1,24 +1,79 @@
 # routers/productRouter.py
-from fastapi import APIRouter
+import re
+from fastapi import APIRouter, Request
+from fastapi.responses import Response
 from Database.productDb import getProductsFromDb, getProductFromDb
 from yensiAuthentication import logger
 from ReturnLog.logReturn import returnResponse
+from Utils.conditionalGet import catalogETag, notModified, withCacheHeaders
+from Models.productModel import ProductBatchModel
+from constants import productBatchMaxSize
+from Utils.homeFeed import getHomeFeed
 
 router = APIRouter(prefix="/public", tags=["Products"])
 
+PROJECTION_FIELD = re.compile(r"^[A-Za-z][A-Za-z0-9_]*(\.[A-Za-z0-9_]+)*$")
+
 
 @router.get("/products")
-async def getProducts():
+async def getProducts(request: Request):
     try:
+        etag = catalogETag(request, "products")
+        cached = notModified(request, etag)
+        if cached:
+            return cached
         logger.debug(f"fetching all products")
         products = list(getProductsFromDb({"isDeleted": False}))
         logger.info(f"fetched all products successfully")
-        return returnResponse(2005, result=products if products else [])
+        return withCacheHeaders(returnResponse(2005, result=products if products else []), etag)
     except Exception as e:
         logger.error(f"Error fetching products: {e}")
         return returnResponse(2004)
 
 
+@router.get("/home-feed")
+async def getHomeFeedEndpoint(request: Request):
+    try:
+        feed = await getHomeFeed()
+        cached = notModified(request, feed["etag"])
+        if cached:
+            return cached
+        return withCacheHeaders(Response(content=feed["body"], media_type="application/json"), feed["etag"])
+    except Exception as e:
+        logger.error(f"Error fetching home feed: {e}")
+        return returnResponse(2176)
+
+
+@router.post("/products/batch")
+async def getProductsBatch(payload: ProductBatchModel):
+    try:
+        ids, slugs = list(dict.fromkeys(payload.ids)), list(dict.fromkeys(payload.slugs))
+        if not (ids or slugs) or len(ids) + len(slugs) > productBatchMaxSize:
+            logger.warning(f"Rejected product batch of {len(ids)} ids and {len(slugs)} slugs")
+            return returnResponse(2173)
+        projection = {"_id": 0}
+        if payload.fields:
+            if not all(PROJECTION_FIELD.match(field) for field in payload.fields):
+                return returnResponse(2174)
+            projection.update({field: 1 for field in payload.fields}, id=1, slug=1)
+        products = getProductsFromDb({"isDeleted": False, "$or": [{"id": {"$in": ids}}, {"slug": {"$in": slugs}}]}, projection)
+        byId, bySlug = {}, {}
+        for product in products:
+            byId[product.get("id")] = product
+            bySlug[product.get("slug")] = product
+        # Request order: ids first, then slugs, each product once
+        ordered = {}
+        for product in [byId.get(key) for key in ids] + [bySlug.get(key) for key in slugs]:
+            if product is not None:
+                ordered.setdefault(product["id"], product)
+        missing = [key for key in ids if key not in byId] + [key for key in slugs if key not in bySlug]
+        logger.info(f"Fetched {len(ordered)} product(s) in batch, {len(missing)} missing")
+        return returnResponse(2005, result={"products": list(ordered.values()), "missing": missing})
+    except Exception as e:
+        logger.error(f"Error fetching product batch: {e}")
+        return returnResponse(2004)
+
+
 # @router.get("/products/filter")
 # async def filterProducts(category: Optional[str] = None, priceMin: Optional[float] = None, priceMax: Optional[float] = None, tags: Optional[List[str]] = Query(None)):
 
@@ -71,27 +126,35 @@ async def getSearchSuggestions(q: str):
 
 
 @router.get("/products/{slug}")
-async def getProductBySlug(slug: str):
+async def getProductBySlug(request: Request, slug: str):
     try:
+        etag = catalogETag(request, "products")
+        cached = notModified(request, etag)
+        if cached:
+            return cached
         logger.debug(f"getProductBySlug function started ")
         product = getProductFromDb({"slug": slug, "isDeleted": False})
         if not product:
             return returnResponse(2010, result=None)
         logger.info(f"Product fetched successfully by slug: {slug}")
-        return returnResponse(2005, result=product)
+        return withCacheHeaders(returnResponse(2005, result=product), etag)
     except Exception as e:
         logger.error(f"Error fetching product by slug: {e}")
         return returnResponse(2004)
 
 
 @router.get("/products/{categoryId}")
-async def getProducts(categoryId: str):
+async def getProducts(request: Request, categoryId: str):
     try:
+        etag = catalogETag(request, "products")
+        cached = notModified(request, etag)
+        if cached:
+            return cached
         logger.debug("Fetching products")
         query = {"isDeleted": False, "categoryId": categoryId}
         products = list(getProductsFromDb(query))
         logger.info(f"Fetched {len(products)} product(s) successfully")
-        return returnResponse(2158, result=products if products else [])
+        return withCacheHeaders(returnResponse(2158, result=products if products else []), etag)
     except Exception as e:
         logger.error(f"[PRODUCT_FETCH_ERROR] {str(e)}")
         return returnResponse(2159)
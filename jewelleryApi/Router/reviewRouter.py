@@ -1,27 +1,41 @@
-from fastapi import APIRouter, Request
+from typing import Literal, Optional
+from fastapi import APIRouter, Query, Request
 from bson import ObjectId
 from Models.reviewModel import ReviewModel
-from Database.reviewDb import insertReviewToDb, getReviewsFromDb, getReviewFromDb, deleteReviewFromDb
+from Database.reviewDb import insertReviewToDb, getReviewsPage, getReviewFromDb, deleteReviewFromDb, aggregateRatingBuckets
+from Database.productDb import getProductFromDb, updateProductRating, setProductRatingSummaries, emptyRatingSummary
 from yensiDatetime.yensiDatetime import formatDateTime
 from yensiAuthentication import logger
 from ReturnLog.logReturn import returnResponse
 from Models.userModel import UserRoles
 from Utils.utils import hasRequiredRole
-from yensiAuthentication import verifyUser
+from Utils.authorization import requireRoles
+from Utils.authContext import getCurrentUser
+from Utils.conditionalGet import catalogETag, notModified, withCacheHeaders
+from Utils.pagination import encodeCursor, decodeCursor, keysetFilter
+from constants import reviewPageSize, reviewPageMaxSize
 
 router = APIRouter(tags=["Reviews"])
 
+# Each sort ends in the unique id so cursors identify a single position
+REVIEW_SORTS = {
+    "newest": [("createdAt", -1), ("id", -1)],
+    "highest": [("rating", -1), ("createdAt", -1), ("id", -1)],
+    "lowest": [("rating", 1), ("createdAt", -1), ("id", -1)],
+}
+
 
 #  CREATE Review
 @router.post("/review/create")
 async def createReview(request: Request, payload: ReviewModel):
     try:
         userId = request.state.userMetadata.get("id")
-        userData = verifyUser({"id": userId})
+        userData = await getCurrentUser(request)
         userName = f"{userData.get('firstname')} {userData.get('lastname')}"
         reviewDict = payload.model_dump()
         reviewDict.update({"id": str(ObjectId()), "createdAt": formatDateTime(), "updatedAt": formatDateTime(), "isDeleted": False, "userName": userName})
         insertReviewToDb(reviewDict)
+        updateProductRating(payload.productId, payload.rating, 1)
         reviewDict.pop("_id", None)
         logger.info(f"Review created for product [{payload.productId}] by user [{userId}]")
         return returnResponse(2149, result=reviewDict)
@@ -31,13 +45,28 @@ async def createReview(request: Request, payload: ReviewModel):
         return returnResponse(2150)
 
 
-#  GET all reviews for a product
+#  GET one page of reviews for a product
 @router.get("/public/review/product/{productId}")
-async def getProductReviews(productId: str):
+async def getProductReviews(request: Request, productId: str, sort: Literal["newest", "highest", "lowest"] = "newest", cursor: Optional[str] = None, limit: int = Query(reviewPageSize, ge=1, le=reviewPageMaxSize)):
     try:
-        reviews = list(getReviewsFromDb({"productId": productId, "isDeleted": False}))
+        etag = catalogETag(request, "reviews")
+        cached = notModified(request, etag)
+        if cached:
+            return cached
+        sortFields = REVIEW_SORTS[sort]
+        query = {"productId": productId, "isDeleted": False}
+        if cursor:
+            try:
+                query.update(keysetFilter(sortFields, decodeCursor(cursor, len(sortFields))))
+            except ValueError as e:
+                logger.warning(f"Invalid review cursor for product [{productId}]: {e}")
+                return returnResponse(2172)
+        reviews = list(getReviewsPage(query, sortFields, limit + 1))
+        nextCursor = encodeCursor([reviews[limit - 1].get(field) for field, _ in sortFields]) if len(reviews) > limit else None
+        product = getProductFromDb({"id": productId}, {"_id": 0, "ratingSummary": 1}) or {}
         logger.info(f"successfully fetched review by product:{productId}")
-        return returnResponse(2151, result=reviews)
+        result = {"reviews": reviews[:limit], "nextCursor": nextCursor, "ratingSummary": product.get("ratingSummary") or emptyRatingSummary()}
+        return withCacheHeaders(returnResponse(2151, result=result), etag)
     except Exception as e:
         logger.error(f"[REVIEW_FETCH_ERROR] {str(e)}")
         return returnResponse(2152)
@@ -45,14 +74,18 @@ async def getProductReviews(productId: str):
 
 #  GET single review by ID
 @router.get("/public/review/{reviewId}")
-async def getReviewById(reviewId: str):
+async def getReviewById(request: Request, reviewId: str):
     try:
+        etag = catalogETag(request, "reviews")
+        cached = notModified(request, etag)
+        if cached:
+            return cached
         review = getReviewFromDb({"id": reviewId, "isDeleted": False})
         if not review:
             logger.warning(f" no review found for this id :{reviewId}")
             return returnResponse(2153)
         logger.info(f"successfully fetched review by id :{reviewId}")
-        return returnResponse(2154, result=review)
+        return withCacheHeaders(returnResponse(2154, result=review), etag)
     except Exception as e:
         logger.error(f"[REVIEW_GET_ONE_ERROR] {str(e)}")
         return returnResponse(2155)
@@ -70,7 +103,10 @@ async def deleteReview(request: Request, reviewId: str):
 
         # Allow deletion if admin or if user is the reviewer
         if isAdmin or review.get("reviewedBy") == userId:
-            deleteReviewFromDb({"id": reviewId}, {"isDeleted": True, "updatedAt": formatDateTime()})
+            result = deleteReviewFromDb({"id": reviewId, "isDeleted": False}, {"isDeleted": True, "updatedAt": formatDateTime()})
+            # Only the request that actually flipped isDeleted takes the rating back out
+            if result.modified_count:
+                updateProductRating(review["productId"], review["rating"], -1)
             logger.info(f"Review [{reviewId}] soft-deleted by user [{userId}] (Admin: {isAdmin})")
             return returnResponse(2156)
         else:
@@ -80,3 +116,26 @@ async def deleteReview(request: Request, reviewId: str):
     except Exception as e:
         logger.error(f"[REVIEW_DELETE_ERROR] {str(e)}")
         return returnResponse(2157)
+
+
+@router.post("/admin/reviews/rebuild-rating-summaries")
+@requireRoles(UserRoles.Admin.value)
+async def rebuildRatingSummaries(request: Request):
+    try:
+        userId = request.state.userMetadata.get("id")
+        summaries = {}
+        for bucket in aggregateRatingBuckets():
+            productId, star = bucket["_id"]["productId"], str(int(bucket["_id"]["bucket"]))
+            summary = summaries.setdefault(productId, emptyRatingSummary())
+            summary["count"] += bucket["count"]
+            summary["sum"] += bucket["sum"]
+            summary["histogram"][star] += bucket["count"]
+        for summary in summaries.values():
+            summary["average"] = round(summary["sum"] / summary["count"], 2)
+        setProductRatingSummaries(summaries)
+        logger.info(f"Rating summaries rebuilt for {len(summaries)} products by admin [{userId}]")
+        return returnResponse(2170, result={"products": len(summaries)})
+    except Exception as e:
+        logger.error(f"[RATING_REBUILD_ERROR] {str(e)}")
+        return returnResponse(2171)
+
@@ -5,27 +5,27 @@ from yensiAuthentication import logger
 from ReturnLog.logReturn import returnResponse
 from Models.shipmentModel import ShipmentModel
 from Models.userModel import UserRoles
-from Utils.utils import hasRequiredRole
+from Utils.authorization import requireRoles
 from Razor_pay.Database.ordersDb import getOrderById, updateOrder
+from Razor_pay.Utils.campaignUtils import sendShippedEmails
 
 
 router = APIRouter()
 
 
 @router.post("/admin/send-tracking")
+@requireRoles(UserRoles.Admin.value)
 async def addShipment(request: Request, payload: ShipmentModel):
     try:
         userId = request.state.userMetadata.get("id")
-        if not hasRequiredRole(request, [UserRoles.Admin.value]):
-            logger.warning("Unauthorized access to update category")
-            return returnResponse(2000)
         orderId = payload.orderId
         trackingNumber = payload.trackingNumber
         orderData = getOrderById(orderId)
         if not orderData:
             logger.warning(f"Order not found or already completed for orderId: {orderId}")
             return returnResponse(2125)
-        updateOrder({"id": orderId}, {"trackingNumber": trackingNumber})
+        # trackingEmailPending queues the order for the next shipped-email campaign
+        updateOrder({"id": orderId}, {"trackingNumber": trackingNumber, "trackingEmailPending": True})
         logger.info(f"order updated with trackingNumber [{trackingNumber}] for orderId [{orderId} entred by admin :{userId}]")
         return returnResponse(2126)
     except Exception as e:
@@ -33,3 +33,16 @@ async def addShipment(request: Request, payload: ShipmentModel):
         return returnResponse(2127)
 
 
+@router.post("/admin/send-tracking-emails")
+@requireRoles(UserRoles.Admin.value)
+async def sendTrackingEmails(request: Request):
+    try:
+        userId = request.state.userMetadata.get("id")
+        summary = await sendShippedEmails()
+        if summary is None:
+            return returnResponse(2169)
+        logger.info(f"Shipment emails triggered by admin [{userId}]: {summary}")
+        return returnResponse(2167, result=summary)
+    except Exception as e:
+        logger.error(f"Error sending tracking emails: {e}", exc_info=True)
+        return returnResponse(2168)
@@ -3,7 +3,7 @@ from typing import List
 from fastapi import APIRouter, UploadFile, File
 from yensiAuthentication import logger
 from ReturnLog.logReturn import returnResponse
-from Utils.imageUploader import saveFile
+from Utils.imageUploader import saveFile, saveFiles
 
 router = APIRouter(tags=["Utility"])
 
@@ -25,8 +25,8 @@ async def uploadFiles(files: List[UploadFile] = File(...)):
     try:
         logger.debug(f"uploadFiles function called")
         uploadedFiles = []
-        for file in files:
-            fileName = await saveFile(file)
+        fileNames = await saveFiles(files)
+        for file, fileName in zip(files, fileNames):
             if fileName:
                 uploadedFiles.append(fileName)
             else:
@@ -55,6 +55,18 @@ CUSTOM_STATUS_CODES = {
     1569: {"code": 1569, "message": "Error enabling remaining payment "},
     1570: {"code": 1570, "message": "notification created successfully"},
     1571: {"code": 1571, "message": "Failed to send remaining payment notification"},
+    1572: {"code": 1572, "message": "Remaining payment reminders sent successfully."},
+    1573: {"code": 1573, "message": "Failed to send remaining payment reminders."},
+    1574: {"code": 1574, "message": "A reminder campaign is already running."},
+    1575: {"code": 1575, "message": "Some items in your order are out of stock."},
+    1576: {"code": 1576, "message": "Order amount does not match current prices."},
+    1577: {"code": 1577, "message": "Order contains products that are no longer available."},
+    1578: {"code": 1578, "message": "Order saved, payment setup is still in progress."},
+    1579: {"code": 1579, "message": "Payment reconciliation completed."},
+    1580: {"code": 1580, "message": "Payment reconciliation failed."},
+    1581: {"code": 1581, "message": "Payment reconciliation is already running."},
+    1582: {"code": 1582, "message": "Reconciliation reports fetched successfully."},
+    1583: {"code": 1583, "message": "Error fetching reconciliation reports."},
     1800: {"code": 1800, "message": "Shipment created successfully."},
     1801: {"code": 1801, "message": "Shipment cancelled."},
     1802: {"code": 1802, "message": "Label fetched successfully."},
@@ -110,6 +122,12 @@ CUSTOM_STATUS_CODES = {
     2070: {"code": 2070, "message": "all cart iteams cleared successfully."},
     2071: {"code": 2071, "message": "error occured while clearing cart Items."},
     2072: {"code": 2072, "message": "Unexpected error during wishlist operation."},
+    2073: {"code": 2073, "message": "Products added to wishlist."},
+    2074: {"code": 2074, "message": "Wishlist fetched successfully."},
+    2075: {"code": 2075, "message": "Product removed from wishlist."},
+    2076: {"code": 2076, "message": "Wishlist is full."},
+    2077: {"code": 2077, "message": "Wishlist products moved to cart."},
+    2078: {"code": 2078, "message": "No wishlist products to move."},
     2080: {"code": 2080, "message": "Orders by date fetched successfully."},
     2081: {"code": 2081, "message": "Top-selling products fetched successfully."},
     2082: {"code": 2082, "message": "Revenue statistics fetched successfully."},
@@ -195,4 +213,17 @@ CUSTOM_STATUS_CODES = {
     2162: {"code": 2162, "message": "Old password is incorrect."},
     2163: {"code": 2163, "message": "password updated successfully."},
     2164: {"code": 2164, "message": "Error occurred while changing the password."},
+    2165: {"code": 2165, "message": "Metrics fetched successfully."},
+    2166: {"code": 2166, "message": "Error occurred while fetching metrics."},
+    2167: {"code": 2167, "message": "Shipment emails queued successfully."},
+    2168: {"code": 2168, "message": "Failed to queue shipment emails."},
+    2169: {"code": 2169, "message": "Shipment email campaign is already running."},
+    2170: {"code": 2170, "message": "Rating summaries rebuilt successfully."},
+    2171: {"code": 2171, "message": "Failed to rebuild rating summaries."},
+    2172: {"code": 2172, "message": "Invalid review cursor."},
+    2173: {"code": 2173, "message": "Batch must contain at least one and at most the allowed number of ids or slugs."},
+    2174: {"code": 2174, "message": "Invalid projection field."},
+    2175: {"code": 2175, "message": "Home feed fetched successfully."},
+    2176: {"code": 2176, "message": "Error occurred while fetching the home feed."},
+    2177: {"code": 2177, "message": "Stock quantity must not be negative."},
 }
@@ -0,0 +1,104 @@
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from jwcrypto import jwk, jwt
+
+# A throwaway realm served from this process: JWKS for the local path, introspection for the remote path
+port = 8765
+issuer = f"http://127.0.0.1:{port}/realms/bench"
+os.environ.update(KEYCLOAK_ISSUER=issuer, KEYCLOAK_JWKS_URL=f"{issuer}/protocol/openid-connect/certs", KEYCLOAK_AUDIENCE="bench-client")
+
+apiRoot = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, apiRoot)
+from Utils.localJwt import verifyAccessToken, TokenError
+from Utils.keycloakClient import getKeycloakClient, closeKeycloakClient
+
+signingKey = jwk.JWK.generate(kty="RSA", size=2048, kid="bench-key")
+iterations = 2000
+
+
+def makeToken(**overrides) -> str:
+    now = int(time.time())
+    claims = {"iss": issuer, "sub": "user-1", "aud": "account", "azp": "bench-client", "typ": "Bearer", "iat": now, "exp": now + 300, **overrides}
+    token = jwt.JWT(header={"alg": "RS256", "kid": signingKey.get("kid")}, claims=claims)
+    token.make_signed_token(signingKey)
+    return token.serialize()
+
+
+class RealmHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def reply(self, body: dict):
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        self.reply({"keys": [signingKey.export_public(as_dict=True)]})
+
+    def do_POST(self):
+        # Introspection as Keycloak does it: verify the token server side and answer over HTTP
+        form = self.rfile.read(int(self.headers["Content-Length"])).decode()
+        token = form.split("token=", 1)[1].split("&", 1)[0]
+        try:
+            claims = json.loads(jwt.JWT(jwt=token, key=signingKey).claims)
+            self.reply({"active": True, **claims})
+        except Exception:
+            self.reply({"active": False})
+
+    def log_message(self, *args):
+        pass
+
+
+async def expectRejected(name: str, token: str):
+    try:
+        await verifyAccessToken(token)
+        print(f"[ERROR] {name} token was accepted")
+    except TokenError as e:
+        print(f"[INFO] {name} token rejected: {e}")
+
+
+async def runBenchmark():
+    token = makeToken()
+    await verifyAccessToken(token)  # loads the JWKS once
+    await expectRejected("expired", makeToken(exp=int(time.time()) - 120))
+    await expectRejected("wrong audience", makeToken(azp="other-client", aud="other-client"))
+    await expectRejected("wrong issuer", makeToken(iss="http://evil.example/realms/bench"))
+    await expectRejected("ID", makeToken(typ="ID"))
+    await expectRejected("tampered", token[:-4] + ("AAAA" if not token.endswith("AAAA") else "BBBB"))
+
+    startedAt = time.perf_counter()
+    for _ in range(iterations):
+        await verifyAccessToken(token)
+    local = (time.perf_counter() - startedAt) / iterations
+
+    client = getKeycloakClient()
+    introspectUrl = f"{issuer}/protocol/openid-connect/token/introspect"
+    startedAt = time.perf_counter()
+    for _ in range(iterations):
+        response = await client.post(introspectUrl, data={"token": token, "client_id": "bench-client"})
+        assert response.json()["active"]
+    remote = (time.perf_counter() - startedAt) / iterations
+    await closeKeycloakClient()
+
+    print(f"[INFO] {iterations} verifications of one RS256 token")
+    print(f"[INFO] local JWKS verification : {local * 1e6:9.1f} us/request")
+    print(f"[INFO] remote introspection    : {remote * 1e6:9.1f} us/request (loopback, keep-alive)")
+    print(f"[INFO] speedup                 : {remote / local:9.1f}x")
+
+
+if __name__ == "__main__":
+    server = ThreadingHTTPServer(("127.0.0.1", port), RealmHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        asyncio.run(runBenchmark())
+    finally:
+        server.shutdown()
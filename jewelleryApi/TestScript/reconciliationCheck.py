@@ -0,0 +1,102 @@
+import asyncio
+import os
+import sys
+from datetime import datetime, timedelta
+
+# Runs against its own scratch database unless MONGO_DATABASE_NAME says otherwise; it is dropped at the end
+os.environ.setdefault("MONGO_DATABASE_NAME", "reconciliationCheck")
+apiRoot = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, apiRoot)
+from yensiDatetime.yensiDatetime import formatDateTime
+from Razor_pay.Database.db import client, db, ordersCollection, paymentsCollection
+from Razor_pay.Database.reconciliationDb import ensureReconciliationIndexes, acquireJobLease, releaseJobLease
+from Razor_pay.Utils.reconciliation import RECONCILIATION_LEASE, runReconciliation
+
+# What the fake gateway reports for each Razorpay order id; a missing id raises like a timeout
+gatewayOrders = {
+    "order_matched": {"status": "created"},
+    "order_paid": {"status": "paid"},
+    "order_second": {"status": "paid"},
+    "order_stale": {"status": "paid"},
+}
+gatewayPayments = {
+    "order_paid": [{"id": "pay_paid", "order_id": "order_paid", "status": "captured", "amount": 250000, "currency": "INR", "method": "upi"}],
+    "order_second": [{"id": "pay_second", "order_id": "order_second", "status": "captured", "amount": 125000, "currency": "INR", "method": "card"}],
+}
+
+
+def fakeFetchOrder(orderId: str) -> dict:
+    if orderId not in gatewayOrders:
+        raise TimeoutError(f"gateway timed out for {orderId}")
+    return gatewayOrders[orderId]
+
+
+def fakeFetchPayments(orderId: str) -> list:
+    return gatewayPayments.get(orderId, [])
+
+
+def makeOrder(id: str, orderId: str, status: str, createdAt: str, **extra) -> dict:
+    return {"id": id, "orderId": orderId, "status": status, "createdAt": createdAt, "isHalfPaid": False, "halfPaymentStatus": "not_applicable", "secondOrderId": None, **extra}
+
+
+def seedOrders():
+    now = formatDateTime()
+    monthAgo = (datetime.now() - timedelta(days=30)).strftime("%Y%m%d%H%M%S") + "000"
+    ordersCollection.insert_many(
+        [
+            makeOrder("matched", "order_matched", "created", now),
+            makeOrder("paid", "order_paid", "created", now),
+            makeOrder("half", "order_first", "paid", monthAgo, isHalfPaid=True, secondOrderId="order_second", halfPaymentStatus="created", halfPaymentDetails={"remainingPaymentDate": now}),
+            makeOrder("timeout", "order_timeout", "created", now),
+            makeOrder("stale", "order_stale", "created", monthAgo),
+        ]
+    )
+
+
+def check(label: str, actual, expected) -> bool:
+    ok = actual == expected
+    print(f"[{'PASS' if ok else 'FAIL'}] {label}: {actual}" + ("" if ok else f" (expected {expected})"))
+    return ok
+
+
+async def runCheck() -> bool:
+    ensureReconciliationIndexes()
+    seedOrders()
+
+    # Another worker holding the lease keeps this run from starting
+    acquireJobLease(RECONCILIATION_LEASE, "otherWorker", 60)
+    results = [check("run while leased elsewhere", await runReconciliation(fakeFetchOrder, fakeFetchPayments), None)]
+    releaseJobLease(RECONCILIATION_LEASE, "otherWorker")
+
+    report = await runReconciliation(fakeFetchOrder, fakeFetchPayments)
+    counts = report["counts"]
+    results += [
+        check("scanned (stale order outside the window)", counts["scanned"], 4),
+        check("matched", counts["matched"], 1),
+        check("mismatchedOrders", counts["mismatchedOrders"], 2),
+        check("statusRepairs", counts["statusRepairs"], 1),
+        check("halfPaymentStatusRepairs", counts["halfPaymentStatusRepairs"], 1),
+        check("ordersUpdated", counts["ordersUpdated"], 2),
+        check("paymentsUpserted", counts["paymentsUpserted"], 2),
+        check("fetchErrors", counts["fetchErrors"], 1),
+        check("complete", report["complete"], True),
+        check("paid order repaired", ordersCollection.find_one({"id": "paid"})["status"], "paid"),
+        check("remaining payment repaired", ordersCollection.find_one({"id": "half"})["halfPaymentStatus"], "paid"),
+        check("timed out order untouched", ordersCollection.find_one({"id": "timeout"})["status"], "created"),
+        check("stale order untouched", ordersCollection.find_one({"id": "stale"})["status"], "created"),
+        check("payments stored", sorted(payment["paymentId"] for payment in paymentsCollection.find({}, {"paymentId": 1})), ["pay_paid", "pay_second"]),
+    ]
+
+    # A second run finds nothing left to repair
+    counts = (await runReconciliation(fakeFetchOrder, fakeFetchPayments))["counts"]
+    results += [check("second run scanned", counts["scanned"], 2), check("second run repairs", counts["mismatchedOrders"], 0)]
+    return all(results)
+
+
+if __name__ == "__main__":
+    try:
+        passed = asyncio.run(runCheck())
+    finally:
+        client.drop_database(db.name)
+    print("[INFO] Reconciliation check " + ("passed" if passed else "failed"))
+    sys.exit(0 if passed else 1)
@@ -0,0 +1,106 @@
+import asyncio
+import os
+import sys
+import time
+import httpx
+from fastapi import FastAPI
+
+apiRoot = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, apiRoot)
+from ReturnLog.logReturn import buildEnvelope, returnResponse
+from StatusCodes.statusCodes import CUSTOM_STATUS_CODES
+
+iterations = 200
+
+
+def makeProducts(count: int) -> list:
+    return [
+        {
+            "id": f"{index:024x}",
+            "name": f"Temple Necklace {index}",
+            "slug": f"temple-necklace-{index}",
+            "description": "Handcrafted gold plated necklace with kemp stones. " * 4,
+            "price": 2499.0 + index,
+            "comparePrice": 2999.0 + index,
+            "category": "necklaces",
+            "tags": ["gold", "temple", "bridal"],
+            "images": [f"/static/images/{index}-{view}.webp" for view in range(4)],
+            "thumbnail": f"/static/images/{index}-thumb.webp",
+            "stock": 12,
+            "isDeleted": False,
+            "createdAt": "2025-01-01 10:00:00",
+        }
+        for index in range(count)
+    ]
+
+
+def makeOrders(count: int) -> list:
+    return [
+        {
+            "id": f"order_{index:014d}",
+            "amount": 599900,
+            "currency": "INR",
+            "status": "paid",
+            "notes": {"userId": f"user-{index % 50}", "paymentType": "half"},
+            "items": [{"productId": f"{item:024x}", "name": f"Bangle {item}", "quantity": 1, "price": 2999.5} for item in range(5)],
+            "shippingAddress": {"name": "Asha", "line1": "12 MG Road", "city": "Bengaluru", "pincode": "560001"},
+            "createdAt": "2025-01-01 10:00:00",
+        }
+        for index in range(count)
+    ]
+
+
+def legacyReturnResponse(code, result=None):
+    # The dict returnResponse produced before it rendered bytes; FastAPI encodes and serializes it
+    response = {"code": code, "message": CUSTOM_STATUS_CODES[code]["message"]}
+    if result is not None:
+        response["result"] = result
+    return response
+
+
+products, orders = makeProducts(500), makeOrders(500)
+app = FastAPI()
+
+
+@app.get("/legacy/products")
+async def legacyProducts():
+    return legacyReturnResponse(2005, result=products)
+
+
+@app.get("/fast/products")
+async def fastProducts():
+    return returnResponse(2005, result=products)
+
+
+@app.get("/legacy/orders")
+def legacyOrders():
+    return legacyReturnResponse(1560, result=orders)
+
+
+@app.get("/fast/orders")
+def fastOrders():
+    return returnResponse(1560, result=orders)
+
+
+async def measure(client: httpx.AsyncClient, path: str):
+    response = await client.get(path)
+    startedAt = time.process_time()
+    for _ in range(iterations):
+        response = await client.get(path)
+    return (time.process_time() - startedAt) / iterations, response.json()
+
+
+async def runBenchmark():
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        for name, code, payload in (("products", 2005, products), ("orders", 1560, orders)):
+            legacy, legacyBody = await measure(client, f"/legacy/{name}")
+            fast, fastBody = await measure(client, f"/fast/{name}")
+            assert legacyBody == fastBody == buildEnvelope(code, payload)
+            print(f"[INFO] {name}: {len(payload)} rows, {iterations} requests each")
+            print(f"[INFO]   dict + jsonable_encoder : {legacy * 1e3:8.2f} ms CPU/request")
+            print(f"[INFO]   orjson Response        : {fast * 1e3:8.2f} ms CPU/request")
+            print(f"[INFO]   speedup                : {legacy / fast:8.2f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(runBenchmark())
@@ -0,0 +1,34 @@
+import os
+import sys
+import timeit
+
+apiRoot = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, apiRoot)
+from Utils.emailTemplates import renderTemplateFile
+
+templatePath = os.path.join(apiRoot, "Templates", "trackingEmail.html")
+context = {"userName": "Asha <Admin>", "orderId": "order_Q1w2E3r4T5y6", "trackingId": "TRK123456789"}
+iterations = 20000
+
+
+def legacyLoadHtmlTemplate(templatePath: str, replacements: dict) -> str:
+    # The implementation loadHtmlTemplate used before templates were compiled and cached
+    with open(templatePath, "r", encoding="utf-8") as file:
+        content = file.read()
+        for key, value in replacements.items():
+            content = content.replace(f"{{{{ {key} }}}}", str(value))
+            content = content.replace(f"{{{{{key}}}}}", str(value))
+        return content
+
+
+def runBenchmark():
+    legacy = timeit.timeit(lambda: legacyLoadHtmlTemplate(templatePath, context), number=iterations)
+    compiled = timeit.timeit(lambda: renderTemplateFile(templatePath, context), number=iterations)
+    print(f"[INFO] {iterations} renders of {os.path.basename(templatePath)}")
+    print(f"[INFO] legacy read + replace : {legacy * 1e6 / iterations:8.2f} us/render")
+    print(f"[INFO] compiled + cached     : {compiled * 1e6 / iterations:8.2f} us/render")
+    print(f"[INFO] speedup               : {legacy / compiled:8.2f}x")
+
+
+if __name__ == "__main__":
+    runBenchmark()
@@ -0,0 +1,202 @@
+import asyncio
+import base64
+import hashlib
+import json
+import threading
+import time
+from collections import Counter, OrderedDict
+from fastapi import Request
+from starlette.datastructures import Headers
+from constants import authCacheTtlSeconds, authCacheMaxEntries, authMode
+from yensiAuthentication import logger, verifyUser
+from yensiAuthentication.mongoData import getAllUsers
+from yensiAuthentication.authenticate import KeycloakMiddleware
+from Utils.localJwt import verifyAccessToken
+
+# token hash -> {"state", "user", "userId", "expiresAt"}, least recently used first
+authEntries = OrderedDict()
+# userId -> token hashes, so a role change drops every session of that user
+userTokens = {}
+authLock = threading.Lock()
+authStats = Counter()
+# Served by yensiloginRouter; the token's cache entry is dropped before the request reaches it
+LOGOUT_PATH = "/logout"
+
+
+def tokenHash(authorization: str) -> str:
+    return hashlib.sha256(authorization.encode()).hexdigest()
+
+
+def tokenExpiry(authorization: str) -> float:
+    """
+    Read `exp` from the JWT payload without verifying it; the token has already
+    been verified, by Keycloak or locally, before anything is cached.
+    """
+    try:
+        payload = authorization.split(" ", 1)[-1].split(".")[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        return float(claims["exp"])
+    except Exception:
+        return float("inf")
+
+
+def dropEntry(key: str):
+    entry = authEntries.pop(key, None)
+    if entry and entry["userId"] in userTokens:
+        userTokens[entry["userId"]].discard(key)
+        if not userTokens[entry["userId"]]:
+            del userTokens[entry["userId"]]
+
+
+def getAuthEntry(key: str):
+    with authLock:
+        entry = authEntries.get(key)
+        if entry is None:
+            return None
+        if entry["expiresAt"] <= time.time():
+            dropEntry(key)
+            authStats["expired"] += 1
+            return None
+        authEntries.move_to_end(key)
+        return entry
+
+
+def putAuthEntry(key: str, authorization: str, state: dict):
+    userId = (state.get("userMetadata") or {}).get("id")
+    expiresAt = min(time.time() + authCacheTtlSeconds, tokenExpiry(authorization))
+    with authLock:
+        dropEntry(key)
+        authEntries[key] = {"state": state, "user": None, "userId": userId, "expiresAt": expiresAt}
+        userTokens.setdefault(userId, set()).add(key)
+        while len(authEntries) > authCacheMaxEntries:
+            dropEntry(next(iter(authEntries)))
+            authStats["evicted"] += 1
+
+
+def invalidateUser(userId: str):
+    """
+    Forget cached identities of a user whose role or profile changed. Only this
+    process is affected; other workers pick the change up within the TTL.
+    """
+    with authLock:
+        for key in list(userTokens.get(userId, ())):
+            dropEntry(key)
+    authStats["invalidated"] += 1
+
+
+def forgetToken(key: str):
+    with authLock:
+        dropEntry(key)
+    authStats["loggedOut"] += 1
+
+
+def findUserByKeycloakId(keycloakId: str):
+    for user in getAllUsers({"keycloakId": keycloakId}):
+        user.pop("_id", None)
+        return user
+    return None
+
+
+async def resolveLocally(authorization: str):
+    """
+    AUTH_MODE=local: verify the bearer token against the cached JWKS and load the
+    user it belongs to. Returns None when the request should go to Keycloak instead.
+    The state holds only `userMetadata`, the user document KeycloakMiddleware sets
+    too; it is all the routes read (id, email, contact, username, role, keycloakId
+    and userMetadata.paymentSubscription), with `currentUser` added per request.
+    """
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        claims = await verifyAccessToken(token)
+    except Exception as e:
+        # Includes JWKS fetch failures, which must not turn into errors for the caller
+        authStats["localRejected"] += 1
+        logger.warning(f"Local token verification failed, deferring to Keycloak: {e}")
+        return None
+    user = await asyncio.to_thread(findUserByKeycloakId, claims["sub"])
+    if user is None:
+        authStats["localUnknownUser"] += 1
+        return None
+    authStats["localVerified"] += 1
+    return {"userMetadata": user}
+
+
+def getAuthCacheStats() -> dict:
+    with authLock:
+        size = len(authEntries)
+    stats = {"mode": authMode, "entries": size, "maxEntries": authCacheMaxEntries, "ttlSeconds": authCacheTtlSeconds, **authStats}
+    lookups = stats.get("hits", 0) + stats.get("misses", 0)
+    stats["hitRatio"] = round(stats.get("hits", 0) / lookups, 4) if lookups else 0.0
+    return stats
+
+
+class AuthContextMiddleware:
+    """
+    Wraps KeycloakMiddleware and remembers the request state it produced for each
+    bearer token, so repeat requests with the same token skip verification for
+    `authCacheTtlSeconds`. Logging out forgets the token in this worker at once.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.keycloak = KeycloakMiddleware(self.rememberState)
+
+    async def rememberState(self, scope, receive, send):
+        # Reached only once KeycloakMiddleware has accepted the request
+        key = scope.get("authCacheKey")
+        state = scope.get("state") or {}
+        if key and state.get("userMetadata"):
+            putAuthEntry(key, scope["authCacheToken"], dict(state))
+        await self.app(scope, receive, send)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.keycloak(scope, receive, send)
+            return
+        authorization = Headers(scope=scope).get("authorization")
+        if not authorization:
+            await self.keycloak(scope, receive, send)
+            return
+
+        key = tokenHash(authorization)
+        if scope["path"] == LOGOUT_PATH:
+            forgetToken(key)
+            await self.keycloak(scope, receive, send)
+            return
+        entry = getAuthEntry(key)
+        if entry is not None:
+            authStats["hits"] += 1
+            scope.setdefault("state", {}).update(entry["state"])
+            scope["authCacheKey"] = key
+            await self.app(scope, receive, send)
+            return
+
+        authStats["misses"] += 1
+        scope["authCacheKey"], scope["authCacheToken"] = key, authorization
+        state = await resolveLocally(authorization) if authMode == "local" else None
+        if state is not None:
+            scope.setdefault("state", {}).update(state)
+            await self.rememberState(scope, receive, send)
+            return
+        # Public paths and tokens that fail local checks keep the exact remote behaviour
+        await self.keycloak(scope, receive, send)
+
+
+async def getCurrentUser(request: Request) -> dict:
+    """
+    The caller's user document, loaded at most once per request and shared with
+    later requests using the same token while its cache entry lives.
+    """
+    if getattr(request.state, "currentUser", None) is not None:
+        return request.state.currentUser
+    key = request.scope.get("authCacheKey")
+    entry = getAuthEntry(key) if key else None
+    user = entry["user"] if entry else None
+    if user is None:
+        user = await asyncio.to_thread(verifyUser, {"id": request.state.userMetadata.get("id")})
+        if entry is not None:
+            entry["user"] = user
+    request.state.currentUser = user
+    return user
@@ -0,0 +1,70 @@
+from fastapi.routing import APIRoute
+from starlette.routing import Match
+from yensiAuthentication import logger
+from ReturnLog.logReturn import returnResponse
+
+
+def requireRoles(*roles: str):
+    """
+    Mark an endpoint as restricted to the given roles. Place it below the route
+    decorator; RoleAuthorizationMiddleware enforces it.
+    """
+
+    def decorator(endpoint):
+        endpoint.requiredRoles = frozenset(roles)
+        return endpoint
+
+    return decorator
+
+
+def compileRouteRoles(routes: list) -> dict:
+    """
+    Build method -> [(route, roles)] in routing order. Unrestricted routes are kept
+    (with roles None) so the first match agrees with the router, but each list stops
+    at its last restricted route since nothing after it can need a check.
+    """
+    table = {}
+    for route in routes:
+        if isinstance(route, APIRoute):
+            roles = getattr(route.endpoint, "requiredRoles", None)
+            for method in route.methods:
+                table.setdefault(method, []).append((route, roles))
+    for method, entries in list(table.items()):
+        restricted = [index for index, (_, roles) in enumerate(entries) if roles]
+        if restricted:
+            table[method] = entries[: restricted[-1] + 1]
+        else:
+            del table[method]
+    return table
+
+
+class RoleAuthorizationMiddleware:
+    """
+    Rejects requests to role-restricted routes before the body is read or validated.
+    Must sit inside the authentication middleware so userMetadata is available.
+    """
+
+    def __init__(self, app, routes: list):
+        self.app = app
+        # The middleware stack is built on the first ASGI call, after every router is included
+        self.routeRoles = compileRouteRoles(routes)
+        restricted = sum(1 for entries in self.routeRoles.values() for _, roles in entries if roles)
+        logger.info(f"Compiled role requirements for {restricted} routes")
+
+    def requiredRoles(self, scope):
+        for route, roles in self.routeRoles.get(scope["method"], ()):
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return roles
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            roles = self.requiredRoles(scope)
+            if roles is not None:
+                userMetadata = (scope.get("state") or {}).get("userMetadata") or {}
+                if userMetadata.get("role") not in roles:
+                    logger.warning(f"Unauthorized access attempt to {scope['method']} {scope['path']} by user [{userMetadata.get('id')}] with role: {userMetadata.get('role')}")
+                    await returnResponse(2000)(scope, receive, send)
+                    return
+        await self.app(scope, receive, send)
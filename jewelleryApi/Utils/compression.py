@@ -0,0 +1,139 @@
+import threading
+import zlib
+from collections import Counter
+from starlette.datastructures import Headers, MutableHeaders
+from constants import compressionMinimumSize, gzipCompressionLevel, brotliQuality, compressionSkipTypes
+from Utils.staticFiles import acceptedEncodings
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+compressionStats = Counter()
+statsLock = threading.Lock()
+
+
+def recordStats(**counts):
+    with statsLock:
+        compressionStats.update(counts)
+
+
+def chooseEncoding(acceptEncoding: str):
+    accepted = acceptedEncodings(acceptEncoding)
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+def isCompressible(headers: Headers, status: int) -> bool:
+    if status < 200 or status in (204, 206, 304) or "content-encoding" in headers or "content-range" in headers:
+        return False
+    contentType = headers.get("content-type", "").split(";")[0].strip().lower()
+    return bool(contentType) and not contentType.startswith(compressionSkipTypes)
+
+
+class StreamCompressor:
+    """Incremental gzip or brotli encoder that flushes after every chunk so streams stay live."""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self.compressor = brotli.Compressor(quality=brotliQuality)
+        else:
+            self.compressor = zlib.compressobj(gzipCompressionLevel, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def compress(self, chunk: bytes, final: bool) -> bytes:
+        if self.encoding == "br":
+            data = self.compressor.process(chunk) if chunk else b""
+            return data + (self.compressor.finish() if final else self.compressor.flush())
+        data = self.compressor.compress(chunk)
+        return data + self.compressor.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+class CompressionMiddleware:
+    """
+    Compresses responses with brotli or gzip depending on Accept-Encoding. Bodies
+    under `compressionMinimumSize`, media types in `compressionSkipTypes` and
+    responses that already carry a Content-Encoding pass through untouched.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+        encoding = chooseEncoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            recordStats(notAccepted=1)
+            await self.app(scope, receive, send)
+            return
+
+        startMessage = None
+        compressor = None
+        passThrough = False
+
+        async def compressingSend(message):
+            nonlocal startMessage, compressor, passThrough
+            if message["type"] == "http.response.start":
+                startMessage = message
+                headers = Headers(raw=message["headers"])
+                passThrough = not isCompressible(headers, message["status"])
+                if passThrough:
+                    recordStats(skipped=1)
+                    await send(message)
+                return
+            if message["type"] != "http.response.body" or passThrough:
+                await send(message)
+                return
+
+            body, moreBody = message.get("body", b""), message.get("more_body", False)
+            if compressor is None:
+                headers = MutableHeaders(raw=startMessage["headers"])
+                contentLength = int(headers.get("content-length", len(body) if not moreBody else compressionMinimumSize))
+                if contentLength < compressionMinimumSize:
+                    passThrough = True
+                    recordStats(belowMinimum=1)
+                    await send(startMessage)
+                    await send(message)
+                    return
+                compressor = StreamCompressor(encoding)
+                headers["content-encoding"] = encoding
+                if "accept-encoding" not in headers.get("vary", "").lower():
+                    headers.add_vary_header("Accept-Encoding")
+                if headers.get("etag", "").startswith('"'):
+                    # The encoded bytes differ, so the representation is only weakly equal
+                    headers["etag"] = "W/" + headers["etag"]
+                if moreBody:
+                    del headers["content-length"]
+                    recordStats(streamed=1)
+                else:
+                    data = compressor.compress(body, final=True)
+                    headers["content-length"] = str(len(data))
+                    recordStats(**{"compressed": 1, f"encoding.{encoding}": 1, "bytesIn": len(body), "bytesOut": len(data)})
+                    await send(startMessage)
+                    await send({"type": "http.response.body", "body": data})
+                    return
+                recordStats(**{"compressed": 1, f"encoding.{encoding}": 1})
+                await send(startMessage)
+
+            data = compressor.compress(body, final=not moreBody)
+            recordStats(bytesIn=len(body), bytesOut=len(data))
+            await send({"type": "http.response.body", "body": data, "more_body": moreBody})
+
+        await self.app(scope, receive, compressingSend)
+
+
+def getCompressionStats() -> dict:
+    with statsLock:
+        stats = dict(compressionStats)
+    bytesIn, bytesOut = stats.get("bytesIn", 0), stats.get("bytesOut", 0)
+    stats["bytesSaved"] = bytesIn - bytesOut
+    stats["ratio"] = round(bytesOut / bytesIn, 4) if bytesIn else 0.0
+    stats["minimumSize"] = compressionMinimumSize
+    stats["brotliAvailable"] = brotli is not None
+    return stats
@@ -0,0 +1,34 @@
+import hashlib
+from fastapi import Request
+from fastapi.responses import Response
+from constants import catalogMaxAge, catalogStaleWhileRevalidate
+from Database.catalogVersionDb import getCatalogVersion
+from Utils.staticFiles import isNotModified
+
+CATALOG_CACHE_CONTROL = f"public, max-age={catalogMaxAge}, stale-while-revalidate={catalogStaleWhileRevalidate}"
+
+
+def catalogETag(request: Request, *keys: str) -> str:
+    """
+    ETag for a catalog resource: its URL plus the generation of every catalog
+    part it is built from. Admin writes bump the generation, changing the tag.
+    """
+    versions = ":".join(f"{key}{getCatalogVersion(key)}" for key in keys)
+    digest = hashlib.sha1(f"{request.url.path}?{request.url.query}|{versions}".encode()).hexdigest()[:20]
+    return f'"{digest}"'
+
+
+def cacheHeaders(etag: str) -> dict:
+    return {"etag": etag, "cache-control": CATALOG_CACHE_CONTROL, "vary": "Accept-Encoding"}
+
+
+def notModified(request: Request, etag: str):
+    """A 304 when the client already holds this version, so nothing is queried or serialized."""
+    if isNotModified({"etag": etag}, request.headers):
+        return Response(status_code=304, headers=cacheHeaders(etag))
+    return None
+
+
+def withCacheHeaders(response: Response, etag: str) -> Response:
+    response.headers.update(cacheHeaders(etag))
+    return response
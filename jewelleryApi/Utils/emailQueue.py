@@ -0,0 +1,205 @@
+import asyncio
+import random
+import smtplib
+import time
+from email.message import EmailMessage
+from constants import (
+    smtpHost,
+    smtpPort,
+    smtpUsername,
+    smtpPassword,
+    smtpFromEmail,
+    smtpUseTls,
+    emailWorkerCount,
+    emailRatePerSecond,
+    emailMaxAttempts,
+    emailRetryBaseSeconds,
+    emailRetryMaxSeconds,
+    emailPollSeconds,
+    emailSendingLeaseSeconds,
+)
+from yensiAuthentication import logger
+from yensiDatetime.yensiDatetime import formatDateTime
+from yensiEmailService.gmail import sendEmail
+from Database.emailDb import insertData, insertOutboxEmail, insertOutboxEmails, claimOutboxEmail, updateOutboxEmail
+
+
+def isPermanentError(error: Exception) -> bool:
+    # 5xx replies and refused recipients will not succeed on retry
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return True
+    return isinstance(error, smtplib.SMTPResponseException) and 500 <= error.smtp_code < 600
+
+
+class SmtpTransport:
+    """
+    Keeps one SMTP connection open per worker and reconnects when the server drops it.
+    """
+
+    def __init__(self):
+        self.connection = None
+
+    def connect(self):
+        connection = smtplib.SMTP(smtpHost, smtpPort, timeout=30)
+        if smtpUseTls:
+            connection.starttls()
+        if smtpUsername:
+            connection.login(smtpUsername, smtpPassword)
+        self.connection = connection
+
+    def send(self, toEmail: str, subject: str, body: str, isHtml: bool):
+        message = EmailMessage()
+        message["From"] = smtpFromEmail
+        message["To"] = toEmail
+        message["Subject"] = subject
+        message.set_content(body, subtype="html" if isHtml else "plain")
+        if self.connection is None:
+            self.connect()
+        try:
+            self.connection.send_message(message)
+        except smtplib.SMTPServerDisconnected:
+            self.connect()
+            self.connection.send_message(message)
+
+    def close(self):
+        if self.connection is not None:
+            try:
+                self.connection.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self.connection = None
+
+
+class GmailTransport:
+    def send(self, toEmail: str, subject: str, body: str, isHtml: bool):
+        sendEmail(toEmail=toEmail, subject=subject, body=body, isHtml=isHtml)
+
+    def close(self):
+        pass
+
+
+def createTransport():
+    return SmtpTransport() if smtpHost else GmailTransport()
+
+
+class TokenBucket:
+    """
+    Shared send budget across workers: `rate` emails per second with bursts up to `capacity`.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updatedAt = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updatedAt) * self.rate)
+                self.updatedAt = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+emailRateLimiter = None
+emailWakeup = None
+
+
+def buildOutboxEmail(toEmail: str, subject: str, body: str, record: dict, isHtml: bool = True) -> dict:
+    return {
+        "toEmail": toEmail,
+        "subject": subject,
+        "body": body,
+        "isHtml": isHtml,
+        "record": record,
+        "status": "queued",
+        "attempts": 0,
+        "nextAttemptAt": time.time(),
+        "createdAt": formatDateTime(),
+    }
+
+
+def wakeEmailWorkers():
+    if emailWakeup is not None:
+        emailWakeup.set()
+
+
+async def enqueueEmail(toEmail: str, subject: str, body: str, record: dict, isHtml: bool = True):
+    """
+    Queue an email for background delivery. `record` is written to the email
+    log with the final status once delivery succeeds or gives up.
+    """
+    await asyncio.to_thread(insertOutboxEmail, buildOutboxEmail(toEmail, subject, body, record, isHtml))
+    wakeEmailWorkers()
+    logger.info(f"Queued {record.get('type', 'email')} email to {toEmail}")
+
+
+def enqueueEmails(emails: list):
+    """
+    Queue many emails built with buildOutboxEmail in one insert. Safe to call from a worker thread.
+    """
+    if emails:
+        insertOutboxEmails(emails)
+        logger.info(f"Queued {len(emails)} emails")
+
+
+def retryDelay(attempts: int) -> float:
+    delay = min(emailRetryMaxSeconds, emailRetryBaseSeconds * 2 ** (attempts - 1))
+    return delay * random.uniform(0.8, 1.2)
+
+
+async def deliverEmail(email: dict, transport):
+    try:
+        await emailRateLimiter.acquire()
+        await asyncio.to_thread(transport.send, email["toEmail"], email["subject"], email["body"], email.get("isHtml", True))
+    except Exception as e:
+        await asyncio.to_thread(transport.close)
+        permanent = isPermanentError(e) or email["attempts"] >= emailMaxAttempts
+        if permanent:
+            logger.error(f"Giving up on email {email['_id']} to {email['toEmail']} after {email['attempts']} attempts: {e}")
+            await asyncio.to_thread(updateOutboxEmail, email["_id"], {"status": "failed", "lastError": str(e), "failedAt": formatDateTime()})
+            await asyncio.to_thread(insertData, {**email.get("record", {}), "email": email["toEmail"], "status": "failed", "failedAt": formatDateTime()})
+        else:
+            delay = retryDelay(email["attempts"])
+            logger.warning(f"Email {email['_id']} to {email['toEmail']} failed (attempt {email['attempts']}), retrying in {delay:.0f}s: {e}")
+            await asyncio.to_thread(updateOutboxEmail, email["_id"], {"status": "queued", "lastError": str(e), "nextAttemptAt": time.time() + delay})
+        return
+
+    sentTime = formatDateTime()
+    await asyncio.to_thread(updateOutboxEmail, email["_id"], {"status": "sent", "sentAt": sentTime})
+    await asyncio.to_thread(insertData, {**email.get("record", {}), "email": email["toEmail"], "status": "sent", "sentAt": sentTime})
+    logger.info(f"Email sent successfully to {email['toEmail']}")
+
+
+async def runEmailWorker(workerId: int):
+    transport = createTransport()
+    try:
+        while True:
+            # Cleared before claiming so an email queued in between still wakes this worker
+            emailWakeup.clear()
+            try:
+                email = await asyncio.to_thread(claimOutboxEmail, emailSendingLeaseSeconds)
+                if email is not None:
+                    await deliverEmail(email, transport)
+                    continue
+            except Exception as e:
+                logger.error(f"Email worker {workerId} failed to process the outbox: {e}")
+            try:
+                await asyncio.wait_for(emailWakeup.wait(), timeout=emailPollSeconds)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        await asyncio.to_thread(transport.close)
+
+
+def startEmailWorkers() -> list:
+    global emailRateLimiter, emailWakeup
+    emailRateLimiter = TokenBucket(emailRatePerSecond, max(1.0, emailRatePerSecond))
+    emailWakeup = asyncio.Event()
+    logger.info(f"Starting {emailWorkerCount} email workers using {'SMTP ' + smtpHost if smtpHost else 'Gmail service'}")
+    return [asyncio.create_task(runEmailWorker(workerId)) for workerId in range(emailWorkerCount)]
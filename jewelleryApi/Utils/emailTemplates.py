@@ -0,0 +1,49 @@
+import html
+import os
+import re
+import threading
+
+# Matches both "{{ name }}" and "{{name}}"
+PLACEHOLDER = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+
+# templatePath -> (mtime_ns, compiled parts)
+compiledTemplates = {}
+compiledTemplatesLock = threading.Lock()
+
+
+def compileTemplate(content: str) -> tuple:
+    """
+    Split a template once into alternating literal text and placeholder names:
+    even indexes are literals, odd indexes are names.
+    """
+    return tuple(PLACEHOLDER.split(content))
+
+
+def getCompiledTemplate(templatePath: str) -> tuple:
+    mtime = os.stat(templatePath).st_mtime_ns
+    cached = compiledTemplates.get(templatePath)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    with open(templatePath, "r", encoding="utf-8") as file:
+        parts = compileTemplate(file.read())
+    with compiledTemplatesLock:
+        compiledTemplates[templatePath] = (mtime, parts)
+    return parts
+
+
+def renderTemplate(parts: tuple, context: dict, autoescape: bool = True) -> str:
+    rendered = []
+    for index, part in enumerate(parts):
+        if index % 2 == 0:
+            rendered.append(part)
+        elif part in context:
+            value = str(context[part])
+            rendered.append(html.escape(value) if autoescape else value)
+        else:
+            # Unknown placeholders stay in the output, as they always have
+            rendered.append(f"{{{{ {part} }}}}")
+    return "".join(rendered)
+
+
+def renderTemplateFile(templatePath: str, context: dict, autoescape: bool = True) -> str:
+    return renderTemplate(getCompiledTemplate(templatePath), context, autoescape)
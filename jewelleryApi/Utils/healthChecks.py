@@ -0,0 +1,79 @@
+import asyncio
+import time
+from constants import keycloakBaseUrl, keycloakRealm, healthCacheSeconds, healthCheckTimeoutSeconds, eventLoopLagIntervalSeconds
+from yensiAuthentication import logger
+from Database.MongoData import client as mongoClient
+from Database.poolMonitor import poolStats
+from Utils.imageUploader import getImagePoolStats
+from Utils.keycloakClient import getKeycloakClient
+
+keycloakDiscoveryUrl = f"{keycloakBaseUrl}/realms/{keycloakRealm}/.well-known/openid-configuration"
+
+eventLoopLag = {"lastMs": 0.0, "maxMs": 0.0}
+readinessCache = {"result": None, "checkedAt": 0.0}
+readinessLock = asyncio.Lock()
+
+
+async def monitorEventLoopLag():
+    """
+    Sleep for a fixed interval and record how late the loop woke up. The max is
+    reset each time readiness is reported.
+    """
+    while True:
+        startedAt = time.monotonic()
+        await asyncio.sleep(eventLoopLagIntervalSeconds)
+        lagMs = max(0.0, (time.monotonic() - startedAt - eventLoopLagIntervalSeconds) * 1000)
+        eventLoopLag["lastMs"] = round(lagMs, 2)
+        eventLoopLag["maxMs"] = max(eventLoopLag["maxMs"], eventLoopLag["lastMs"])
+
+
+def getEventLoopLag(reset: bool = False) -> dict:
+    lag = dict(eventLoopLag)
+    if reset:
+        eventLoopLag["maxMs"] = eventLoopLag["lastMs"]
+    return lag
+
+
+async def checkMongo():
+    await asyncio.to_thread(mongoClient.admin.command, "ping")
+
+
+async def checkKeycloak():
+    response = await getKeycloakClient().get(keycloakDiscoveryUrl, timeout=healthCheckTimeoutSeconds)
+    response.raise_for_status()
+
+
+async def runCheck(name: str, check) -> dict:
+    startedAt = time.monotonic()
+    try:
+        await asyncio.wait_for(check(), timeout=healthCheckTimeoutSeconds)
+        return {"ok": True, "latencyMs": round((time.monotonic() - startedAt) * 1000, 2)}
+    except asyncio.TimeoutError:
+        logger.error(f"Health check {name} timed out after {healthCheckTimeoutSeconds}s")
+        return {"ok": False, "error": "timeout"}
+    except Exception as e:
+        # Probes are unauthenticated, so only the error type is reported; the detail goes to the log
+        logger.error(f"Health check {name} failed: {str(e)}")
+        return {"ok": False, "error": type(e).__name__}
+
+
+async def getReadiness() -> dict:
+    """
+    Dependency checks run concurrently and the result is shared for
+    `healthCacheSeconds`, so frequent probes cost at most one round of checks.
+    """
+    if readinessCache["result"] and time.monotonic() - readinessCache["checkedAt"] < healthCacheSeconds:
+        return readinessCache["result"]
+    async with readinessLock:
+        if readinessCache["result"] and time.monotonic() - readinessCache["checkedAt"] < healthCacheSeconds:
+            return readinessCache["result"]
+        mongodb, keycloak = await asyncio.gather(runCheck("mongodb", checkMongo), runCheck("keycloak", checkKeycloak))
+        result = {
+            "status": "OK" if mongodb["ok"] and keycloak["ok"] else "Degraded",
+            "checks": {"mongodb": mongodb, "keycloak": keycloak},
+            "mongoPool": poolStats.getStats(),
+            "imagePool": getImagePoolStats(),
+            "eventLoopLag": getEventLoopLag(reset=True),
+        }
+        readinessCache.update(result=result, checkedAt=time.monotonic())
+        return result
@@ -0,0 +1,74 @@
+import asyncio
+import hashlib
+import time
+from constants import homeFeedLatestLimit, homeFeedFeaturedLimit, homeFeedPollSeconds, homeFeedDebounceSeconds, homeFeedMaxDelaySeconds
+from yensiAuthentication import logger
+from ReturnLog.logReturn import returnResponse
+from Database.catalogVersionDb import getCatalogVersion
+from Database.productDb import getProductsFromDb
+from Database.categoryDb import getCategoriesFromDb
+
+# The rendered envelope, its ETag and the catalog generations it was built from
+homeFeed = {"body": None, "etag": None, "versions": None, "builtAt": 0.0}
+homeFeedLock = asyncio.Lock()
+
+
+def currentVersions() -> tuple:
+    return getCatalogVersion("products"), getCatalogVersion("categories")
+
+
+def buildHomeFeedBody() -> bytes:
+    latest = getProductsFromDb({"isDeleted": False, "isLatest": True}).sort("updatedAt", -1).limit(homeFeedLatestLimit)
+    # There is no featured flag on products, so the best rated ones are featured
+    featured = getProductsFromDb({"isDeleted": False, "ratingSummary.count": {"$gt": 0}}).sort([("ratingSummary.average", -1), ("ratingSummary.count", -1)]).limit(homeFeedFeaturedLimit)
+    categories = getCategoriesFromDb({"isDeleted": False})
+    return returnResponse(2175, result={"latest": list(latest), "featured": list(featured), "categories": list(categories)}).body
+
+
+async def refreshHomeFeed():
+    async with homeFeedLock:
+        versions = await asyncio.to_thread(currentVersions)
+        if homeFeed["body"] is not None and versions == homeFeed["versions"]:
+            return
+        startedAt = time.monotonic()
+        body = await asyncio.to_thread(buildHomeFeedBody)
+        # Content based, so workers that built the same feed hand out the same tag
+        homeFeed.update(body=body, etag=f'"{hashlib.sha1(body).hexdigest()[:20]}"', versions=versions, builtAt=time.time())
+        logger.info(f"Home feed rebuilt for catalog versions {versions} in {(time.monotonic() - startedAt) * 1000:.1f}ms")
+
+
+async def getHomeFeed() -> dict:
+    if homeFeed["body"] is None:
+        await refreshHomeFeed()
+    return homeFeed
+
+
+async def runHomeFeedBuilder():
+    """
+    Rebuild the feed once catalog writes have been quiet for `homeFeedDebounceSeconds`,
+    or after `homeFeedMaxDelaySeconds` of continuous writes, so an import of
+    hundreds of products costs one rebuild instead of hundreds.
+    """
+    pendingSince = lastChangeAt = None
+    lastSeen = None
+    while True:
+        await asyncio.sleep(homeFeedPollSeconds)
+        try:
+            if homeFeed["body"] is None:
+                await refreshHomeFeed()
+                continue
+            versions = await asyncio.to_thread(currentVersions)
+            now = time.monotonic()
+            if versions == homeFeed["versions"]:
+                pendingSince = None
+                continue
+            if pendingSince is None:
+                pendingSince = lastChangeAt = now
+            elif versions != lastSeen:
+                lastChangeAt = now
+            lastSeen = versions
+            if now - lastChangeAt >= homeFeedDebounceSeconds or now - pendingSince >= homeFeedMaxDelaySeconds:
+                await refreshHomeFeed()
+                pendingSince = None
+        except Exception as e:
+            logger.error(f"Home feed rebuild failed: {str(e)}")
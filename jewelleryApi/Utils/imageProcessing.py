@@ -0,0 +1,87 @@
+import os
+from PIL import Image, features
+from PIL.Image import Resampling
+
+# Runs inside the image process pool, so keep imports limited to Pillow.
+
+MAX_WIDTH = 1024
+SAVE_OPTIONS = {
+    "webp": {"format": "WEBP", "quality": 80, "method": 4},
+    "avif": {"format": "AVIF", "quality": 55},
+    "jpeg": {"format": "JPEG", "quality": 82, "optimize": True, "progressive": True},
+}
+
+
+def isFormatSupported(fileFormat: str) -> bool:
+    if fileFormat != "avif":
+        return fileFormat in SAVE_OPTIONS
+    try:
+        return bool(features.check("avif"))
+    except Exception:
+        return False
+
+
+def resizeToWidth(img: Image.Image, width: int) -> Image.Image:
+    # Never upscale; small originals keep their own size
+    if width >= img.size[0]:
+        return img
+    height = max(1, round(img.size[1] * width / img.size[0]))
+    return img.resize((width, height), Resampling.LANCZOS, reducing_gap=3.0)
+
+
+def openRgb(filePath: str) -> Image.Image:
+    with Image.open(filePath) as img:
+        img.load()
+        return img.convert("RGB") if img.mode != "RGB" else img.copy()
+
+
+def generateVariants(img: Image.Image, outputDir: str, baseName: str, widths: list, formats: list) -> dict:
+    """
+    Write one file per (width, format) pair and return the manifest describing them.
+    Widths wider than the original collapse into a single original-width variant.
+    """
+    originalWidth, originalHeight = img.size
+    targetWidths = sorted({min(width, originalWidth) for width in widths})
+    manifest = {"width": originalWidth, "height": originalHeight, "variants": {}}
+
+    for width in targetWidths:
+        resized = resizeToWidth(img, width)
+        for fileFormat in formats:
+            if not isFormatSupported(fileFormat):
+                continue
+            fileName = f"{baseName}-{width}.{fileFormat}"
+            options = dict(SAVE_OPTIONS[fileFormat])
+            resized.save(os.path.join(outputDir, fileName), options.pop("format"), **options)
+            manifest["variants"].setdefault(fileFormat, []).append({"width": resized.size[0], "height": resized.size[1], "file": fileName})
+    return manifest
+
+
+def processImage(filePath: str, finalFileLocation: str, widths: list, formats: list) -> dict:
+    img = openRgb(filePath)
+    resizeToWidth(img, MAX_WIDTH).save(finalFileLocation, "JPEG", quality=95)
+    outputDir = os.path.dirname(finalFileLocation)
+    baseName = os.path.splitext(os.path.basename(finalFileLocation))[0]
+    return generateVariants(img, outputDir, baseName, widths, formats)
+
+
+def fitWithin(img: Image.Image, width: int, height: int) -> Image.Image:
+    # 0 leaves that side unconstrained; like resizeToWidth this never upscales
+    scales = [limit / size for limit, size in ((width, img.size[0]), (height, img.size[1])) if limit]
+    scale = min(scales) if scales else 1
+    if scale >= 1:
+        return img
+    size = (max(1, round(img.size[0] * scale)), max(1, round(img.size[1] * scale)))
+    return img.resize(size, Resampling.LANCZOS, reducing_gap=3.0)
+
+
+def renderResized(sourcePath: str, outputPath: str, width: int, height: int, fileFormat: str) -> int:
+    """
+    Render one on-demand size and return its size in bytes. The file is written
+    under a temporary name and moved into place so readers never see a partial image.
+    """
+    img = fitWithin(openRgb(sourcePath), width, height)
+    options = dict(SAVE_OPTIONS[fileFormat])
+    tempPath = f"{outputPath}.{os.getpid()}.tmp"
+    img.save(tempPath, options.pop("format"), **options)
+    os.replace(tempPath, outputPath)
+    return os.path.getsize(outputPath)
@@ -0,0 +1,138 @@
+import asyncio
+import os
+import threading
+from collections import OrderedDict
+from constants import staticResizedPath, imageResizeCacheBytes
+from yensiAuthentication import logger
+from Utils import imageProcessing
+from Utils.imageUploader import staticOriginalPath, staticImagesPath, runInImagePool, removeFiles
+
+staticResizedPath = os.getenv("STATIC_RESIZED_PATH", staticResizedPath)
+os.makedirs(staticResizedPath, exist_ok=True)
+
+FORMAT_ALIASES = {"jpg": "jpeg"}
+
+# Rendered files in least-recently-used order, mapped to their size in bytes
+resizedEntries = OrderedDict()
+resizedBytes = 0
+resizedLock = threading.Lock()
+# One render per variant; later requests for the same variant await the first
+renderingImages = {}
+
+
+def loadResizedCache():
+    """
+    Rebuild the LRU index from disk at startup, oldest access first.
+    """
+    global resizedBytes
+    files = []
+    for entry in os.scandir(staticResizedPath):
+        if entry.is_file() and not entry.name.endswith(".tmp"):
+            stat = entry.stat()
+            files.append((stat.st_atime, entry.path, stat.st_size))
+    with resizedLock:
+        resizedEntries.clear()
+        resizedBytes = 0
+        for _, path, size in sorted(files):
+            resizedEntries[path] = size
+            resizedBytes += size
+    logger.info(f"Resized image cache loaded: {len(files)} files, {resizedBytes} bytes")
+    evictResized()
+
+
+def touchResized(path: str) -> bool:
+    with resizedLock:
+        if path not in resizedEntries:
+            return False
+        resizedEntries.move_to_end(path)
+        return True
+
+
+def forgetResized(path: str):
+    global resizedBytes
+    with resizedLock:
+        resizedBytes -= resizedEntries.pop(path, 0)
+
+
+def addResized(path: str, size: int):
+    global resizedBytes
+    with resizedLock:
+        resizedBytes += size - resizedEntries.pop(path, 0)
+        resizedEntries[path] = size
+    evictResized()
+
+
+def evictResized():
+    global resizedBytes
+    evicted = []
+    with resizedLock:
+        while resizedBytes > imageResizeCacheBytes and len(resizedEntries) > 1:
+            path, size = resizedEntries.popitem(last=False)
+            resizedBytes -= size
+            evicted.append(path)
+    if evicted:
+        removeFiles(evicted)
+        logger.info(f"Evicted {len(evicted)} resized images from cache")
+
+
+def dropResizedFor(fileName: str):
+    """
+    Remove every cached size of an image, used when the original is purged.
+    """
+    global resizedBytes
+    prefix = os.path.join(staticResizedPath, os.path.splitext(fileName)[0] + "-w")
+    with resizedLock:
+        paths = [path for path in resizedEntries if path.startswith(prefix)]
+        for path in paths:
+            resizedBytes -= resizedEntries.pop(path)
+    removeFiles(paths)
+
+
+def normaliseFormat(fileName: str, fileFormat: str = None) -> str:
+    fileFormat = (fileFormat or os.path.splitext(fileName)[1].lstrip(".")).lower()
+    return FORMAT_ALIASES.get(fileFormat, fileFormat)
+
+
+def findSource(fileName: str):
+    # Uploads predating the originals folder only exist in the compressed images folder
+    for folder in (staticOriginalPath, staticImagesPath):
+        path = os.path.join(folder, fileName)
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def resizedPathFor(fileName: str, width: int, height: int, fileFormat: str) -> str:
+    # Keeps the <sha256>-<suffix>.<ext> shape so content-addressed sizes stay immutable
+    return os.path.join(staticResizedPath, f"{os.path.splitext(fileName)[0]}-w{width}-h{height}.{fileFormat}")
+
+
+async def renderResized(sourcePath: str, path: str, width: int, height: int, fileFormat: str):
+    size = await runInImagePool(imageProcessing.renderResized, sourcePath, path, width, height, fileFormat)
+    await asyncio.to_thread(addResized, path, size)
+    logger.info(f"Rendered resized image {os.path.basename(path)} ({size} bytes)")
+
+
+async def getResizedImage(fileName: str, width: int, height: int, fileFormat: str):
+    """
+    Return (path, stat) of the requested size, rendering it on first use.
+    Returns None when the source image does not exist.
+    """
+    path = resizedPathFor(fileName, width, height, fileFormat)
+    if touchResized(path):
+        try:
+            return path, os.stat(path)
+        except FileNotFoundError:
+            forgetResized(path)
+
+    task = renderingImages.get(path)
+    if task is None:
+        sourcePath = findSource(fileName)
+        if sourcePath is None:
+            return None
+        task = asyncio.ensure_future(renderResized(sourcePath, path, width, height, fileFormat))
+        renderingImages[path] = task
+        task.add_done_callback(lambda _: renderingImages.pop(path, None))
+    # Shielded so a client disconnecting does not cancel the render other requests are waiting on
+    await asyncio.shield(task)
+    return path, os.stat(path)
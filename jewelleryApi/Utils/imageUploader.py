@@ -1,11 +1,28 @@
+import asyncio
+import hashlib
+import multiprocessing
 import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+import aiofiles
 from bson import ObjectId
 from fastapi import UploadFile
-from constants import staticImagesPath, staticOriginalPath
+from constants import (
+    staticImagesPath,
+    staticOriginalPath,
+    imageWorkerCount,
+    imageQueueLimit,
+    imageVariantWidths,
+    imageVariantFormats,
+    imageOrphanGraceSeconds,
+    imageSweepIntervalSeconds,
+    imageDuplicateWaitSeconds,
+)
 from yensiAuthentication import logger
-from PIL import Image
-import shutil
-from PIL.Image import Resampling
+from yensiDatetime.yensiDatetime import formatDateTime
+from Utils import imageProcessing
+from Database.imageDb import claimImageHash, getImageFromDb, getImagesFromDb, updateImageInDb, deleteImageFromDb, changeImageRefCount, popOrphanImage
 
 staticOriginalPath = os.getenv("STATIC_ORIGINAL_PATH", staticOriginalPath)
 staticImagesPath = os.getenv("STATIC_IMAGES_PATH", staticImagesPath)
@@ -13,46 +30,215 @@ staticImagesPath = os.getenv("STATIC_IMAGES_PATH", staticImagesPath)
 os.makedirs(staticOriginalPath, exist_ok=True)
 os.makedirs(staticImagesPath, exist_ok=True)
 
-ALLOWED_IMAGE_TYPES = {"jpg", "jpeg", "png","gif"}
-MAX_WIDTH=1024
+ALLOWED_IMAGE_TYPES = {"jpg", "jpeg", "png", "gif"}
+CHUNK_SIZE = 1024 * 1024
+
+# Jobs waiting for or running in the pool; further uploads wait here instead of piling onto the executor.
+imageSlots = asyncio.Semaphore(imageWorkerCount + imageQueueLimit)
+imagePool = None
+imageJobsInFlight = 0
+
+
+def getImagePool() -> ProcessPoolExecutor:
+    global imagePool
+    if imagePool is None:
+        imagePool = ProcessPoolExecutor(max_workers=imageWorkerCount, mp_context=multiprocessing.get_context("spawn"))
+        logger.info(f"Image process pool started with {imageWorkerCount} workers")
+    return imagePool
+
+
+def shutdownImagePool():
+    global imagePool
+    if imagePool is not None:
+        imagePool.shutdown(wait=True, cancel_futures=True)
+        imagePool = None
+        logger.info("Image process pool stopped")
+
+
+async def runInImagePool(func, *args):
+    global imageJobsInFlight
+    imageJobsInFlight += 1
+    try:
+        async with imageSlots:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(getImagePool(), func, *args)
+    finally:
+        imageJobsInFlight -= 1
+
+
+def getImagePoolStats() -> dict:
+    capacity = imageWorkerCount + imageQueueLimit
+    return {
+        "workers": imageWorkerCount,
+        "queueLimit": imageQueueLimit,
+        "inFlight": imageJobsInFlight,
+        "waitingForSlot": max(0, imageJobsInFlight - capacity),
+        "saturation": round(min(imageJobsInFlight, capacity) / capacity, 4),
+    }
+
+
+async def streamToDisk(file: UploadFile, location: str) -> str:
+    """
+    Write the upload to disk in chunks and return the SHA-256 of its content.
+    """
+    digest = hashlib.sha256()
+    async with aiofiles.open(location, "wb") as buffer:
+        while chunk := await file.read(CHUNK_SIZE):
+            digest.update(chunk)
+            await buffer.write(chunk)
+    return digest.hexdigest()
+
+
+def removeFiles(paths: list):
+    for path in paths:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def imageFilePaths(image: dict) -> list:
+    fileName = image["fileName"]
+    paths = [os.path.join(staticOriginalPath, fileName), os.path.join(staticImagesPath, fileName)]
+    for variants in (image.get("variants") or {}).values():
+        paths.extend(os.path.join(staticImagesPath, variant["file"]) for variant in variants)
+    return paths
+
+
+async def claimOrAwaitImage(sha256: str, fileName: str):
+    """
+    Claim the hash for this upload (returns None), or return the stored image once it is ready.
+    While another upload of the same content is still processing, wait for it:
+    if that upload fails its record is removed and this call claims the hash
+    and processes its own copy instead. Raises TimeoutError if it never settles.
+    """
+    deadline = time.monotonic() + imageDuplicateWaitSeconds
+    while True:
+        existing = await asyncio.to_thread(claimImageHash, sha256, {"fileName": fileName, "refCount": 0, "status": "processing", "createdAt": formatDateTime()})
+        if existing is None:
+            return None
+        while existing and existing.get("status") == "processing":
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Upload of the same content ({existing['fileName']}) is still processing")
+            await asyncio.sleep(0.5)
+            existing = await asyncio.to_thread(getImageFromDb, {"sha256": sha256})
+        if existing:
+            return existing
+
 
 async def saveFile(file: UploadFile) -> str:
-    uniqueId = str(ObjectId())
-    originalExtension = file.filename.split('.')[-1].lower()
+    originalExtension = file.filename.split(".")[-1].lower()
     fileExtension = "jpeg" if originalExtension in ALLOWED_IMAGE_TYPES else originalExtension
-    fileName = f"{uniqueId}.{fileExtension}"
-    originalFileLocation = os.path.join(staticOriginalPath, fileName)
-    finalFileLocation = os.path.join(staticImagesPath, fileName)
+    tempLocation = os.path.join(staticOriginalPath, f".upload-{ObjectId()}.tmp")
+    fileName = None
+    claimed = False
 
     try:
-        with open(originalFileLocation, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        sha256 = await streamToDisk(file, tempLocation)
+        fileName = f"{sha256}.{fileExtension}"
+        existing = await claimOrAwaitImage(sha256, fileName)
+        if existing:
+            await asyncio.to_thread(removeFiles, [tempLocation])
+            logger.info(f"Duplicate upload of {file.filename} resolved to existing file: {existing['fileName']}")
+            return existing["fileName"]
+        claimed = True
 
+        originalFileLocation = os.path.join(staticOriginalPath, fileName)
+        finalFileLocation = os.path.join(staticImagesPath, fileName)
+        os.replace(tempLocation, originalFileLocation)
         logger.info(f"Original file saved successfully: {fileName}")
 
         if fileExtension in ALLOWED_IMAGE_TYPES:
-            compressFile(originalFileLocation, finalFileLocation)
+            manifest = await processImage(originalFileLocation, finalFileLocation)
+            await asyncio.to_thread(updateImageInDb, {"sha256": sha256}, {**manifest, "status": "ready"})
         else:
-            shutil.copy(originalFileLocation, finalFileLocation)
+            await asyncio.to_thread(shutil.copy, originalFileLocation, finalFileLocation)
+            await asyncio.to_thread(updateImageInDb, {"sha256": sha256}, {"status": "ready"})
             logger.info(f"Non-image file saved as is: {fileName}")
 
         return str(fileName)
     except Exception as e:
-        logger.error(f"Error saving or compressing file {fileName}: {str(e)}")
+        logger.error(f"Error saving or compressing file {fileName or file.filename}: {str(e)}")
+        # Only the upload that claimed the hash owns the record and files; a waiting duplicate must not remove them
+        if claimed:
+            await asyncio.to_thread(deleteImageFromDb, {"fileName": fileName, "status": "processing"})
+            await asyncio.to_thread(removeFiles, [os.path.join(staticOriginalPath, fileName), os.path.join(staticImagesPath, fileName)])
+        await asyncio.to_thread(removeFiles, [tempLocation])
         return None
 
 
-def compressFile(filePath: str, finalFileLocation: str) -> str:
+async def saveFiles(files: list) -> list:
+    return await asyncio.gather(*(saveFile(file) for file in files))
+
+
+async def processImage(filePath: str, finalFileLocation: str) -> dict:
     try:
-        with Image.open(filePath) as img:
-            if img.mode != "RGB":
-                img = img.convert("RGB")
-            # Resize the image while maintaining aspect ratio
-            width_percent = (MAX_WIDTH / float(img.size[0]))
-            height_size = int((float(img.size[1]) * float(width_percent)))
-            img = img.resize((MAX_WIDTH, height_size), Resampling.LANCZOS)
-            img.save(finalFileLocation, "JPEG", quality=95)
-        logger.info(f"Compressed file saved at {finalFileLocation}")
+        manifest = await runInImagePool(imageProcessing.processImage, filePath, finalFileLocation, imageVariantWidths, imageVariantFormats)
+        logger.info(f"Compressed file and {sum(len(v) for v in manifest['variants'].values())} variants saved for {finalFileLocation}")
+        return manifest
     except Exception as e:
-        logger.error(f"Error compressing file {filePath}: {str(e)}")
+        logger.error(f"Error processing image {filePath}: {str(e)}")
         raise
+
+
+def getImageVariants(images: list) -> dict:
+    """
+    Map each uploaded image name to its variant manifest, skipping images uploaded before variants existed.
+    """
+    if not images:
+        return {}
+    projection = {"_id": 0, "fileName": 1, "width": 1, "height": 1, "variants": 1}
+    return {image.pop("fileName"): image for image in getImagesFromDb({"fileName": {"$in": images}, "variants": {"$exists": True}}, projection)}
+
+
+def retainImages(images: list):
+    if images:
+        changeImageRefCount(list(set(images)), 1)
+
+
+def releaseImages(images: list):
+    # Files are never removed here; the orphan sweep deletes them once the grace period has passed
+    if images:
+        changeImageRefCount(list(set(images)), -1)
+
+
+def releaseImageLists(imageLists: list):
+    # One update per distinct count instead of one per product
+    counts = {}
+    for images in imageLists:
+        for image in set(images or []):
+            counts[image] = counts.get(image, 0) + 1
+    byCount = {}
+    for image, count in counts.items():
+        byCount.setdefault(count, []).append(image)
+    for count, images in byCount.items():
+        changeImageRefCount(images, -count)
+
+
+def updateImageReferences(oldImages: list, newImages: list):
+    oldSet, newSet = set(oldImages or []), set(newImages or [])
+    retainImages(list(newSet - oldSet))
+    releaseImages(list(oldSet - newSet))
+
+
+def purgeOrphanImages() -> int:
+    from Utils.imageResizer import dropResizedFor  # imageResizer builds on this module
+
+    cutoff = time.time() - imageOrphanGraceSeconds
+    purged = 0
+    while image := popOrphanImage(cutoff):
+        removeFiles(imageFilePaths(image))
+        dropResizedFor(image["fileName"])
+        purged += 1
+    if purged:
+        logger.info(f"Purged {purged} unreferenced images")
+    return purged
+
+
+async def runImageSweeper():
+    while True:
+        try:
+            await asyncio.to_thread(purgeOrphanImages)
+        except Exception as e:
+            logger.error(f"Image sweep failed: {str(e)}")
+        await asyncio.sleep(imageSweepIntervalSeconds)
@@ -0,0 +1,154 @@
+import asyncio
+import time
+from bson import ObjectId
+from constants import inventoryReservationSeconds, inventorySweepIntervalSeconds
+from yensiAuthentication import logger
+from yensiDatetime.yensiDatetime import formatDateTime
+from Database.productDb import updateManyProductsInDb
+from Database.inventoryDb import (
+    getInventoryDb,
+    setAvailableStockDb,
+    takeStockDb,
+    returnStockDb,
+    sellReservedStockDb,
+    insertReservationDb,
+    updateReservationDb,
+    claimReservationDb,
+    findExpiredReservationsDb,
+)
+
+
+def syncStockFlags(soldOut: list, restocked: list):
+    # Products keep their boolean `stock` for the storefront; only flip it on a transition
+    if soldOut:
+        updateManyProductsInDb({"id": {"$in": soldOut}}, {"stock": False})
+    if restocked:
+        updateManyProductsInDb({"id": {"$in": restocked}}, {"stock": True})
+
+
+def setAvailableStock(productId: str, quantity: int) -> dict:
+    inventory = setAvailableStockDb(productId, quantity, formatDateTime())
+    updateManyProductsInDb({"id": productId}, {"stock": quantity > 0})
+    return inventory
+
+
+def groupQuantities(items: list) -> dict:
+    quantities = {}
+    for item in items:
+        if item.get("productId"):
+            quantities[item["productId"]] = quantities.get(item["productId"], 0) + max(1, item.get("quantity") or 1)
+    return quantities
+
+
+def returnItems(items: list) -> list:
+    restocked = []
+    for item in items:
+        inventory = returnStockDb(item["productId"], item["quantity"])
+        if inventory and inventory["available"] == item["quantity"]:
+            restocked.append(item["productId"])
+    return restocked
+
+
+def reserveStock(items: list):
+    """
+    Hold stock for the order items. Returns (reservation, None) on success, where
+    reservation is None if none of the products have tracked inventory, or
+    (None, productId) naming the first product that could not be covered, after
+    giving back whatever was already taken.
+    """
+    quantities = groupQuantities(items)
+    tracked = {inventory["productId"] for inventory in getInventoryDb(list(quantities))}
+    if not tracked:
+        return None, None
+
+    taken, soldOut = [], []
+    # A fixed order keeps two multi-item checkouts from each holding half of the other's products
+    for productId in sorted(tracked):
+        inventory = takeStockDb(productId, quantities[productId])
+        if inventory is None:
+            logger.info(f"Insufficient stock for product [{productId}], releasing {len(taken)} held items")
+            returnItems(taken)
+            return None, productId
+        taken.append({"productId": productId, "quantity": quantities[productId]})
+        if inventory["available"] == 0:
+            soldOut.append(productId)
+
+    reservation = {
+        "id": str(ObjectId()),
+        "orderId": None,
+        "items": taken,
+        "status": "held",
+        "expiresAt": time.time() + inventoryReservationSeconds,
+        "createdAt": formatDateTime(),
+    }
+    insertReservationDb(reservation)
+    reservation.pop("_id", None)
+    syncStockFlags(soldOut, [])
+    return reservation, None
+
+
+def attachReservation(reservationId: str, orderId: str):
+    updateReservationDb(reservationId, {"orderId": orderId})
+
+
+def releaseReservation(reservationId: str, reason: str) -> bool:
+    reservation = claimReservationDb({"id": reservationId}, "held", "released", {"releasedAt": formatDateTime(), "releaseReason": reason})
+    if not reservation:
+        return False
+    syncStockFlags([], returnItems(reservation["items"]))
+    logger.info(f"Released reservation [{reservationId}] ({reason})")
+    return True
+
+
+def commitReservation(orderId: str) -> bool:
+    """
+    Turn the held stock of a paid order into sold stock. A payment that lands after
+    the sweeper released the hold takes the stock again; if it has been sold to
+    someone else meanwhile the reservation is flagged for manual follow-up.
+    """
+    reservation = claimReservationDb({"orderId": orderId}, "held", "committed", {"committedAt": formatDateTime()})
+    if reservation:
+        for item in reservation["items"]:
+            sellReservedStockDb(item["productId"], item["quantity"])
+        return True
+
+    reservation = claimReservationDb({"orderId": orderId}, "released", "committed", {"committedAt": formatDateTime()})
+    if not reservation:
+        return False
+    shortfall, soldOut = [], []
+    for item in reservation["items"]:
+        inventory = takeStockDb(item["productId"], item["quantity"])
+        if inventory is None:
+            shortfall.append(item)
+            continue
+        sellReservedStockDb(item["productId"], item["quantity"])
+        if inventory["available"] == 0:
+            soldOut.append(item["productId"])
+    syncStockFlags(soldOut, [])
+    if shortfall:
+        logger.warning(f"Order [{orderId}] was paid after its reservation expired and {len(shortfall)} items are no longer available")
+        updateReservationDb(reservation["id"], {"inventoryShortfall": shortfall})
+    return True
+
+
+def releaseExpiredReservations(batchSize: int = 100) -> int:
+    released = 0
+    while True:
+        expired = list(findExpiredReservationsDb(batchSize))
+        for reservation in expired:
+            if releaseReservation(reservation["id"], "expired"):
+                released += 1
+        if len(expired) < batchSize:
+            return released
+
+
+async def runReservationSweeper():
+    """Give back stock held by orders that were not paid within `inventoryReservationSeconds`."""
+    while True:
+        try:
+            released = await asyncio.to_thread(releaseExpiredReservations)
+            if released:
+                logger.info(f"Reservation sweep released {released} expired reservations")
+        except Exception as e:
+            logger.error(f"Reservation sweep failed: {str(e)}")
+        await asyncio.sleep(inventorySweepIntervalSeconds)
@@ -0,0 +1,71 @@
+import asyncio
+import httpx
+from constants import keycloakClientId, keycloakClientSecret, tokenUrl, keycloakTimeoutSeconds, keycloakMaxConnections
+from yensiAuthentication import logger, YensiKeycloakConfig
+
+keycloakHttpClient = None
+
+
+class KeycloakError(Exception):
+    pass
+
+
+def getKeycloakClient() -> httpx.AsyncClient:
+    """
+    One pooled client for every Keycloak call, so connections and TLS sessions are reused.
+    """
+    global keycloakHttpClient
+    if keycloakHttpClient is None:
+        keycloakHttpClient = httpx.AsyncClient(
+            timeout=httpx.Timeout(keycloakTimeoutSeconds, connect=min(5.0, keycloakTimeoutSeconds)),
+            limits=httpx.Limits(max_connections=keycloakMaxConnections, max_keepalive_connections=keycloakMaxConnections // 2),
+        )
+    return keycloakHttpClient
+
+
+async def closeKeycloakClient():
+    global keycloakHttpClient
+    if keycloakHttpClient is not None:
+        await keycloakHttpClient.aclose()
+        keycloakHttpClient = None
+
+
+def clientCredentials() -> dict:
+    credentials = {"client_id": keycloakClientId}
+    # Add client secret if your client is confidential
+    if keycloakClientSecret:
+        credentials["client_secret"] = keycloakClientSecret
+    return credentials
+
+
+async def verifyPassword(email: str, password: str) -> bool:
+    """
+    Check a user's password with a direct-grant token request. Returns False for
+    wrong credentials and raises KeycloakError when Keycloak itself fails.
+    """
+    payload = {"grant_type": "password", "username": email, "password": password, **clientCredentials()}
+    logger.debug(f"Sending password verification request to Keycloak for {email}")
+    try:
+        response = await getKeycloakClient().post(tokenUrl, data=payload)
+    except httpx.HTTPError as e:
+        raise KeycloakError(f"Keycloak password verification error: {e}")
+
+    if response.status_code == 200:
+        logger.debug("Password verified successfully via Keycloak.")
+        return True
+    if response.status_code in (400, 401):
+        logger.warning(f"Keycloak password verification failed: {response.text}")
+        return False
+    raise KeycloakError(f"Keycloak password verification returned {response.status_code}: {response.text}")
+
+
+async def resetUserPassword(keycloakId: str, newPassword: str):
+    """
+    Set a user's password through the library's admin client, which holds the configured
+    KEYCLOAK_ADMIN credentials. It is a blocking client, so the call runs in a thread.
+    """
+    payload = {"credentials": [{"type": "password", "value": newPassword, "temporary": False}]}
+    try:
+        await asyncio.to_thread(YensiKeycloakConfig.keycloak_admin.update_user, user_id=keycloakId, payload=payload)
+    except Exception as e:
+        raise KeycloakError(f"Keycloak password reset failed: {e}")
@@ -0,0 +1,77 @@
+import asyncio
+import base64
+import json
+import time
+from jwcrypto import jwk, jwt
+from constants import keycloakIssuer, keycloakJwksUrl, keycloakAudience, jwksRefreshMinSeconds
+from yensiAuthentication import logger
+from Utils.keycloakClient import getKeycloakClient
+
+ALLOWED_ALGORITHMS = ["RS256", "RS384", "RS512", "PS256", "PS384", "PS512", "ES256", "ES384", "ES512"]
+
+jwks = {"keySet": jwk.JWKSet(), "fetchedAt": 0.0}
+jwksLock = asyncio.Lock()
+
+
+class TokenError(Exception):
+    pass
+
+
+async def refreshJwks(force: bool = False):
+    """
+    Fetch the realm's signing keys. Refreshes triggered by an unknown key id are
+    limited to one per `jwksRefreshMinSeconds` so forged kids cannot flood Keycloak.
+    """
+    async with jwksLock:
+        if not force and time.monotonic() - jwks["fetchedAt"] < jwksRefreshMinSeconds:
+            return
+        response = await getKeycloakClient().get(keycloakJwksUrl)
+        response.raise_for_status()
+        jwks["keySet"] = jwk.JWKSet.from_json(response.text)
+        jwks["fetchedAt"] = time.monotonic()
+        logger.info(f"Loaded {len(jwks['keySet']['keys'])} signing keys from {keycloakJwksUrl}")
+
+
+def tokenKeyId(token: str) -> str:
+    try:
+        header = token.split(".")[0]
+        return json.loads(base64.urlsafe_b64decode(header + "=" * (-len(header) % 4)))["kid"]
+    except Exception:
+        raise TokenError("Malformed token header")
+
+
+async def getSigningKey(token: str):
+    kid = tokenKeyId(token)
+    key = jwks["keySet"].get_key(kid)
+    if key is None:
+        await refreshJwks()
+        key = jwks["keySet"].get_key(kid)
+    if key is None:
+        raise TokenError(f"Unknown signing key {kid}")
+    return key
+
+
+def checkAudience(claims: dict):
+    # Keycloak access tokens name the client in azp; aud often only lists "account"
+    audience = claims.get("aud") or []
+    audience = [audience] if isinstance(audience, str) else audience
+    if keycloakAudience not in audience and claims.get("azp") != keycloakAudience:
+        raise TokenError("Token was not issued for this client")
+
+
+async def verifyAccessToken(token: str) -> dict:
+    """
+    Verify signature, expiry, issuer, audience and type of a Keycloak access token
+    locally and return its claims. Raises TokenError when the token is not valid.
+    """
+    key = await getSigningKey(token)
+    try:
+        verified = jwt.JWT(jwt=token, key=key, algs=ALLOWED_ALGORITHMS, check_claims={"exp": None, "iss": keycloakIssuer}, expected_type="JWS")
+    except Exception as e:
+        raise TokenError(f"Token verification failed: {e}")
+    claims = json.loads(verified.claims)
+    # The realm signs ID and refresh tokens with the same key; only access tokens are "Bearer"
+    if claims.get("typ") != "Bearer":
+        raise TokenError(f"Not an access token (typ {claims.get('typ')!r})")
+    checkAudience(claims)
+    return claims
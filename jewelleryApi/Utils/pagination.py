@@ -0,0 +1,30 @@
+import base64
+import orjson
+
+
+def encodeCursor(values: list) -> str:
+    return base64.urlsafe_b64encode(orjson.dumps(values)).decode().rstrip("=")
+
+
+def decodeCursor(cursor: str, size: int) -> list:
+    """Raises ValueError for cursors that were not produced by encodeCursor for this sort."""
+    try:
+        values = orjson.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except Exception:
+        raise ValueError("Malformed cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Cursor does not match the requested sort")
+    return values
+
+
+def keysetFilter(sortFields: list, after: list) -> dict:
+    """
+    Match documents strictly after `after` in the order given by sortFields, a list of
+    (field, direction) ending in a unique field so every position is distinct.
+    """
+    branches = []
+    for index, (field, direction) in enumerate(sortFields):
+        branch = {previous: after[position] for position, (previous, _) in enumerate(sortFields[:index])}
+        branch[field] = {"$lt" if direction < 0 else "$gt": after[index]}
+        branches.append(branch)
+    return {"$or": branches}
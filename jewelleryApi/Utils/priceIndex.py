@@ -0,0 +1,66 @@
+import math
+import threading
+from Database.catalogVersionDb import getCatalogVersion
+from Database.productDb import getProductsFromDb
+
+# productId -> {"price", "isHalfPaymentAvailable"} for the products generation in priceIndexVersion
+priceIndex = {}
+priceIndexVersion = None
+priceIndexLock = threading.Lock()
+
+
+def getPrices(productIds: list) -> dict:
+    """
+    Current prices for the given products. Entries are reused until a product write
+    bumps the catalog version; misses are loaded with one $in query. Deleted and
+    unknown products are left out of the result.
+    """
+    global priceIndexVersion
+    version = getCatalogVersion("products")
+    with priceIndexLock:
+        if version != priceIndexVersion:
+            priceIndex.clear()
+            priceIndexVersion = version
+        prices = {productId: priceIndex[productId] for productId in productIds if productId in priceIndex}
+
+    missing = [productId for productId in set(productIds) if productId not in prices]
+    if missing:
+        loaded = {
+            product["id"]: {"price": product.get("price") or 0, "isHalfPaymentAvailable": product.get("isHalfPaymentAvailable", False)}
+            for product in getProductsFromDb({"id": {"$in": missing}, "isDeleted": False}, {"_id": 0, "id": 1, "price": 1, "isHalfPaymentAvailable": 1})
+        }
+        with priceIndexLock:
+            # A write during the load makes these stale; leave them for the next lookup to refill
+            if version == priceIndexVersion:
+                priceIndex.update(loaded)
+        prices.update(loaded)
+    return prices
+
+
+def roundHalfUp(value: float) -> int:
+    # Matches Math.round on the storefront, which the amounts were computed with
+    return math.floor(value + 0.5)
+
+
+def quoteOrder(items: list, isHalfPaid: bool) -> dict:
+    """
+    Recompute what the customer owes now and later, in paise, from current prices.
+    Raises ValueError naming the product when an item cannot be priced.
+    """
+    if not items:
+        raise ValueError("Order has no items")
+    prices = getPrices([item.get("productId") for item in items])
+    total = 0
+    for item in items:
+        product = prices.get(item.get("productId"))
+        if product is None:
+            raise ValueError(f"Product [{item.get('productId')}] is not available")
+        item["price"] = product["price"]
+        total += product["price"] * max(1, item.get("quantity") or 1)
+
+    if not isHalfPaid:
+        return {"total": total, "amount": roundHalfUp(total * 100), "remainingAmount": 0}
+    if not any(prices[item["productId"]]["isHalfPaymentAvailable"] for item in items):
+        raise ValueError("None of the products allow half payment")
+    half = roundHalfUp(total * 0.5)
+    return {"total": total, "amount": half * 100, "remainingAmount": roundHalfUp((total - half) * 100)}
@@ -0,0 +1,98 @@
+import mimetypes
+import os
+import re
+from collections import Counter
+from email.utils import parsedate
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse
+from constants import staticMaxAge
+
+# <sha256>.<ext> uploads and the <sha256>-<width>.<ext> variants derived from them never change content
+CONTENT_ADDRESSED_NAME = re.compile(r"^([0-9a-f]{64})((?:-[0-9a-z]+)*)\.[0-9a-z]+$")
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+PRECOMPRESSED_ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+staticStats = Counter()
+
+
+def acceptedEncodings(acceptEncoding: str) -> set:
+    encodings = set()
+    for part in acceptEncoding.split(","):
+        token, _, params = part.strip().partition(";")
+        if token and params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            encodings.add(token.lower())
+    return encodings
+
+
+def findPrecompressed(fullPath: str, requestHeaders: Headers):
+    accepted = acceptedEncodings(requestHeaders.get("accept-encoding", ""))
+    for encoding, suffix in PRECOMPRESSED_ENCODINGS:
+        if encoding in accepted:
+            try:
+                statResult = os.stat(fullPath + suffix)
+            except OSError:
+                continue
+            return encoding, fullPath + suffix, statResult
+    return None
+
+
+def isNotModified(responseHeaders, requestHeaders: Headers) -> bool:
+    ifNoneMatch = requestHeaders.get("if-none-match")
+    if ifNoneMatch is not None:
+        etag = responseHeaders.get("etag", "")
+        return ifNoneMatch.strip() == "*" or etag in [tag.strip().removeprefix("W/") for tag in ifNoneMatch.split(",")]
+    ifModifiedSince = requestHeaders.get("if-modified-since")
+    lastModified = responseHeaders.get("last-modified")
+    if ifModifiedSince and lastModified:
+        since, modified = parsedate(ifModifiedSince), parsedate(lastModified)
+        return since is not None and modified is not None and since >= modified
+    return False
+
+
+def buildFileResponse(fullPath: str, statResult: os.stat_result, requestHeaders: Headers, statusCode: int = 200) -> Response:
+    """
+    FileResponse with strong ETags, long-lived caching for content-addressed names,
+    and transparent use of a `.br`/`.gz` sibling when the client accepts it.
+    """
+    name = os.path.basename(fullPath)
+    contentAddressed = CONTENT_ADDRESSED_NAME.match(name)
+    headers = {"cache-control": IMMUTABLE_CACHE_CONTROL if contentAddressed else f"public, max-age={staticMaxAge}"}
+    if contentAddressed:
+        headers["etag"] = f'"{contentAddressed.group(1)}{contentAddressed.group(2)}"'
+
+    servedPath, mediaType = fullPath, mimetypes.guess_type(name)[0] or "application/octet-stream"
+    precompressed = findPrecompressed(fullPath, requestHeaders)
+    headers["vary"] = "Accept-Encoding"
+    if precompressed:
+        encoding, servedPath, statResult = precompressed
+        headers["content-encoding"] = encoding
+        if "etag" in headers:
+            headers["etag"] = headers["etag"][:-1] + f'-{encoding}"'
+        staticStats[f"precompressed.{encoding}"] += 1
+
+    response = FileResponse(servedPath, status_code=statusCode, headers=headers, media_type=mediaType, stat_result=statResult)
+
+    staticStats["requests"] += 1
+    staticStats["immutable" if contentAddressed else "mutable"] += 1
+    if isNotModified(response.headers, requestHeaders):
+        staticStats["notModified"] += 1
+        return NotModifiedResponse(response.headers)
+    if "range" in requestHeaders:
+        staticStats["rangeRequests"] += 1
+    else:
+        staticStats["bytesServed"] += statResult.st_size
+    return response
+
+
+class CachedStaticFiles(StaticFiles):
+    def file_response(self, full_path, stat_result: os.stat_result, scope, status_code: int = 200) -> Response:
+        return buildFileResponse(str(full_path), stat_result, Headers(scope=scope), status_code)
+
+
+def getStaticStats() -> dict:
+    stats = dict(staticStats)
+    requests = stats.get("requests", 0)
+    stats["notModifiedRatio"] = round(stats.get("notModified", 0) / requests, 4) if requests else 0.0
+    return stats
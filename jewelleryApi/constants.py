@@ -13,6 +13,17 @@ keycloakBaseUrl = os.getenv("KEYCLOAK_BASE_URL", "http://localhost:8080")
 keycloakRedirectUri = os.getenv("KEYCLOAK_REDIRECT_URI", "http://localhost:8000/auth/callback")
 tokenUrl = os.getenv("TOKEN_URL", f"{keycloakBaseUrl}/realms/{keycloakRealm}/protocol/openid-connect/token")
 authUrl = os.getenv("AUTH_URL", f"{keycloakBaseUrl}/realms/{keycloakRealm}/protocol/openid-connect/auth")
+keycloakTimeoutSeconds = float(os.getenv("KEYCLOAK_TIMEOUT_SECONDS", "10"))
+keycloakMaxConnections = int(os.getenv("KEYCLOAK_MAX_CONNECTIONS", "20"))
+authMode = os.getenv("AUTH_MODE", "remote").lower()
+keycloakIssuer = os.getenv("KEYCLOAK_ISSUER", f"{keycloakBaseUrl}/realms/{keycloakRealm}")
+keycloakJwksUrl = os.getenv("KEYCLOAK_JWKS_URL", f"{keycloakIssuer}/protocol/openid-connect/certs")
+keycloakAudience = os.getenv("KEYCLOAK_AUDIENCE", keycloakClientId)
+jwksRefreshMinSeconds = int(os.getenv("JWKS_REFRESH_MIN_SECONDS", "30"))
+# A cached identity skips Keycloak, so a logged-out, revoked or disabled token keeps working for up
+# to this long in workers other than the one that saw the logout or role change
+authCacheTtlSeconds = int(os.getenv("AUTH_CACHE_TTL_SECONDS", "5"))
+authCacheMaxEntries = int(os.getenv("AUTH_CACHE_MAX_ENTRIES", "10000"))
 
 # ======================
 #  MongoDB Configuration
@@ -30,6 +41,11 @@ mongoWishlistCollection = os.getenv("MONGO_WISHLIST_COLLECTION_NAME", "wishlistC
 mongoShippingCollection = os.getenv("MONGO_SHIPPING_COLLECTION_NAME", "shippingCollection")
 mongoAddressesCollection = os.getenv("MONGO_ADDRESS_COLLECTION_NAME", "addressCollection")
 mongoReviewCollection = os.getenv("MONGO_REVIEW_COLLECTION_NAME", "reviewCollection")
+mongoImageCollection = os.getenv("MONGO_IMAGE_COLLECTION_NAME", "imageCollection")
+mongoEmailOutboxCollection = os.getenv("MONGO_EMAIL_OUTBOX_COLLECTION_NAME", "emailOutbox")
+mongoCatalogVersionCollection = os.getenv("MONGO_CATALOG_VERSION_COLLECTION_NAME", "catalogVersions")
+mongoInventoryCollection = os.getenv("MONGO_INVENTORY_COLLECTION_NAME", "inventory")
+mongoReservationCollection = os.getenv("MONGO_RESERVATION_COLLECTION_NAME", "inventoryReservations")
 
 
 # ======================
@@ -40,6 +56,60 @@ staticImagesPath = os.getenv("STATIC_IMAGES_PATH", "static/images")
 staticOriginalPath = os.getenv("STATIC_ORIGINAL_PATH", "static/originalImages/")
 isExchangeToken = os.getenv("IS_EXCHANGE_TOKEN", "false").lower() == "true"
 staticFilesPath = "static"
+staticMaxAge = int(os.getenv("STATIC_MAX_AGE", "3600"))
+staticResizedPath = os.getenv("STATIC_RESIZED_PATH", "static/resized")
+imageResizeCacheBytes = int(os.getenv("IMAGE_RESIZE_CACHE_MB", "512")) * 1024 * 1024
+imageResizeMaxDimension = int(os.getenv("IMAGE_RESIZE_MAX_DIMENSION", "2048"))
+imageWorkerCount = int(os.getenv("IMAGE_WORKER_COUNT", "2"))
+imageQueueLimit = int(os.getenv("IMAGE_QUEUE_LIMIT", "8"))
+imageVariantWidths = [int(width) for width in os.getenv("IMAGE_VARIANT_WIDTHS", "160,320,640,1024").split(",")]
+imageVariantFormats = os.getenv("IMAGE_VARIANT_FORMATS", "webp,avif,jpeg").split(",")
+imageOrphanGraceSeconds = int(os.getenv("IMAGE_ORPHAN_GRACE_SECONDS", "86400"))
+imageSweepIntervalSeconds = int(os.getenv("IMAGE_SWEEP_INTERVAL_SECONDS", "3600"))
+imageDuplicateWaitSeconds = float(os.getenv("IMAGE_DUPLICATE_WAIT_SECONDS", "120"))
+healthCacheSeconds = float(os.getenv("HEALTH_CACHE_SECONDS", "5"))
+healthCheckTimeoutSeconds = float(os.getenv("HEALTH_CHECK_TIMEOUT_SECONDS", "2"))
+eventLoopLagIntervalSeconds = float(os.getenv("EVENT_LOOP_LAG_INTERVAL_SECONDS", "0.5"))
+compressionMinimumSize = int(os.getenv("COMPRESSION_MINIMUM_SIZE", "1024"))
+gzipCompressionLevel = int(os.getenv("GZIP_COMPRESSION_LEVEL", "6"))
+brotliQuality = int(os.getenv("BROTLI_QUALITY", "4"))
+compressionSkipTypes = tuple(os.getenv("COMPRESSION_SKIP_TYPES", "image/,video/,audio/,font/woff,application/zip,application/gzip,application/pdf,application/octet-stream").split(","))
+catalogVersionCacheSeconds = float(os.getenv("CATALOG_VERSION_CACHE_SECONDS", "1"))
+catalogMaxAge = int(os.getenv("CATALOG_MAX_AGE", "60"))
+catalogStaleWhileRevalidate = int(os.getenv("CATALOG_STALE_WHILE_REVALIDATE", "300"))
+reviewPageSize = int(os.getenv("REVIEW_PAGE_SIZE", "10"))
+reviewPageMaxSize = int(os.getenv("REVIEW_PAGE_MAX_SIZE", "50"))
+productBatchMaxSize = int(os.getenv("PRODUCT_BATCH_MAX_SIZE", "50"))
+wishlistMaxItems = int(os.getenv("WISHLIST_MAX_ITEMS", "100"))
+homeFeedLatestLimit = int(os.getenv("HOME_FEED_LATEST_LIMIT", "8"))
+homeFeedFeaturedLimit = int(os.getenv("HOME_FEED_FEATURED_LIMIT", "8"))
+homeFeedPollSeconds = float(os.getenv("HOME_FEED_POLL_SECONDS", "1"))
+homeFeedDebounceSeconds = float(os.getenv("HOME_FEED_DEBOUNCE_SECONDS", "2"))
+homeFeedMaxDelaySeconds = float(os.getenv("HOME_FEED_MAX_DELAY_SECONDS", "30"))
+inventoryReservationSeconds = int(os.getenv("INVENTORY_RESERVATION_SECONDS", "900"))
+inventorySweepIntervalSeconds = int(os.getenv("INVENTORY_SWEEP_INTERVAL_SECONDS", "60"))
+
+# ======================
+#  Email Delivery
+# ======================
+smtpHost = os.getenv("SMTP_HOST")
+smtpPort = int(os.getenv("SMTP_PORT", "587"))
+smtpUsername = os.getenv("SMTP_USERNAME")
+smtpPassword = os.getenv("SMTP_PASSWORD")
+smtpFromEmail = os.getenv("SMTP_FROM_EMAIL", smtpUsername or "no-reply@localhost")
+smtpUseTls = os.getenv("SMTP_USE_TLS", "true").lower() == "true"
+emailWorkerCount = int(os.getenv("EMAIL_WORKER_COUNT", "2"))
+emailRatePerSecond = float(os.getenv("EMAIL_RATE_PER_SECOND", "5"))
+emailMaxAttempts = int(os.getenv("EMAIL_MAX_ATTEMPTS", "5"))
+emailRetryBaseSeconds = int(os.getenv("EMAIL_RETRY_BASE_SECONDS", "30"))
+emailRetryMaxSeconds = int(os.getenv("EMAIL_RETRY_MAX_SECONDS", "3600"))
+emailPollSeconds = int(os.getenv("EMAIL_POLL_SECONDS", "5"))
+emailSendingLeaseSeconds = int(os.getenv("EMAIL_SENDING_LEASE_SECONDS", "300"))
+campaignBatchSize = int(os.getenv("CAMPAIGN_BATCH_SIZE", "200"))
+campaignConcurrency = int(os.getenv("CAMPAIGN_CONCURRENCY", "4"))
+campaignIntervalSeconds = int(os.getenv("CAMPAIGN_INTERVAL_SECONDS", "0"))
+reminderIntervalHours = int(os.getenv("REMINDER_INTERVAL_HOURS", "24"))
+reminderMaxCount = int(os.getenv("REMINDER_MAX_COUNT", "3"))
 
 
 # ==== Razor Pay Configuration ====
@@ -51,5 +121,19 @@ mongoCustomersCollection = os.getenv("RAZORPAY_COLLECTION_CUSTOMERS", "customers
 mongoInvoiceCollection = os.getenv("RAZORPAY_COLLECTION_INVOICES", "invoices")
 mongoTokensCollection = os.getenv("RAZORPAY_COLLECTION_TOKENS", "tokens")
 mongoTokenLogCollection = os.getenv("RAZORPAY_COLLECTION_TOKENS_LOGS", "tokenLogs")
+mongoReconciliationCollection = os.getenv("RAZORPAY_COLLECTION_RECONCILIATION", "reconciliationReports")
+mongoJobLeaseCollection = os.getenv("RAZORPAY_COLLECTION_JOB_LEASES", "jobLeases")
 rpwebhookSecret = os.getenv("RAZORPAY_WEBHOOK_SECRET", "12345")
 razorpaySecret = os.getenv("RAZORPAY_SECRET", "123")
+gatewayTimeoutSeconds = float(os.getenv("RAZORPAY_TIMEOUT_SECONDS", "10"))
+orderOutboxPollSeconds = int(os.getenv("ORDER_OUTBOX_POLL_SECONDS", "5"))
+orderOutboxLeaseSeconds = int(os.getenv("ORDER_OUTBOX_LEASE_SECONDS", "120"))
+orderOutboxMaxAttempts = int(os.getenv("ORDER_OUTBOX_MAX_ATTEMPTS", "8"))
+orderOutboxRetryBaseSeconds = int(os.getenv("ORDER_OUTBOX_RETRY_BASE_SECONDS", "15"))
+orderOutboxRetryMaxSeconds = int(os.getenv("ORDER_OUTBOX_RETRY_MAX_SECONDS", "900"))
+reconciliationIntervalSeconds = int(os.getenv("RECONCILIATION_INTERVAL_SECONDS", "3600"))
+reconciliationBatchSize = int(os.getenv("RECONCILIATION_BATCH_SIZE", "200"))
+reconciliationConcurrency = int(os.getenv("RECONCILIATION_CONCURRENCY", "8"))
+reconciliationSampleSize = int(os.getenv("RECONCILIATION_SAMPLE_SIZE", "50"))
+reconciliationWindowDays = int(os.getenv("RECONCILIATION_WINDOW_DAYS", "7"))
+reconciliationLeaseSeconds = int(os.getenv("RECONCILIATION_LEASE_SECONDS", "900"))
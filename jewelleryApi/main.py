@@ -1,4 +1,6 @@
+import asyncio
 import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from yensiAuthentication import logger, yensiloginRouter, yensiSsoRouter
 from Router import (
@@ -15,21 +17,74 @@ from Router import (
     addressRouter,
     shipmentTrackRouter,
     reviewRouter,
+    metricsRouter,
+    imageRouter,
 )
 from fastapi.middleware.cors import CORSMiddleware
-from yensiAuthentication.authenticate import KeycloakMiddleware
+from Utils.authContext import AuthContextMiddleware
+from Utils.authorization import RoleAuthorizationMiddleware
+from Utils.compression import CompressionMiddleware
 import uvicorn
-from fastapi.staticfiles import StaticFiles
+from Utils.staticFiles import CachedStaticFiles
 from constants import staticFilesPath
 from Razor_pay.Routers import customerService, orderService, paymentService, webhookService, halfPaymentService
+from Utils.imageUploader import shutdownImagePool, runImageSweeper
+from Utils.imageResizer import loadResizedCache
+from Database.imageDb import ensureImageIndexes
+from Database.emailDb import ensureEmailIndexes
+from Database.reviewDb import ensureReviewIndexes
+from Database.cartWishlistDb import ensureWishlistIndexes
+from Database.inventoryDb import ensureInventoryIndexes
+from Utils.emailQueue import startEmailWorkers
+from Razor_pay.Utils.campaignUtils import runCampaignScheduler
+from Utils.keycloakClient import closeKeycloakClient
+from Utils.healthChecks import monitorEventLoopLag
+from Utils.homeFeed import runHomeFeedBuilder
+from Utils.inventory import runReservationSweeper
+from Razor_pay.Database.ordersDb import ensureOrderIndexes
+from Razor_pay.Database.reconciliationDb import ensureReconciliationIndexes
+from Razor_pay.Utils.orderOutbox import runOrderOutboxWorker
+from Razor_pay.Utils.reconciliation import runReconciliationScheduler
 
 # Start the FastAPI application
 logger.info("FastAPI application starting...")
 
 static_path = os.getenv("STATIC_PATH", staticFilesPath)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await asyncio.to_thread(ensureImageIndexes)
+    await asyncio.to_thread(loadResizedCache)
+    await asyncio.to_thread(ensureEmailIndexes)
+    await asyncio.to_thread(ensureReviewIndexes)
+    await asyncio.to_thread(ensureWishlistIndexes)
+    await asyncio.to_thread(ensureInventoryIndexes)
+    await asyncio.to_thread(ensureOrderIndexes)
+    await asyncio.to_thread(ensureReconciliationIndexes)
+    backgroundTasks = [
+        asyncio.create_task(runImageSweeper()),
+        asyncio.create_task(runCampaignScheduler()),
+        asyncio.create_task(monitorEventLoopLag()),
+        asyncio.create_task(runHomeFeedBuilder()),
+        asyncio.create_task(runReservationSweeper()),
+        asyncio.create_task(runOrderOutboxWorker()),
+        asyncio.create_task(runReconciliationScheduler()),
+        *startEmailWorkers(),
+    ]
+    yield
+    for task in backgroundTasks:
+        task.cancel()
+    await asyncio.gather(*backgroundTasks, return_exceptions=True)
+    shutdownImagePool()
+    await closeKeycloakClient()
+
+
 # Create FastAPI app
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
+# Innermost: checks @requireRoles routes once authentication has set userMetadata
+app.add_middleware(RoleAuthorizationMiddleware, routes=app.routes)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -38,9 +93,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Add Keycloak middleware for authentication
-app.add_middleware(KeycloakMiddleware)
-app.mount("/static", StaticFiles(directory=static_path), name="static")
+# Add Keycloak middleware for authentication, behind a cache of verified tokens
+app.add_middleware(AuthContextMiddleware)
+# Outermost, so it compresses the final response produced by every other layer
+app.add_middleware(CompressionMiddleware)
+# Registered before the static mount so resize parameters on /static/images are handled
+app.include_router(imageRouter.router)
+app.mount("/static", CachedStaticFiles(directory=static_path), name="static")
 # Include authentication router
 app.include_router(yensiloginRouter)
 app.include_router(yensiSsoRouter)
@@ -62,6 +121,7 @@ app.include_router(shipmentTrackRouter.router)
 app.include_router(emailRouter.router)
 app.include_router(reviewRouter.router)
 app.include_router(halfPaymentService.router)
+app.include_router(metricsRouter.router)
 
 
 # run the FastAPI application
@@ -5,6 +5,7 @@ import { useCartStore } from '../../store/cartStore';
 import { useAuthStore } from '../../store/authStore';
 import { SITE_CONFIG, staticImageBaseUrl } from '../../constants/siteConfig';
 import { apiService } from '../../services/api';
+import { buildSrcSet } from '../../utils/imageUtils';
 
 interface ProductCardProps {
   product: Product;
@@ -61,6 +62,8 @@ const ProductCard: React.FC<ProductCardProps> = ({ product, viewMode }) => {
     : ['https://www.macsjewelry.com/cdn/shop/files/IMG_4360_594x.progressive.jpg?v=1701478772'];
 
   const hasSecondImage = productImages.length > 1;
+  const primaryVariants = product.images?.length ? product.imageVariants?.[product.images[0]] : undefined;
+  const imageSizes = viewMode === 'list' ? '(min-width: 640px) 288px, 100vw' : '(min-width: 1024px) 25vw, (min-width: 640px) 33vw, 50vw';
 
   const handleAddToCart = async (e: React.MouseEvent) => {
     e.preventDefault();
@@ -105,13 +108,19 @@ const ProductCard: React.FC<ProductCardProps> = ({ product, viewMode }) => {
             ? 'w-full sm:w-48 lg:w-64 xl:w-72 aspect-square sm:flex-shrink-0' // Increased width for list view
             : 'aspect-square'
           }`}>
-            <img
-              src={productImages[0]}
-              alt={product.name}
-              className="w-full h-full object-cover transition-opacity duration-500"
-              style={{ opacity: hasSecondImage && isHovered ? 0 : 1 }}
-              loading="lazy"
-            />
+            <picture className="contents">
+              {buildSrcSet(primaryVariants, 'avif') && <source type="image/avif" srcSet={buildSrcSet(primaryVariants, 'avif')} sizes={imageSizes} />}
+              {buildSrcSet(primaryVariants, 'webp') && <source type="image/webp" srcSet={buildSrcSet(primaryVariants, 'webp')} sizes={imageSizes} />}
+              <img
+                src={productImages[0]}
+                srcSet={buildSrcSet(primaryVariants, 'jpeg')}
+                sizes={imageSizes}
+                alt={product.name}
+                className="w-full h-full object-cover transition-opacity duration-500"
+                style={{ opacity: hasSecondImage && isHovered ? 0 : 1 }}
+                loading="lazy"
+              />
+            </picture>
             {hasSecondImage && (
               <img
                 src={productImages[1]}
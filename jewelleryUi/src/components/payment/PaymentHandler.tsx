@@ -4,6 +4,7 @@ import React from 'react';
 import { useCartStore } from '../../store/cartStore';
 import { useAuthStore } from '../../store/authStore';
 import { apiService } from '../../services/api';
+import { orderService } from '../../services/orderService';
 import { SITE_CONFIG } from '../../constants/siteConfig';
 import { useAddressStore } from '../../store/addressStore';
 import { AddressFormData } from '../../types/address';
@@ -14,6 +15,10 @@ declare global {
   }
 }
 
+// How long checkout waits for a saved order's Razorpay order (code 1578) before giving up
+const ORDER_SETUP_POLL_MS = 3000;
+const ORDER_SETUP_TIMEOUT_MS = 60000;
+
 interface PaymentHandlerProps {
   onSuccess: (orderId: string) => void;
   onError: (error: string) => void;
@@ -29,7 +34,7 @@ const PaymentHandler: React.FC<PaymentHandlerProps> = ({
   paymentType = 'full',
   onPaymentTypeChange 
 }) => {
-  const { getTotalPrice, clearCart, items } = useCartStore();
+  const { getTotalPrice, clearCart, items, syncWithServer } = useCartStore();
   const { user } = useAuthStore();
   const { selectedAddress } = useAddressStore();
   const baseFocusClasses = "focus:outline-none focus:ring-0";
@@ -47,6 +52,18 @@ const PaymentHandler: React.FC<PaymentHandlerProps> = ({
     return getTotalPrice();
   };
 
+  // The order is saved and the server keeps retrying Razorpay; resume it instead of ordering again
+  const waitForGatewayOrder = async (id: string) => {
+    const deadline = Date.now() + ORDER_SETUP_TIMEOUT_MS;
+    while (Date.now() < deadline) {
+      await new Promise(resolve => setTimeout(resolve, ORDER_SETUP_POLL_MS));
+      const order = await apiService.getOrder(id);
+      if (order?.orderId) return order;
+      if (order?.status === 'failed') return null;
+    }
+    return null;
+  };
+
   const loadRazorpayScript = (): Promise<boolean> => {
     return new Promise((resolve) => {
       if (window.Razorpay) {
@@ -92,6 +109,10 @@ const PaymentHandler: React.FC<PaymentHandlerProps> = ({
         return;
       }
 
+      // Pick up current prices; the cart keeps products as they were when added
+      await syncWithServer();
+      const checkoutItems = useCartStore.getState().items;
+
       const totalAmount = getTotalPrice();
       if (totalAmount <= 0) {
         onError('Cart is empty or invalid amount');
@@ -103,11 +124,11 @@ const PaymentHandler: React.FC<PaymentHandlerProps> = ({
       const isHalfPayment = paymentType === 'half';
       const isHalfPaid = paymentType === 'half';
 
-      const orderResponse = await apiService.createOrder({
+      const orderResponse = await orderService.createOrder({
         amount: Math.round(actualPaymentAmount * 100),
         currency: 'INR',
         receipt: `receipt_${Date.now()}`,
-        items: items.map(item => ({
+        items: checkoutItems.map(item => ({
           productId: item.productId,
           quantity: item.quantity,
           price: item.product.price,
@@ -122,12 +143,27 @@ const PaymentHandler: React.FC<PaymentHandlerProps> = ({
         notes: {
           userId: user?.id || '',
           userEmail: user?.email || '',
-          itemCount: items.length.toString(),
+          itemCount: checkoutItems.length.toString(),
           paymentType: paymentType,
         },
       });
 
-      const orderData = orderResponse;
+      // A price changed between the sync above and the order; show the new total
+      if (orderResponse.code === 1576) {
+        await syncWithServer();
+        onError(`Prices in your cart have changed. Your new total is ₹${getTotalPrice().toLocaleString()}. Please review and try again.`);
+        return;
+      }
+
+      let orderData: { id: string; orderId: string; amount: number; currency: string; internalOrderId?: string } | null = orderResponse.result;
+      if (orderResponse.code === 1578 && orderData?.id) {
+        orderData = await waitForGatewayOrder(orderData.id);
+        if (!orderData) {
+          onError('Payment setup is taking longer than usual. Please try again in a few minutes.');
+          return;
+        }
+      }
+
       if (!orderData || !orderData.id || !orderData.orderId) {
         onError('Failed to create order');
         return;
@@ -154,7 +190,7 @@ const PaymentHandler: React.FC<PaymentHandlerProps> = ({
             });
 
             if (verificationResult?.status === 'success') {
-              const cartIdsToRemove = items.map(item => item.id); // assuming `item.cartId` exists
+              const cartIdsToRemove = checkoutItems.map(item => item.id); // assuming `item.cartId` exists
               await clearCart(cartIdsToRemove);
               // Use the internal order ID, not the Razorpay order ID
               onSuccess(orderData.internalOrderId || orderData.id);
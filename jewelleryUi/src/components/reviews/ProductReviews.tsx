@@ -2,7 +2,8 @@ import React, { useState, useEffect } from 'react';
 import { Star, Trash2, Edit3, MessageCircle, User } from 'lucide-react';
 import { useAuthStore } from '../../store/authStore';
 import { apiService } from '../../services/api';
-import { Review, ReviewStats } from '../../types/review';
+import { Review, ReviewSort, ReviewStats } from '../../types/review';
+import { RatingSummary } from '../../types';
 import StarRating from './StarRating';
 import ReviewForm from './ReviewForm';
 import ConfirmDialog from '../common/ConfirmDialog';
@@ -15,7 +16,11 @@ interface ProductReviewsProps {
 const ProductReviews: React.FC<ProductReviewsProps> = ({ productId }) => {
   const { user, isAuthenticated } = useAuthStore();
   const [reviews, setReviews] = useState<Review[]>([]);
+  const [ratingSummary, setRatingSummary] = useState<RatingSummary | null>(null);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [sort, setSort] = useState<ReviewSort>('newest');
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [showReviewForm, setShowReviewForm] = useState(false);
   const [editingReview, setEditingReview] = useState<Review | null>(null);
   const [showAllReviews, setShowAllReviews] = useState(false);
@@ -32,23 +37,41 @@ const ProductReviews: React.FC<ProductReviewsProps> = ({ productId }) => {
 
   useEffect(() => {
     loadReviews();
-  }, [productId]);
+  }, [productId, sort]);
 
   const loadReviews = async () => {
     try {
       setLoading(true);
-      const reviewsData = await apiService.getProductReviews(productId);
-      setReviews(reviewsData);
+      const page = await apiService.getProductReviews(productId, sort);
+      setReviews(page.reviews);
+      setNextCursor(page.nextCursor);
+      setRatingSummary(page.ratingSummary);
     } catch (error) {
       console.error('Error loading reviews:', error);
       setReviews([]);
+      setNextCursor(null);
     } finally {
       setLoading(false);
     }
   };
 
+  const loadMoreReviews = async () => {
+    if (!nextCursor) return;
+    try {
+      setLoadingMore(true);
+      const page = await apiService.getProductReviews(productId, sort, nextCursor);
+      setReviews(prev => [...prev, ...page.reviews]);
+      setNextCursor(page.nextCursor);
+    } catch (error) {
+      console.error('Error loading more reviews:', error);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
+  // Totals come from the server-maintained summary, since only a page of reviews is loaded
   const calculateStats = (): ReviewStats => {
-    if (reviews.length === 0) {
+    if (!ratingSummary || ratingSummary.count === 0) {
       return {
         averageRating: 0,
         totalReviews: 0,
@@ -56,19 +79,11 @@ const ProductReviews: React.FC<ProductReviewsProps> = ({ productId }) => {
       };
     }
 
-    const totalRating = reviews.reduce((sum, review) => sum + review.rating, 0);
-    const averageRating = totalRating / reviews.length;
-
-    const ratingDistribution = reviews.reduce((dist, review) => {
-      const rating = Math.floor(review.rating) as keyof typeof dist;
-      dist[rating] = (dist[rating] || 0) + 1;
-      return dist;
-    }, { 1: 0, 2: 0, 3: 0, 4: 0, 5: 0 });
-
+    const { histogram } = ratingSummary;
     return {
-      averageRating,
-      totalReviews: reviews.length,
-      ratingDistribution
+      averageRating: ratingSummary.average,
+      totalReviews: ratingSummary.count,
+      ratingDistribution: { 1: histogram['1'], 2: histogram['2'], 3: histogram['3'], 4: histogram['4'], 5: histogram['5'] }
     };
   };
 
@@ -214,9 +229,21 @@ const ProductReviews: React.FC<ProductReviewsProps> = ({ productId }) => {
         </div>
       )}
 
-      {/* Reviews List */}
       {/* Reviews List */}
       <div className="space-y-4">
+        {stats.totalReviews > 1 && (
+          <div className="flex justify-end">
+            <select
+              value={sort}
+              onChange={(e) => setSort(e.target.value as ReviewSort)}
+              className="px-3 py-1 bg-brown border border-rich-brown rounded-lg text-sm text-rich-brown font-serif italic"
+            >
+              <option value="newest">Newest first</option>
+              <option value="highest">Highest rated</option>
+              <option value="lowest">Lowest rated</option>
+            </select>
+          </div>
+        )}
         {reviews.length === 0 ? (
           <div className="bg-brown border border-brown  rounded-xl p-8 text-center">
           </div>
@@ -270,6 +297,17 @@ const ProductReviews: React.FC<ProductReviewsProps> = ({ productId }) => {
                     )}
                   </div>
                 ))}
+                {nextCursor && (
+                  <div className="text-center">
+                    <button
+                      onClick={loadMoreReviews}
+                      disabled={loadingMore}
+                      className="px-4 py-2 bg-soft-gold text-rich-brown rounded-lg hover:bg-rose-sand transition-all duration-200 font-serif italic font-semibold disabled:opacity-50"
+                    >
+                      {loadingMore ? 'Loading...' : 'Load More Reviews'}
+                    </button>
+                  </div>
+                )}
               </div>
             ) : (
               <>
@@ -320,7 +358,7 @@ const ProductReviews: React.FC<ProductReviewsProps> = ({ productId }) => {
                 ))}
 
                 {/* Show More Button */}
-                {reviews.length > 2 && (
+                {(reviews.length > 2 || nextCursor) && (
                   <div className="text-center">
                     <button
                       onClick={() => setShowAllReviews(true)}
@@ -38,27 +38,18 @@ const HomePage: React.FC = () => {
   }, []);
 
   useEffect(() => {
-    loadData();
-    fetchProducts();
+    loadHomeFeed();
   }, []);
 
-  const loadData = async () => {
+  // Latest products and categories come precomputed in one response
+  const loadHomeFeed = async () => {
     try {
-      const categoriesRes = await apiService.getCategories();
-      setCategories(categoriesRes || []);
+      const feed = await apiService.getHomeFeed();
+      setCategories(feed.categories || []);
+      setProducts((feed.latest || []).slice(0, 4));
     } catch (error) {
-      console.error('Error loading data:', error);
+      console.error('Error loading home feed:', error);
       setCategories([]);
-    }
-  };
-
-  const fetchProducts = async () => {
-    try {
-      const response = await apiService.getProducts();
-      const latestProducts = (response || []).filter(product => product.isLatest === true);
-      setProducts(latestProducts.slice(0, 4));
-    } catch (error) {
-      console.error('Error fetching products:', error);
     } finally {
       setLoading(false);
     }
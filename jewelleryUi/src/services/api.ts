@@ -8,8 +8,8 @@ import {
   adminService,
   reviewService
 } from './index';
-import { Product, Category, CartItem, ProductFilters, ProductImport, Order, User, OrderRequest } from '../types';
-import { Review, ReviewFormData } from '../types/review';
+import { Product, Category, CartItem, ProductFilters, ProductImport, Order, User, OrderRequest, ProductBatchRequest, HomeFeed } from '../types';
+import { Review, ReviewFormData, ReviewPage, ReviewSort } from '../types/review';
 import { addressService } from '../services/addressService';
 
 class ApiService {
@@ -73,6 +73,26 @@ class ApiService {
     }
   }
 
+  async getHomeFeed(): Promise<HomeFeed> {
+    try {
+      const response = await productService.getHomeFeed();
+      return response?.result || { latest: [], featured: [], categories: [] };
+    } catch (error) {
+      console.error('Error fetching home feed:', error);
+      return { latest: [], featured: [], categories: [] };
+    }
+  }
+
+  async getProductsBatch(request: ProductBatchRequest): Promise<Product[]> {
+    try {
+      const response = await productService.getProductsBatch(request);
+      return response?.result?.products || [];
+    } catch (error) {
+      console.error('Error fetching product batch:', error);
+      return [];
+    }
+  }
+
   async filterProducts(filters: ProductFilters): Promise<Product[]> {
     try {
       const response = await productService.filterProducts(filters);
@@ -276,13 +296,18 @@ async getUserOrders(): Promise<Order[]> {
     return response.result;
   }
 
-  async getProductReviews(productId: string): Promise<Review[]> {
+  async getProductReviews(productId: string, sort: ReviewSort = 'newest', cursor?: string | null): Promise<ReviewPage> {
+    const emptyPage: ReviewPage = {
+      reviews: [],
+      nextCursor: null,
+      ratingSummary: { count: 0, sum: 0, average: 0, histogram: { 1: 0, 2: 0, 3: 0, 4: 0, 5: 0 } }
+    };
     try {
-      const response = await reviewService.getProductReviews(productId);
-      return response.result || [];
+      const response = await reviewService.getProductReviews(productId, sort, cursor);
+      return response.result || emptyPage;
     } catch (error) {
       console.error('Error fetching product reviews:', error);
-      return [];
+      return emptyPage;
     }
   }
 
@@ -1,5 +1,5 @@
 import BaseService from './baseService';
-import { Product, ProductFilters, ProductImport } from '../types';
+import { HomeFeed, Product, ProductBatchRequest, ProductBatchResult, ProductFilters, ProductImport } from '../types';
 import { ApiResponse } from '../types/api';
 
 class ProductService extends BaseService {
@@ -7,6 +7,10 @@ class ProductService extends BaseService {
     return this.get<Product[]>('/public/products');
   }
  
+  async getHomeFeed(): Promise<ApiResponse<HomeFeed>> {
+    return this.get<HomeFeed>('/public/home-feed');
+  }
+
   async getFeaturedProducts(): Promise<ApiResponse<Product[]>> {
     return this.get<Product[]>('/public/products/featured');
   }
@@ -19,6 +23,10 @@ class ProductService extends BaseService {
     return this.get<Product>(`/public/products/${slug}`);
   }
 
+  async getProductsBatch(request: ProductBatchRequest): Promise<ApiResponse<ProductBatchResult>> {
+    return this.post<ProductBatchResult>('/public/products/batch', request);
+  }
+
   async filterProducts(filters: ProductFilters): Promise<ApiResponse<Product[]>> {
     const queryParams = new URLSearchParams();
     
@@ -1,5 +1,5 @@
 import BaseService from './baseService';
-import { Review, ReviewFormData } from '../types/review';
+import { Review, ReviewFormData, ReviewPage, ReviewSort } from '../types/review';
 import { ApiResponse } from '../types/api';
 import { API_ENDPOINTS } from '../constants/appConstants';
 
@@ -8,8 +8,11 @@ class ReviewService extends BaseService {
     return this.post<Review>(API_ENDPOINTS.CREATE_REVIEW, reviewData, true);
   }
 
-  async getProductReviews(productId: string): Promise<ApiResponse<Review[]>> {
-    return this.get<Review[]>(`${API_ENDPOINTS.GET_PRODUCT_REVIEWS}/${productId}`, true);
+  async getProductReviews(productId: string, sort: ReviewSort = 'newest', cursor?: string | null, limit?: number): Promise<ApiResponse<ReviewPage>> {
+    const params = new URLSearchParams({ sort });
+    if (cursor) params.set('cursor', cursor);
+    if (limit) params.set('limit', String(limit));
+    return this.get<ReviewPage>(`${API_ENDPOINTS.GET_PRODUCT_REVIEWS}/${productId}?${params.toString()}`, true);
   }
 
   async getReviewById(reviewId: string): Promise<ApiResponse<Review>> {
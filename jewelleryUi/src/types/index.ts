@@ -44,6 +44,44 @@ export interface Product {
   isLatest?: boolean;
   isHalfPaymentAvailable?: boolean;
   halfPaymentAmount?: number;
+  imageVariants?: Record<string, ImageVariantManifest>;
+  ratingSummary?: RatingSummary;
+}
+
+export interface HomeFeed {
+  latest: Product[];
+  featured: Product[];
+  categories: Category[];
+}
+
+export interface ProductBatchRequest {
+  ids?: string[];
+  slugs?: string[];
+  fields?: (keyof Product)[];
+}
+
+export interface ProductBatchResult {
+  products: Product[];
+  missing: string[];
+}
+
+export interface RatingSummary {
+  count: number;
+  sum: number;
+  average: number;
+  histogram: Record<'1' | '2' | '3' | '4' | '5', number>;
+}
+
+export interface ImageVariant {
+  width: number;
+  height: number;
+  file: string;
+}
+
+export interface ImageVariantManifest {
+  width: number;
+  height: number;
+  variants: Partial<Record<'avif' | 'webp' | 'jpeg', ImageVariant[]>>;
 }
 
 export interface Category {
@@ -98,7 +136,7 @@ export interface Order {
   attempts: number;
   currency: string;
   entity: string;
-  status: 'created' | 'attempted' | 'paid';
+  status: 'pending' | 'created' | 'attempted' | 'paid' | 'failed';
   notes: {
     itemCount: string;
     userEmail: string;
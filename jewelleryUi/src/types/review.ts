@@ -1,3 +1,5 @@
+import { RatingSummary } from './index';
+
 export interface Review {
   id: string;
   productId: string;
@@ -27,4 +29,13 @@ export interface ReviewStats {
     4: number;
     5: number;
   };
-}
\ No newline at end of file
+}
+
+export type ReviewSort = 'newest' | 'highest' | 'lowest';
+
+export interface ReviewPage {
+  reviews: Review[];
+  nextCursor: string | null;
+  ratingSummary: RatingSummary;
+}
+
@@ -0,0 +1,13 @@
+// utils/imageUtils.ts
+import { ImageVariantManifest } from '../types';
+import { staticImageBaseUrl } from '../constants/siteConfig';
+
+/**
+ * Build a srcset string for one format of an uploaded image.
+ * @example "/api/static/images/abc-160.webp 160w, /api/static/images/abc-320.webp 320w"
+ */
+export function buildSrcSet(manifest: ImageVariantManifest | undefined, format: 'avif' | 'webp' | 'jpeg'): string | undefined {
+  const variants = manifest?.variants?.[format];
+  if (!variants?.length) return undefined;
+  return variants.map(variant => `${staticImageBaseUrl}${variant.file} ${variant.width}w`).join(', ');
+}